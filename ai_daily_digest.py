@@ -5,698 +5,1006 @@ Purpose: Automatically scrape AI-related news from multiple specialized sources
          and create a personalized daily AI digest
 """
 
-from playwright.sync_api import sync_playwright
+import argparse
+import asyncio
+import functools
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import os
 import re
+import time
+from array import array
 from collections import defaultdict
+from urllib.parse import urljoin, urlsplit
+from xml.etree import ElementTree
+
+from archive import ArticleArchive
+from articles import Article
+from categorizer import AI_KEYWORDS, KeywordCategorizer
+from dedupe_index import SeenIndex, canonicalize_url
+from fetch_cache import FetchCache, headline_hash
+from html_digest import render_digest, write_digest
+from jsonl_sink import (ARTICLES_FILE, COMBINED_FILE, SUMMARY_FILE, JsonlSink, read_jsonl, rebuild_json,
+                        write_summary)
+from metrics import METRICS_FILE, PROMETHEUS_FILE, Metrics
+from resilience import CircuitBreaker, call_with_retries, describe
+from screenshots import EXTENSIONS, pillow, process_screenshot
+from sources import DEFAULT_SOURCES_PATH, load_sources
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Runs inside the page: one call returns [headline, absolute link] for the first
+# `limit` matches of a selector. With `inner`, the link is looked up inside each
+# match (e.g. the headline of an <article>); otherwise the match is the headline
+# and its link is the nearest enclosing <a>. `a.href` is already absolute.
+EXTRACT_LINKS_JS = """
+(elements, [inner, limit]) => {
+    const pairs = [];
+    for (const el of elements.slice(0, limit)) {
+        const anchor = inner ? el.querySelector(inner) : el.closest('a');
+        if (inner && !anchor) continue;
+        const text = ((inner ? anchor : el).textContent || '').trim();
+        const link = anchor && anchor.getAttribute('href') ? anchor.href : '';
+        pairs.push([text, link]);
+    }
+    return pairs;
+}
+"""
+
+# Runs inside the page: true once `selector` matches at least `minCount` elements
+READY_JS = "([selector, minCount]) => document.querySelectorAll(selector).length >= minCount"
+
+@functools.lru_cache(maxsize=None)
+def load_httpx():
+    """httpx, imported on first use so rendering never loads it; None unless httpx
+    and selectolax are installed (optional: fetch server-rendered sources without a browser)"""
+    try:
+        import httpx
+        import selectolax.lexbor  # noqa: F401
+    except ImportError:
+        return None
+    return httpx
+
+
+# Chromium features a scraping run never uses: extensions, sync, background
+# networking and throttling of pages that are not in front
+LAUNCH_ARGS = [
+    '--disable-extensions', '--disable-component-extensions-with-background-pages',
+    '--disable-background-networking', '--disable-component-update', '--disable-default-apps',
+    '--disable-sync', '--disable-background-timer-throttling', '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows', '--metrics-recording-only', '--mute-audio',
+    '--no-first-run', '--no-default-browser-check',
+]
+
+# Resource types aborted while scraping; we only read headline text and links
+BLOCKED_RESOURCE_TYPES = frozenset(['image', 'media', 'font'])
+
+# ...and while a screenshot is being taken, which needs images and fonts to look right
+SCREENSHOT_BLOCKED_RESOURCE_TYPES = frozenset(['media'])
+
+# Ad, analytics and tracking hosts (and their subdomains) aborted on every page
+TRACKER_DOMAINS = frozenset([
+    'doubleclick.net', 'googlesyndication.com', 'googletagmanager.com',
+    'googletagservices.com', 'google-analytics.com', 'googleadservices.com',
+    'adnxs.com', 'amazon-adsystem.com', 'criteo.com', 'pubmatic.com',
+    'rubiconproject.com', 'taboola.com', 'outbrain.com', 'moatads.com',
+    'scorecardresearch.com', 'quantserve.com', 'chartbeat.com', 'chartbeat.net',
+    'parsely.com', 'hotjar.com', 'segment.com', 'segment.io', 'mixpanel.com',
+    'newrelic.com', 'nr-data.net', 'facebook.net', 'ads-twitter.com',
+    'branch.io', 'onetrust.com',
+])
+
+def parse_feed_date(text):
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) timestamp, or return None"""
+    text = (text or '').strip()
+    if not text:
+        return None
+    try:
+        return parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def screenshot_name(source):
+    """File name (without extension) of a source's screenshot"""
+    return re.sub(r'[^a-z0-9]+', '_', source.lower()).strip('_')
+
+
+def parse_feed_entry(elem):
+    """Return (title, link, published datetime) for an RSS <item> or Atom <entry>"""
+    title, link, published = '', '', None
+    for child in elem:
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'title':
+            title = (child.text or '').strip()
+        elif tag == 'link' and not link:
+            # RSS keeps the URL as text, Atom in href (rel="alternate" or no rel)
+            if child.get('href') is not None:
+                if child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+            else:
+                link = (child.text or '').strip()
+        elif tag in ('pubDate', 'published', 'date', 'updated') and published is None:
+            published = parse_feed_date(child.text)
+    return title, link, published
+
+
+class StaticPage:
+    """Server-rendered page fetched over HTTP and parsed without a browser
+    
+    Stands in for a Playwright page in the scrapers: goto() downloads and
+    parses the HTML, extract_links() mirrors EXTRACT_LINKS_JS on the parsed tree.
+    """
+    
+    def __init__(self, client):
+        self.client = client
+        self.url = None
+        self.tree = None
+        self.headers = {}
+        self.bytes_loaded = 0
+    
+    async def goto(self, url):
+        response = await self.client.get(url)
+        response.raise_for_status()
+        self.url = str(response.url)
+        self.headers = response.headers
+        self.bytes_loaded = len(response.content)
+        from selectolax.lexbor import LexborHTMLParser
+        self.tree = LexborHTMLParser(response.content)
+    
+    def extract_links(self, selector, limit, inner=None):
+        pairs = []
+        for node in self.tree.css(selector)[:limit]:
+            if inner:
+                anchor = node.css_first(inner)
+                if anchor is None:
+                    continue
+                text_node = anchor
+            else:
+                anchor = node
+                while anchor is not None and anchor.tag != 'a':
+                    anchor = anchor.parent
+                text_node = node
+            
+            href = anchor.attributes.get('href') if anchor is not None else None
+            link = urljoin(self.url, href) if href else ''
+            pairs.append([(text_node.text() or '').strip(), link])
+        return pairs
+
 
 class AIDailyDigest:
-    def __init__(self):
+    def __init__(self, max_concurrency=4, ready_timeout=10000, take_screenshots=True,
+                 block_resources=True, enabled_sources=None, use_feeds=True, categorizer=None,
+                 dedupe='mark', seen_index_path='seen_articles.db', cluster_duplicates=True,
+                 fetch_cache_dir='.digest_cache', sources=DEFAULT_SOURCES_PATH, report_dir=None,
+                 headless=False, max_navigations=None, processes=1, metrics=True,
+                 screenshot_format='jpeg', screenshot_quality=80, thumbnail_width=480,
+                 source_timeout=90, retries=2, retry_delay=1.0, hedge_after=None,
+                 circuit_breaker='.digest_cache/circuit_breaker.json', archive='digest_archive.db',
+                 page_search=True):
+        # Source registry: a sources.json style file or a list of SourceSpecs
+        specs = load_sources(sources) if isinstance(sources, str) else list(sources)
+        self.sources = {spec.name: spec for spec in specs}
+        # Stage timings and headline counters, saved next to the JSON output
+        self.metrics = Metrics(enabled=metrics)
+        self.start_digest(report_dir)
+        # Keyword lists compiled once for every headline of the run
+        self.categorizer = categorizer or KeywordCategorizer()
+        # Whole words only: 'ai' must not match "said" or "train", nor 'ml' "html"
+        self.ai_filter = KeywordCategorizer([('AI', AI_KEYWORDS)], default=None, word_boundary=True)
+        # Stories from earlier runs: 'mark' flags them as seen_before, 'new' drops
+        # them, None disables the seen index. While the index is on, repeats within
+        # a run are dropped too.
+        self.dedupe = dedupe
+        self.seen_index = SeenIndex(seen_index_path) if dedupe else None
+        # Key -> seen-before verdict of stories already published (daemon mode);
+        # they keep it instead of being checked against the index again
+        self.known_repeats = {}
+        # Every run's articles, with daily counts for trends; None disables it
+        self.archive = ArticleArchive(archive) if archive else None
+        # Show near-duplicate headlines from different sources as one card
+        self.cluster_duplicates = cluster_duplicates
+        # Search box over the page's stories, with its index embedded in the page
+        self.page_search = page_search
+        # Maximum number of pages scraping at the same time (per process)
+        self.max_concurrency = max_concurrency
+        # Worker processes the sources are spread over, each with its own browser
+        self.processes = processes
+        # Longest time to wait for a page to become ready after goto (ms)
+        self.ready_timeout = ready_timeout
+        # Seconds each source took to become ready, and what signalled it
+        self.readiness = {}
+        # Screenshot each source page while it is loaded for scraping
+        self.take_screenshots = take_screenshots
+        self.screenshots = {}
+        # 'png', 'jpeg' or 'webp'; WebP, thumbnails and change detection need Pillow
+        if screenshot_format not in EXTENSIONS:
+            raise ValueError(f"Unknown screenshot format: {screenshot_format!r}")
+        if screenshot_format == 'webp' and pillow() is None:
+            print("⚠️ Pillow is not installed, saving JPEG screenshots instead of WebP")
+            screenshot_format = 'jpeg'
+        self.screenshot_format = screenshot_format
+        self.screenshot_quality = screenshot_quality
+        # Width of the thumbnails shown in the digest (None: show full screenshots)
+        self.thumbnail_width = thumbnail_width
+        self.thumbnails = {}
+        # Perceptual hash of each source's screenshot, kept in the fetch cache
+        self.screenshot_hashes = {}
+        # Source -> (future, path, thumbnail path) of a screenshot still being processed
+        self.screenshot_jobs = {}
+        self.screenshot_pool = None
+        # Abort heavy resources and trackers while scraping
+        self.block_resources = block_resources
+        self.page_sources = {}
+        self.network_stats = {}
+        # Source names to scrape; None scrapes all of them
+        self.enabled_sources = enabled_sources
+        # Read source feeds instead of scraping their pages when possible
+        self.use_feeds = use_feeds
+        # Seconds a source may take in all, retries included; failed attempts
+        # are retried up to `retries` times after a jittered backoff
+        self.source_timeout = source_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        # Start a second HTTP request if the first is slower than this (seconds)
+        self.hedge_after = hedge_after
+        # Sources that keep failing are skipped for a while (a path, a
+        # CircuitBreaker, or None to always try every source)
+        if isinstance(circuit_breaker, str):
+            circuit_breaker = CircuitBreaker(circuit_breaker)
+        self.circuit_breaker = circuit_breaker
+        # Validators, headlines and screenshots from earlier runs; None disables it
+        self.fetch_cache = FetchCache(fetch_cache_dir) if fetch_cache_dir else None
+        # URL, ETag, Last-Modified and headline hash of each source fetched this run
+        self.fetched = {}
+        # Created by open_clients; the browser only once a source needs it
+        self.headless = headless
+        self.http_client = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.browser_lock = None
+        # Replace the browser context after this many page loads (None: never),
+        # so a long-running process does not keep growing
+        self.max_navigations = max_navigations
+        self.navigations = 0
+        self.open_pages = 0
+    
+    def start_digest(self, report_dir=None):
+        """Reset the collected articles and start writing a digest to report_dir
+        
+        Defaults to a new ai_digest_<timestamp> folder; an existing folder is
+        reused and its article output replaced.
+        """
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.report_dir = f"ai_digest_{self.timestamp}"
+        self.report_dir = report_dir or f"ai_digest_{self.timestamp}"
         os.makedirs(self.report_dir, exist_ok=True)
         self.articles = []
-        self.categories = defaultdict(list)
+        # Category -> positions of its articles in self.articles
+        self.categories = defaultdict(lambda: array('q'))
+        # Articles are appended here as each source is merged, so a crash keeps them
+        if getattr(self, 'sink', None) is not None:
+            self.sink.close()
+        self.sink = JsonlSink(os.path.join(self.report_dir, ARTICLES_FILE), append=False)
+        self.run_keys = set()
+        self.repeats = 0
         
-    def scrape_venturebeat_ai(self, page):
-        """Scrape AI news from VentureBeat AI section"""
-        print("\n🤖 Scraping VentureBeat AI...")
+    def make_article(self, source, headline, link, scraped_at=None):
+        """Build an article record for a scraped headline (categorized in add_articles)"""
+        return Article(source, headline, link, scraped_at=scraped_at.timestamp() if scraped_at else None)
+    
+    def filter_repeats(self, articles):
+        """Drop stories already collected this run; mark or drop ones from earlier runs"""
+        keys = [canonicalize_url(article.link) for article in articles]
+        seen = self.seen_index.seen([key for key in keys if key not in self.known_repeats])
         
-        try:
-            page.goto("https://venturebeat.com/ai/", wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)
-            
-            # Find article headlines
-            articles = page.locator('article').all()
-            
-            count = 0
-            for article in articles[:12]:
-                try:
-                    # Find headline within article
-                    headline_elem = article.locator('h2 a, h3 a').first
-                    if headline_elem.count() > 0:
-                        text = headline_elem.text_content().strip()
-                        link = headline_elem.get_attribute('href')
-                        
-                        if text and len(text) > 20:
-                            if link and not link.startswith('http'):
-                                link = f"https://venturebeat.com{link}"
-                            
-                            article_data = {
-                                'source': 'VentureBeat AI',
-                                'headline': text,
-                                'link': link,
-                                'category': self.categorize_ai_article(text),
-                                'scraped_at': datetime.now().isoformat()
-                            }
-                            
-                            self.articles.append(article_data)
-                            self.categories[article_data['category']].append(article_data)
-                            count += 1
-                            print(f"  ✓ {text[:60]}...")
-                        
-                except Exception as e:
+        kept = []
+        for article, key in zip(articles, keys):
+            if key:
+                if key in self.run_keys:
                     continue
+                self.run_keys.add(key)
             
-            print(f"✅ Scraped {count} AI articles from VentureBeat")
-            
-        except Exception as e:
-            print(f"❌ Error scraping VentureBeat AI: {e}")
+            repeat = self.known_repeats[key] if key in self.known_repeats else key in seen
+            self.repeats += repeat
+            if repeat and self.dedupe == 'new':
+                continue
+            if self.dedupe == 'mark':
+                article.seen_before = repeat
+            kept.append(article)
+        
+        return kept
+    
+    def remember_articles(self, articles=None):
+        """Add this run's stories (or just some articles) to the seen index"""
+        if self.seen_index is None:
+            return
+        self.seen_index.record((canonicalize_url(article.link), article.source, article.headline)
+                               for article in (self.articles if articles is None else articles))
+    
+    def archive_articles(self):
+        """Add this run's articles to the archive"""
+        if self.archive is None:
+            return
+        added = self.archive.add_run(self.articles, self.report_dir)
+        print(f"🗄️ Archived {added} new articles in {self.archive.path}")
     
-    def scrape_mit_tech_review_ai(self, page):
-        """Scrape AI news from MIT Technology Review"""
-        print("\n🎓 Scraping MIT Technology Review AI...")
+    def add_articles(self, articles):
+        """Categorize a batch of scraped articles and merge it into the digest"""
+        if self.seen_index is not None and articles:
+            # Batches hold one source's articles
+            source, scraped = articles[0].source, len(articles)
+            articles = self.filter_repeats(articles)
+            self.metrics.count('elements_filtered', scraped - len(articles), source=source, reason='repeat')
+        with self.metrics.span('categorize'):
+            categories = self.categorizer.categorize_many([article.headline for article in articles])
+        for article, category in zip(articles, categories):
+            article.category = category
+            self.categories[category].append(len(self.articles))
+            self.articles.append(article)
+        
+        self.sink.write([article.to_dict() for article in articles])
+        write_summary(os.path.join(self.report_dir, SUMMARY_FILE), self.summary())
+    
+    async def wait_until_ready(self, page, selector, min_count):
+        """Wait for enough headlines to render or the network to go idle, whichever is first"""
+        start = time.perf_counter()
+        waits = {
+            asyncio.ensure_future(page.wait_for_function(
+                READY_JS, arg=[selector, min_count], timeout=self.ready_timeout)): 'selector',
+            asyncio.ensure_future(page.wait_for_load_state(
+                'networkidle', timeout=self.ready_timeout)): 'networkidle',
+        }
+        
+        # Both waits give up at ready_timeout, so this loop is capped too
+        signal = 'timeout'
+        pending = set(waits)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded:
+                signal = waits[succeeded[0]]
+                break
+        
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        return time.perf_counter() - start, signal
+    
+    async def open_source(self, page, source, url, selector, min_count):
+        """Navigate to a source and wait until its headlines are ready"""
+        with self.metrics.span('navigation', source=source):
+            if isinstance(page, StaticPage):
+                # Server-rendered: the headlines are there once the HTML has arrived
+                start = time.perf_counter()
+                await page.goto(url)
+                seconds, signal = time.perf_counter() - start, 'http'
+                self.note_fetch(source, url, page.headers)
+            else:
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                self.note_fetch(source, url, response.headers if response else {})
+                seconds, signal = await self.wait_until_ready(page, selector, min_count)
+        self.readiness[source] = {'seconds': round(seconds, 3), 'signal': signal}
+        print(f"  ⏱️ {source} ready in {seconds:.2f}s ({signal})")
+    
+    async def extract_links(self, page, selector, limit, inner=None, source=None):
+        """Pull (headline, absolute link) pairs for a selector in one browser round trip"""
+        with self.metrics.span('extraction', source=source):
+            if isinstance(page, StaticPage):
+                return page.extract_links(selector, limit, inner)
+            return await page.eval_on_selector_all(selector, EXTRACT_LINKS_JS, [inner, limit])
+    
+    async def capture_screenshot(self, page, source):
+        """Screenshot a source page that is already loaded for scraping
+        
+        With Pillow, the browser only hands over the image; encoding, the
+        thumbnail and the comparison with last run's screenshot happen in a
+        thread, collected by finish_screenshot() once the page is closed.
+        """
+        name = screenshot_name(source)
+        extension = EXTENSIONS[self.screenshot_format]
+        screenshot_path = os.path.join(self.report_dir, name + extension)
+        thumbnail_path = os.path.join(self.report_dir, name + '_thumb' + extension) if self.thumbnail_width else None
+        # The browser encodes PNG and JPEG itself; WebP is converted from PNG
+        if self.screenshot_format == 'jpeg':
+            options = {'type': 'jpeg', 'quality': self.screenshot_quality}
+        else:
+            options = {'type': 'png'}
         
         try:
-            page.goto("https://www.technologyreview.com/topic/artificial-intelligence/", wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)
-            
-            # Find article links
-            article_links = page.locator('h3 a, h2 a').all()
-            
-            count = 0
-            for link_elem in article_links[:12]:
-                try:
-                    headline = link_elem.text_content().strip()
-                    link = link_elem.get_attribute('href')
-                    
-                    if headline and link and len(headline) > 20:
-                        if not link.startswith('http'):
-                            link = f"https://www.technologyreview.com{link}"
-                        
-                        article_data = {
-                            'source': 'MIT Tech Review',
-                            'headline': headline,
-                            'link': link,
-                            'category': self.categorize_ai_article(headline),
-                            'scraped_at': datetime.now().isoformat()
-                        }
-                        
-                        self.articles.append(article_data)
-                        self.categories[article_data['category']].append(article_data)
-                        count += 1
-                        print(f"  ✓ {headline[:60]}...")
-                        
-                except Exception as e:
-                    continue
-            
-            print(f"✅ Scraped {count} AI articles from MIT Tech Review")
+            if pillow() is None:
+                with self.metrics.span('screenshot', source=source):
+                    await page.screenshot(path=screenshot_path, full_page=False, **options)
+                self.screenshots[source] = screenshot_path
+                print(f"  📸 {source} screenshot saved")
+                return
             
+            with self.metrics.span('screenshot', source=source):
+                data = await page.screenshot(full_page=False, **options)
+            job = asyncio.get_event_loop().run_in_executor(self.screenshot_pool, functools.partial(
+                process_screenshot, data, screenshot_path, thumbnail_path, self.screenshot_format,
+                self.screenshot_quality, self.thumbnail_width, self.cached_screenshot_hash(source)))
+            self.screenshot_jobs[source] = (job, screenshot_path, thumbnail_path)
+            print(f"  📸 {source} screenshot taken")
+        except Exception as e:
+            self.metrics.count('errors', source=source, stage='screenshot')
+            print(f"  ⚠️ Failed to screenshot {source}: {e}")
+    
+    def cached_screenshot_hash(self, source):
+        """Perceptual hash of the source's cached screenshot, or None if there is
+        none in the current format"""
+        if self.fetch_cache is None:
+            return None
+        filename = (self.fetch_cache.get(source) or {}).get('screenshot')
+        if not filename or not filename.endswith(EXTENSIONS[self.screenshot_format]) or \
+                not os.path.exists(os.path.join(self.fetch_cache.directory, filename)):
+            return None
+        return self.fetch_cache.get(source).get('screenshot_hash')
+    
+    async def finish_screenshot(self, source):
+        """Wait for a source's screenshot to be processed; reuse the cached one if it looks the same"""
+        if source not in self.screenshot_jobs:
+            return
+        job, screenshot_path, thumbnail_path = self.screenshot_jobs.pop(source)
+        try:
+            result = await job
         except Exception as e:
-            print(f"❌ Error scraping MIT Tech Review: {e}")
+            self.metrics.count('errors', source=source, stage='screenshot')
+            print(f"  ⚠️ Failed to save the {source} screenshot: {e}")
+            return
+        self.metrics.timing('screenshot_processing', result['seconds'], source=source)
+        
+        if result['unchanged'] and self.reuse_screenshot(source):
+            return
+        self.screenshots[source] = screenshot_path
+        if thumbnail_path:
+            self.thumbnails[source] = thumbnail_path
+        self.screenshot_hashes[source] = result['hash']
+        print(f"  📸 {source} screenshot saved")
     
-    def scrape_reddit_ai(self, page):
-        """Scrape AI discussions from Reddit r/artificial and r/MachineLearning"""
-        print("\n🔥 Scraping Reddit AI Communities...")
+    async def extract_and_capture(self, page, source, selector, limit, inner=None):
+        """Extract headline links while the screenshot of the same page is taken
         
-        subreddits = ['artificial', 'MachineLearning']
+        If the headlines match the cached ones, the cached screenshot is reused
+        instead of shooting the page again.
+        """
+        cached = self.fetch_cache.get(source) if self.fetch_cache is not None else None
+        if not self.take_screenshots or isinstance(page, StaticPage):
+            pairs = await self.extract_links(page, selector, limit, inner, source)
+        elif cached and cached.get('screenshot'):
+            pairs = await self.extract_links(page, selector, limit, inner, source)
+            if headline_hash(pairs) == cached['headline_hash'] and self.reuse_screenshot(source):
+                self.fetch_cache.record(source, 'hit (same headlines)')
+            else:
+                await self.capture_screenshot(page, source)
+        else:
+            pairs, _ = await asyncio.gather(
+                self.extract_links(page, selector, limit, inner, source),
+                self.capture_screenshot(page, source),
+            )
         
-        for subreddit in subreddits:
-            try:
-                page.goto(f"https://www.reddit.com/r/{subreddit}", wait_until="domcontentloaded", timeout=30000)
-                page.wait_for_timeout(3000)
-                
-                # Find post titles
-                posts = page.locator('h3').all()
-                
-                count = 0
-                for post in posts[:8]:
-                    try:
-                        title = post.text_content().strip()
-                        
-                        if len(title) > 20 and not title.startswith('r/'):
-                            # Try to find the link
-                            parent_link = post.locator('xpath=ancestor::a').first
-                            link = parent_link.get_attribute('href') if parent_link.count() > 0 else ""
-                            
-                            if link and not link.startswith('http'):
-                                link = f"https://www.reddit.com{link}"
-                            
-                            article_data = {
-                                'source': f'Reddit r/{subreddit}',
-                                'headline': title,
-                                'link': link,
-                                'category': self.categorize_ai_article(title),
-                                'scraped_at': datetime.now().isoformat()
-                            }
-                            
-                            self.articles.append(article_data)
-                            self.categories[article_data['category']].append(article_data)
-                            count += 1
-                            print(f"  ✓ r/{subreddit}: {title[:50]}...")
-                            
-                    except Exception as e:
+        if source in self.fetched:
+            self.fetched[source]['headline_hash'] = headline_hash(pairs)
+        return pairs
+    
+    @staticmethod
+    def keep_headlines(pairs, min_length, require_link=True):
+        """Drop headlines that are too short or have no link"""
+        return [(text, link) for text, link in pairs
+                if len(text) > min_length and (link or not require_link)]
+    
+    async def scrape_page(self, page, spec):
+        """Scrape the headlines of any source spec from its listing page
+        
+        Errors are left to scrape_with_retries(), which decides whether to try again.
+        """
+        print(f"\n{spec.icon} Scraping {spec.name}...")
+        results = []
+        
+        await self.open_source(page, spec.name, spec.url, spec.ready_selector, spec.ready_count)
+        pairs = await self.extract_and_capture(page, spec.name, spec.selector, spec.limit, spec.inner)
+        kept = self.keep_headlines(pairs, spec.min_length, spec.require_link)
+        filtered = {'short_or_unlinked': len(pairs) - len(kept), 'skip_prefix': 0, 'not_ai': 0}
+        
+        for headline, link in kept:
+            if spec.skip_prefixes and headline.startswith(spec.skip_prefixes):
+                filtered['skip_prefix'] += 1
+                continue
+            # General news sites: keep AI-related content only
+            if spec.ai_filter and not self.ai_filter.matches(headline):
+                filtered['not_ai'] += 1
+                continue
+            results.append(self.make_article(spec.name, headline, link))
+            print(f"  ✓ {headline[:60]}...")
+        
+        self.metrics.count('elements_seen', len(pairs), source=spec.name)
+        self.metrics.count('elements_kept', len(results), source=spec.name)
+        for reason, count in filtered.items():
+            self.metrics.count('elements_filtered', count, source=spec.name, reason=reason)
+        print(f"✅ Scraped {len(results)} AI articles from {spec.name}")
+        
+        return results
+    
+    def block_reason(self, source, request):
+        """Return why a request should be aborted for this source, or None to let it load"""
+        host = urlsplit(request.url).hostname or ''
+        parts = host.split('.')
+        if any('.'.join(parts[i:]) in TRACKER_DOMAINS for i in range(len(parts) - 1)):
+            return 'tracker'
+        
+        # A source's own block list always applies; by default pages that get
+        # screenshotted keep their images and fonts
+        blocked_types = self.sources[source].block
+        if blocked_types is None:
+            blocked_types = SCREENSHOT_BLOCKED_RESOURCE_TYPES if self.take_screenshots else BLOCKED_RESOURCE_TYPES
+        if request.resource_type in blocked_types:
+            return request.resource_type
+        return None
+    
+    async def route_request(self, route):
+        """Context-wide route handler: abort or continue based on the page's source"""
+        request = route.request
+        try:
+            source = self.page_sources.get(request.frame.page)
+        except Exception:
+            # Service worker and other frameless requests
+            source = None
+        
+        reason = self.block_reason(source, request) if source else None
+        if reason is None:
+            await route.continue_()
+            return
+        
+        stats = self.network_stats[source]
+        stats['blocked'] += 1
+        stats['blocked_by'][reason] = stats['blocked_by'].get(reason, 0) + 1
+        await route.abort()
+    
+    async def count_request(self, source, request):
+        """Tally a finished request for a source, with the bytes its response body took
+        on the wire (Content-Length is missing from most compressed and chunked responses)"""
+        stats = self.network_stats[source]
+        stats['loaded'] += 1
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        stats['bytes_loaded'] += sizes['responseBodySize']
+    
+    def print_network_stats(self, source):
+        """Print what request blocking saved for a source"""
+        stats = self.network_stats.get(source)
+        if not stats or not self.block_resources:
+            return
+        
+        blocked_by = ', '.join(f"{reason} {count}" for reason, count in sorted(stats['blocked_by'].items()))
+        print(f"  🛡️ {source}: blocked {stats['blocked']} requests ({blocked_by or 'none'}), "
+              f"loaded {stats['loaded']} ({stats['bytes_loaded'] / 1024:.0f} KB)")
+    
+    async def read_feed(self, url, limit, source=None):
+        """Stream a feed and parse entries as bytes arrive, stopping after `limit` entries"""
+        parser = ElementTree.XMLPullParser(events=('end',))
+        entries = []
+        
+        async with self.http_client.stream('GET', url) as response:
+            response.raise_for_status()
+            if source:
+                self.note_fetch(source, url, response.headers)
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for _, elem in parser.read_events():
+                    if elem.tag.rsplit('}', 1)[-1] not in ('item', 'entry'):
                         continue
-                
-                print(f"✅ Scraped {count} posts from r/{subreddit}")
-                
-            except Exception as e:
-                print(f"❌ Error scraping r/{subreddit}: {e}")
+                    entries.append(parse_feed_entry(elem))
+                    elem.clear()
+                    if len(entries) >= limit:
+                        return entries
+        
+        return entries
     
-    def scrape_hacker_news_ai(self, page):
-        """Scrape AI-related stories from Hacker News"""
-        print("\n🚀 Scraping Hacker News (AI filtered)...")
+    async def scrape_feed(self, spec):
+        """Read a source's feed into articles; an empty list means fall back to the page"""
+        source, url, limit = spec.name, spec.feed, spec.feed_limit
+        print(f"\n📰 Reading {source} feed...")
+        results = []
         
         try:
-            page.goto("https://news.ycombinator.com", wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)
-            
-            # Find story titles
-            story_links = page.locator('span.titleline > a').all()
-            
-            # AI-related keywords for filtering
-            ai_keywords = ['ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
-                          'neural', 'gpt', 'llm', 'chatgpt', 'openai', 'anthropic', 'claude',
-                          'gemini', 'transformer', 'diffusion', 'gen ai', 'generative']
-            
-            count = 0
-            for link_elem in story_links[:30]:  # Check more stories to find AI ones
-                try:
-                    headline = link_elem.text_content().strip()
-                    link = link_elem.get_attribute('href')
-                    
-                    # Filter for AI-related content
-                    headline_lower = headline.lower()
-                    if any(keyword in headline_lower for keyword in ai_keywords):
-                        # Make relative links absolute
-                        if link and not link.startswith('http'):
-                            link = f"https://news.ycombinator.com/{link}"
-                        
-                        if headline and link:
-                            article_data = {
-                                'source': 'Hacker News',
-                                'headline': headline,
-                                'link': link,
-                                'category': self.categorize_ai_article(headline),
-                                'scraped_at': datetime.now().isoformat()
-                            }
-                            
-                            self.articles.append(article_data)
-                            self.categories[article_data['category']].append(article_data)
-                            count += 1
-                            print(f"  ✓ {headline[:60]}...")
-                        
-                except Exception as e:
-                    continue
-            
-            print(f"✅ Scraped {count} AI-related stories from Hacker News")
+            start = time.perf_counter()
+            with self.metrics.span('feed', source=source):
+                entries = await self.read_feed(url, limit, source)
+            for title, link, published in entries:
+                if title and link:
+                    results.append(self.make_article(source, title, link, published))
+                    print(f"  ✓ {title[:60]}...")
+            self.metrics.count('elements_seen', len(entries), source=source)
+            self.metrics.count('elements_kept', len(results), source=source)
+            self.metrics.count('elements_filtered', len(entries) - len(results), source=source,
+                               reason='short_or_unlinked')
+            if source in self.fetched:
+                self.fetched[source]['headline_hash'] = headline_hash(
+                    (article.headline, article.link) for article in results)
+            self.readiness[source] = {'seconds': round(time.perf_counter() - start, 3), 'signal': 'feed'}
             
         except Exception as e:
-            print(f"❌ Error scraping Hacker News: {e}")
+            self.metrics.count('errors', source=source, stage='feed')
+            print(f"  ⚠️ {source} feed failed: {e}")
+        
+        if results:
+            print(f"✅ Read {len(results)} AI articles from the {source} feed")
+        else:
+            print(f"  ↩️ Falling back to scraping the {source} site")
+        return results
+    
+    def is_static(self, spec):
+        """True if a source is fetched over HTTP rather than rendered in the browser"""
+        return spec.static and load_httpx() is not None
     
-    def scrape_the_decoder(self, page):
-        """Scrape AI news from The Decoder"""
-        print("\n📡 Scraping The Decoder...")
+    async def get_browser_context(self):
+        """Launch the browser on first use and share one context between pages
         
-        try:
-            page.goto("https://the-decoder.com", wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(2000)
-            
-            # Find article headlines
-            article_links = page.locator('h2.entry-title a, h3.entry-title a').all()
-            
-            count = 0
-            for link_elem in article_links[:10]:
-                try:
-                    headline = link_elem.text_content().strip()
-                    link = link_elem.get_attribute('href')
-                    
-                    if headline and link and len(headline) > 15:
-                        article_data = {
-                            'source': 'The Decoder',
-                            'headline': headline,
-                            'link': link,
-                            'category': self.categorize_ai_article(headline),
-                            'scraped_at': datetime.now().isoformat()
-                        }
-                        
-                        self.articles.append(article_data)
-                        self.categories[article_data['category']].append(article_data)
-                        count += 1
-                        print(f"  ✓ {headline[:60]}...")
-                        
-                except Exception as e:
-                    continue
+        Every call counts as one page about to be opened; release_page() must
+        follow. Once max_navigations is reached the context is replaced as
+        soon as no page is using it.
+        """
+        async with self.browser_lock:
+            if self.context is not None and self.max_navigations and \
+                    self.navigations >= self.max_navigations and self.open_pages == 0:
+                print(f"\n♻️ Recycling browser context after {self.navigations} pages")
+                await self.context.close()
+                self.context = None
             
-            print(f"✅ Scraped {count} AI articles from The Decoder")
+            if self.browser is None:
+                print("\n🌐 Launching browser...")
+                # Imported here: rendering and static-only runs never need it
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            if self.context is None:
+                self.context = await self.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent=USER_AGENT
+                )
+                if self.block_resources:
+                    await self.context.route('**/*', self.route_request)
+                self.navigations = 0
             
+            self.navigations += 1
+            self.open_pages += 1
+        return self.context
+    
+    def release_page(self):
+        """Note that a page from get_browser_context() was closed"""
+        self.open_pages -= 1
+    
+    def note_fetch(self, source, url, headers):
+        """Remember the validators a source was served with, for the fetch cache"""
+        self.fetched[source] = {
+            'url': url,
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+            'headline_hash': None,
+        }
+    
+    def reuse_screenshot(self, source):
+        """Copy a source's cached screenshot into this run's report; False if there is none"""
+        path = self.fetch_cache.restore_screenshot(source, self.report_dir)
+        if path is None:
+            return False
+        self.screenshots[source] = path
+        thumbnail_path = self.fetch_cache.restore_screenshot(source, self.report_dir, 'thumbnail')
+        if thumbnail_path is not None:
+            self.thumbnails[source] = thumbnail_path
+        self.screenshot_hashes[source] = self.fetch_cache.get(source).get('screenshot_hash')
+        print(f"  ♻️ {source} screenshot unchanged, reused from cache")
+        return True
+    
+    async def reuse_unchanged(self, source):
+        """Return a source's cached articles if the server says it has not changed, else None
+        
+        Sends the cached ETag / Last-Modified in a HEAD request; a 304 means
+        nothing is downloaded, parsed or screenshotted.
+        """
+        if self.fetch_cache is None or self.http_client is None:
+            return None
+        headers = self.fetch_cache.conditional_headers(source)
+        if not headers:
+            return None
+        
+        start = time.perf_counter()
+        try:
+            response = await self.http_client.head(self.fetch_cache.get(source)['url'], headers=headers)
         except Exception as e:
-            print(f"❌ Error scraping The Decoder: {e}")
+            self.metrics.count('errors', source=source, stage='conditional')
+            print(f"  ⚠️ {source} conditional request failed: {e}")
+            return None
+        if response.status_code != 304:
+            return None
+        
+        print(f"\n♻️ {source} not modified since last run, reusing cached headlines")
+        self.fetch_cache.record(source, 'hit (not modified)')
+        self.readiness[source] = {'seconds': round(time.perf_counter() - start, 3), 'signal': 'cached'}
+        if self.take_screenshots:
+            self.reuse_screenshot(source)
+        return [Article.from_dict(article) for article in self.fetch_cache.get(source)['articles']]
     
-    def categorize_ai_article(self, headline):
-        """Categorize AI articles into specific AI domains"""
-        headline_lower = headline.lower()
-        
-        # LLMs & Chatbots
-        llm_keywords = ['llm', 'gpt', 'chatgpt', 'claude', 'gemini', 'language model',
-                       'chatbot', 'chat', 'openai', 'anthropic', 'transformer', 
-                       'prompt', 'token', 'reasoning']
-        
-        # Computer Vision & Image Gen
-        vision_keywords = ['vision', 'image', 'dalle', 'midjourney', 'stable diffusion',
-                          'diffusion', 'video', 'visual', 'image generation', 'picture',
-                          'photograph', 'sora', 'gan']
-        
-        # ML Research & Models
-        research_keywords = ['research', 'paper', 'arxiv', 'model', 'training', 'dataset',
-                            'benchmark', 'algorithm', 'neural', 'deep learning', 
-                            'machine learning', 'reinforcement learning']
-        
-        # AI Ethics & Safety
-        ethics_keywords = ['ethics', 'safety', 'alignment', 'bias', 'fairness', 
-                          'regulation', 'policy', 'risk', 'governance', 'responsible ai',
-                          'ai safety', 'misuse', 'deepfake']
-        
-        # Business & Industry
-        business_keywords = ['startup', 'funding', 'investment', 'company', 'enterprise',
-                            'business', 'market', 'revenue', 'acquisition', 'launch',
-                            'product', 'service']
-        
-        # AI Agents & Automation
-        agents_keywords = ['agent', 'automation', 'autonomous', 'robot', 'workflow',
-                          'tool use', 'function calling', 'orchestration', 'agentic']
-        
-        # Hardware & Infrastructure
-        hardware_keywords = ['gpu', 'chip', 'hardware', 'nvidia', 'tpu', 'compute',
-                            'infrastructure', 'data center', 'semiconductor']
-        
-        # Check categories
-        if any(keyword in headline_lower for keyword in llm_keywords):
-            return 'LLMs & Chatbots'
-        elif any(keyword in headline_lower for keyword in vision_keywords):
-            return 'Computer Vision & Image Gen'
-        elif any(keyword in headline_lower for keyword in ethics_keywords):
-            return 'AI Ethics & Safety'
-        elif any(keyword in headline_lower for keyword in agents_keywords):
-            return 'AI Agents & Automation'
-        elif any(keyword in headline_lower for keyword in business_keywords):
-            return 'AI Business & Industry'
-        elif any(keyword in headline_lower for keyword in hardware_keywords):
-            return 'AI Hardware'
-        elif any(keyword in headline_lower for keyword in research_keywords):
-            return 'AI Research'
-        else:
-            return 'General AI News'
+    def cache_results(self, source, results):
+        """Store a freshly scraped source in the fetch cache"""
+        if self.fetch_cache is None:
+            return
+        fetched = self.fetched.get(source)
+        if results and fetched is not None:
+            self.fetch_cache.store(source, fetched['url'], fetched['etag'], fetched['last_modified'],
+                                   fetched['headline_hash'], results, self.screenshots.get(source),
+                                   self.thumbnails.get(source), self.screenshot_hashes.get(source))
+        if source not in self.fetch_cache.report:
+            self.fetch_cache.record(source, 'miss')
     
-
-    def take_source_screenshots(self, page, sources):
-        """Capture screenshots of AI news sources"""
-        print("\n📸 Capturing AI source screenshots...")
+    async def scrape_in_new_page(self, semaphore, spec):
+        """Scrape one source in its own page, bounded by the concurrency limit"""
+        async with semaphore:
+            with self.metrics.span('source', source=spec.name):
+                results = await self.reuse_unchanged(spec.name)
+                fresh = results is None
+                if fresh:
+                    results = await self.scrape_with_retries(spec)
+        
+        # The page is closed and the next source may load while this finishes
+        await self.finish_screenshot(spec.name)
+        if fresh:
+            self.cache_results(spec.name, results)
+        return results
+    
+    def retryable(self, error):
+        """False for errors another attempt will not fix: HTTP 4xx other than 408 and 429"""
+        httpx = load_httpx()
+        if httpx is not None and isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return not 400 <= status < 500 or status in (408, 429)
+        return True
+    
+    async def scrape_with_retries(self, spec):
+        """Scrape a source within its time budget, retrying failures; [] if it
+        keeps failing or its circuit breaker is open"""
+        source = spec.name
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow(source):
+            state = breaker.get(source)
+            until = datetime.fromtimestamp(state['open_until']).strftime('%H:%M')
+            print(f"\n⛔ Skipping {source}: failed {state['failures']} times in a row, next try after {until}")
+            self.metrics.count('skipped', source=source, reason='circuit_open')
+            return []
+        
+        def on_retry(number, error, delay):
+            self.metrics.count('retries', source=source)
+            print(f"  🔁 {source} failed ({describe(error)}), retry {number} in {delay:.1f}s")
         
-        screenshots = {}
+        # A second request only makes sense over HTTP; a second browser page would
+        # race the first one for the same screenshot
+        hedge_after = self.hedge_after if self.is_static(spec) else None
+        try:
+            results = await call_with_retries(lambda: self.scrape_source(spec), self.source_timeout,
+                                              self.retries, self.retry_delay, hedge_after,
+                                              self.retryable, on_retry)
+        except Exception as e:
+            self.metrics.count('errors', source=source, stage='source')
+            print(f"❌ Error scraping {source}: {describe(e)}")
+            if breaker is not None:
+                breaker.record_failure(source, e)
+            return []
+        
+        if breaker is not None:
+            breaker.record_success(source)
+        return results
+    
+    async def scrape_source(self, spec):
+        """Read a source's feed, or fetch its page over HTTP or in the browser"""
+        source = spec.name
+        if self.use_feeds and spec.feed and self.http_client is not None:
+            results = await self.scrape_feed(spec)
+            if results:
+                return results
+        
+        if self.is_static(spec):
+            page = StaticPage(self.http_client)
+            try:
+                return await self.scrape_page(page, spec)
+            finally:
+                self.network_stats[source] = {'blocked': 0, 'blocked_by': {}, 'loaded': 1,
+                                              'bytes_loaded': page.bytes_loaded}
         
-        for source_name, url in sources.items():
+        context = await self.get_browser_context()
+        try:
+            page = await context.new_page()
+            self.page_sources[page] = source
+            self.network_stats[source] = {'blocked': 0, 'blocked_by': {}, 'loaded': 0, 'bytes_loaded': 0}
+            counting = []
+            page.on('requestfinished',
+                    lambda request: counting.append(asyncio.ensure_future(self.count_request(source, request))))
             try:
-                page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                page.wait_for_timeout(2000)
-                
-                screenshot_path = os.path.join(self.report_dir, f"{source_name.lower().replace(' ', '_')}.png")
-                page.screenshot(path=screenshot_path, full_page=False)
-                screenshots[source_name] = screenshot_path
-                print(f"  ✓ {source_name} screenshot saved")
-                
-            except Exception as e:
-                print(f"  ⚠️ Failed to screenshot {source_name}: {e}")
-        
-        return screenshots
+                return await self.scrape_page(page, spec)
+            finally:
+                # Sizes can only be asked for while the page is open
+                await asyncio.gather(*counting, return_exceptions=True)
+                await page.close()
+                self.page_sources.pop(page, None)
+                self.print_network_stats(source)
+        finally:
+            self.release_page()
+    
+    def source_jobs(self):
+        """List the SourceSpecs to scrape, in registry order"""
+        jobs = list(self.sources.values())
+        if self.enabled_sources is not None:
+            jobs = [spec for spec in jobs if spec.name in self.enabled_sources]
+        return jobs
+    
+    async def scrape_all_sources(self, jobs):
+        """Scrape every source concurrently and merge results in a fixed order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Batches are merged in job order, so the merged digest does not depend
+        # on which site happened to respond first; each is merged (and written
+        # out) as soon as it and the sources before it are done
+        tasks = [asyncio.ensure_future(self.scrape_in_new_page(semaphore, spec)) for spec in jobs]
+        try:
+            for task in tasks:
+                self.add_articles(await task)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        self.order_source_stats([spec.name for spec in jobs])
+    
+    def order_source_stats(self, order):
+        """Put screenshots, readiness, network and cache stats (recorded as pages
+        finished) in source order"""
+        self.screenshots = {source: self.screenshots[source] for source in order
+                            if source in self.screenshots}
+        self.thumbnails = {source: self.thumbnails[source] for source in order
+                           if source in self.thumbnails}
+        self.readiness = {source: self.readiness[source] for source in order
+                          if source in self.readiness}
+        self.network_stats = {source: self.network_stats[source] for source in order
+                              if source in self.network_stats}
+        if self.fetch_cache is not None:
+            self.fetch_cache.report = {source: self.fetch_cache.report[source] for source in order
+                                       if source in self.fetch_cache.report}
+    
+    def categorize_ai_article(self, headline):
+        """Categorize AI articles into specific AI domains"""
+        return self.categorizer.categorize(headline)
+    
+    def story_cards(self):
+        """Group each category's articles into stories: [first article, near-duplicates...]"""
+        return story_cards(self.articles, self.categories, self.cluster_duplicates)
     
     def generate_html_digest(self, screenshots):
         """Generate beautiful HTML AI news digest"""
         print("\n📊 Generating AI HTML digest...")
         
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Daily Digest - {datetime.now().strftime('%B %d, %Y')}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
-            padding: 20px;
-            color: #333;
-            line-height: 1.6;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
-            color: white;
-            padding: 50px 40px;
-            text-align: center;
-        }}
-        .header h1 {{
-            font-size: 3em;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-        }}
-        .header .tagline {{
-            font-size: 1.2em;
-            opacity: 0.95;
-            font-weight: 300;
-            margin-bottom: 10px;
-        }}
-        .header .date {{
-            font-size: 1.1em;
-            opacity: 0.9;
-        }}
-        .header .stats {{
-            margin-top: 20px;
-            display: flex;
-            justify-content: center;
-            gap: 40px;
-            font-size: 1.1em;
-        }}
-        .stat {{
-            background: rgba(255,255,255,0.2);
-            padding: 15px 30px;
-            border-radius: 10px;
-            backdrop-filter: blur(10px);
-        }}
-        .stat strong {{
-            display: block;
-            font-size: 2em;
-            margin-bottom: 5px;
-        }}
-        .content {{
-            padding: 40px;
-        }}
-        .category-section {{
-            margin-bottom: 50px;
-        }}
-        .category-header {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 25px;
-            padding-bottom: 15px;
-            border-bottom: 3px solid #7e22ce;
-        }}
-        .category-icon {{
-            font-size: 2em;
-            margin-right: 15px;
-        }}
-        .category-title {{
-            font-size: 2em;
-            color: #7e22ce;
-            font-weight: 700;
-        }}
-        .category-count {{
-            margin-left: auto;
-            background: #7e22ce;
-            color: white;
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-size: 0.9em;
-        }}
-        .articles-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 20px;
-        }}
-        .article-card {{
-            background: #f8f9fa;
-            border-radius: 12px;
-            padding: 25px;
-            transition: all 0.3s ease;
-            border-left: 4px solid #7e22ce;
-            cursor: pointer;
-        }}
-        .article-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 10px 25px rgba(126, 34, 206, 0.2);
-            background: white;
-        }}
-        .article-source {{
-            display: inline-block;
-            background: #7e22ce;
-            color: white;
-            padding: 5px 12px;
-            border-radius: 15px;
-            font-size: 0.8em;
-            font-weight: 600;
-            margin-bottom: 12px;
-        }}
-        .article-headline {{
-            font-size: 1.2em;
-            color: #2c3e50;
-            margin-bottom: 12px;
-            font-weight: 600;
-            line-height: 1.4;
-        }}
-        .article-link {{
-            color: #7e22ce;
-            text-decoration: none;
-            font-weight: 500;
-            display: inline-flex;
-            align-items: center;
-            font-size: 0.9em;
-        }}
-        .article-link:hover {{
-            text-decoration: underline;
-        }}
-        .article-link::after {{
-            content: ' →';
-            margin-left: 5px;
-        }}
-        .screenshots-section {{
-            margin-top: 50px;
-            padding-top: 40px;
-            border-top: 2px solid #e0e0e0;
-        }}
-        .screenshots-title {{
-            font-size: 2em;
-            color: #7e22ce;
-            margin-bottom: 25px;
-            text-align: center;
-        }}
-        .screenshots-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 30px;
-        }}
-        .screenshot-card {{
-            background: #f8f9fa;
-            border-radius: 12px;
-            overflow: hidden;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }}
-        .screenshot-card img {{
-            width: 100%;
-            height: auto;
-            display: block;
-        }}
-        .screenshot-label {{
-            padding: 15px;
-            text-align: center;
-            font-weight: 600;
-            background: white;
-            color: #7e22ce;
-        }}
-        .footer {{
-            background: #2c3e50;
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .footer p {{
-            margin: 5px 0;
-        }}
-        .empty-category {{
-            text-align: center;
-            padding: 40px;
-            color: #999;
-            font-style: italic;
-        }}
-        
-        @media (max-width: 768px) {{
-            .articles-grid {{
-                grid-template-columns: 1fr;
-            }}
-            .screenshots-grid {{
-                grid-template-columns: 1fr;
-            }}
-            .header h1 {{
-                font-size: 2em;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🤖 AI Daily Digest</h1>
-            <p class="tagline">Your Personalized Artificial Intelligence News Roundup</p>
-            <p class="date">{datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}</p>
-            <div class="stats">
-                <div class="stat">
-                    <strong>{len(self.articles)}</strong>
-                    <span>AI Articles</span>
-                </div>
-                <div class="stat">
-                    <strong>{len(self.categories)}</strong>
-                    <span>AI Categories</span>
-                </div>
-                <div class="stat">
-                    <strong>{len(set(article['source'] for article in self.articles))}</strong>
-                    <span>AI Sources</span>
-                </div>
-            </div>
-        </div>
-        <div class="content">
-"""
-        
-        # AI Category icons
-        category_icons = {
-            'LLMs & Chatbots': '💬',
-            'Computer Vision & Image Gen': '👁️',
-            'AI Research': '🔬',
-            'AI Ethics & Safety': '⚖️',
-            'AI Business & Industry': '💼',
-            'AI Agents & Automation': '🤖',
-            'AI Hardware': '⚡',
-            'General AI News': '🧠'
-        }
-        
-        # Sort categories by article count
-        sorted_categories = sorted(self.categories.items(), 
-                                   key=lambda x: len(x[1]), 
-                                   reverse=True)
-        
-        # Generate category sections
-        for category, articles in sorted_categories:
-            if articles:
-                icon = category_icons.get(category, '📄')
-                html_content += f"""
-            <div class="category-section">
-                <div class="category-header">
-                    <span class="category-icon">{icon}</span>
-                    <h2 class="category-title">{category}</h2>
-                    <span class="category-count">{len(articles)} articles</span>
-                </div>
-                <div class="articles-grid">
-"""
-                
-                for article in articles:
-                    html_content += f"""
-                    <div class="article-card">
-                        <span class="article-source">{article['source']}</span>
-                        <h3 class="article-headline">{article['headline']}</h3>
-                        <a href="{article['link']}" target="_blank" class="article-link">Read Full Article</a>
-                    </div>
-"""
-                
-                html_content += """
-                </div>
-            </div>
-"""
-        
-        # Add screenshots section
-        if screenshots:
-            html_content += """
-            <div class="screenshots-section">
-                <h2 class="screenshots-title">📸 Source Screenshots</h2>
-                <div class="screenshots-grid">
-"""
-            
-            for source, path in screenshots.items():
-                filename = os.path.basename(path)
-                html_content += f"""
-                    <div class="screenshot-card">
-                        <img src="{filename}" alt="{source}">
-                        <div class="screenshot-label">{source}</div>
-                    </div>
-"""
+        with self.metrics.span('render'):
+            # One card per story: near-duplicate headlines are listed under the
+            # first article that reported them
+            chunks = render_digest(
+                self.story_cards(),
+                total_articles=len(self.articles),
+                total_categories=len(self.categories),
+                total_sources=len(set(article.source for article in self.articles)),
+                screenshots={source: os.path.basename(path) for source, path in screenshots.items()},
+                thumbnails={source: os.path.basename(path) for source, path in self.thumbnails.items()},
+                search=self.page_search,
+            )
             
-            html_content += """
-                </div>
-            </div>
-"""
-        
-        html_content += f"""
-        </div>
-        <div class="footer">
-            <p><strong>AI Daily Digest</strong></p>
-            <p>Powered by Playwright Automation | Curated AI News</p>
-            <p>Stay updated on the latest in Artificial Intelligence! 🤖</p>
-            <p style="margin-top: 15px; font-size: 0.9em; opacity: 0.8;">
-                Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        report_path = os.path.join(self.report_dir, "ai_digest.html")
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            # Written piece by piece, so the page is never held in memory as a whole
+            report_path = os.path.join(self.report_dir, "ai_digest.html")
+            write_digest(report_path, chunks)
         
         print(f"✅ AI HTML digest saved: {report_path}")
         return report_path
     
-    def save_json_data(self):
-        """Save raw AI news data as JSON"""
-        json_path = os.path.join(self.report_dir, "ai_news_data.json")
-        
-        data = {
+    def summary(self):
+        """Run totals written next to the JSONL articles"""
+        return {
             'generated_at': datetime.now().isoformat(),
             'total_articles': len(self.articles),
-            'categories': {cat: len(articles) for cat, articles in self.categories.items()},
-            'articles': self.articles
+            'new_articles': sum(not article.seen_before for article in self.articles),
+            'categories': {cat: len(positions) for cat, positions in self.categories.items()},
+            'readiness': self.readiness,
+            'network': self.network_stats,
+            'fetch_cache': self.fetch_cache.report if self.fetch_cache is not None else {},
+            'screenshots': {source: os.path.basename(path) for source, path in self.screenshots.items()},
+            'thumbnails': {source: os.path.basename(path) for source, path in self.thumbnails.items()},
         }
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    def save_json_data(self):
+        """Write the final summary and rebuild ai_news_data.json from the JSONL output"""
+        with self.metrics.span('json_write'):
+            write_summary(os.path.join(self.report_dir, SUMMARY_FILE), self.summary())
+            json_path = rebuild_json(self.report_dir)
         
         print(f"✅ JSON data saved: {json_path}")
         return json_path
     
+    def save_metrics(self):
+        """Write metrics.json and metrics.prom next to the JSON data; None when disabled"""
+        if not self.metrics.enabled:
+            return None
+        metrics_path = self.metrics.save(self.report_dir)
+        print(f"✅ Metrics saved: {metrics_path}")
+        return metrics_path
+    
+    def open_clients(self):
+        """Create the keep-alive HTTP pool; the browser is launched when first needed"""
+        self.browser_lock = asyncio.Lock()
+        if self.take_screenshots and pillow() is not None:
+            self.screenshot_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='screenshots')
+        httpx = load_httpx()
+        if httpx is not None:
+            self.http_client = httpx.AsyncClient(
+                headers={'User-Agent': USER_AGENT},
+                timeout=30,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+    
+    async def close_clients(self):
+        """Close the HTTP pool and the browser, if they were started"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = self.context = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+        if self.screenshot_pool is not None:
+            self.screenshot_pool.shutdown(wait=True)
+            self.screenshot_pool = None
+    
+    async def collect_sources(self):
+        """Scrape all sources and return their screenshots
+        
+        Static sources go through a keep-alive HTTP pool; the browser is only
+        launched if an enabled source needs it.
+        """
+        jobs = self.source_jobs()
+        self.open_clients()
+        
+        try:
+            # Scrape from AI-focused sources, screenshotting each page as it loads
+            await self.scrape_all_sources(jobs)
+            if self.fetch_cache is not None:
+                self.fetch_cache.save()
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.save()
+            return self.screenshots
+            
+        finally:
+            self.sink.close()
+            await self.close_clients()
+    
     def run_aggregation(self):
         """Run the complete AI news aggregation"""
         print("\n" + "=" * 70)
         print("🤖 AI DAILY DIGEST - YOUR PERSONALIZED AI NEWS ROUNDUP")
         print("=" * 70)
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
-            page = context.new_page()
-            
-            try:
-                # Scrape from AI-focused sources
-                self.scrape_venturebeat_ai(page)
-                self.scrape_mit_tech_review_ai(page)
-                self.scrape_the_decoder(page)
-                self.scrape_reddit_ai(page)
-                self.scrape_hacker_news_ai(page)
-                
-                # Take screenshots
-                print("\n" + "=" * 70)
-                sources = {
-                    'VentureBeat AI': 'https://venturebeat.com/ai/',
-                    'MIT Tech Review AI': 'https://www.technologyreview.com/topic/artificial-intelligence/',
-                    'The Decoder': 'https://the-decoder.com',
-                    'Reddit r/artificial': 'https://www.reddit.com/r/artificial',
-                    'Hacker News': 'https://news.ycombinator.com'
-                }
-                screenshots = self.take_source_screenshots(page, sources)
-                
-            finally:
-                browser.close()
+        if self.processes > 1:
+            from sharding import collect_sharded
+            screenshots = collect_sharded(self, self.processes)
+        else:
+            screenshots = asyncio.run(self.collect_sources())
         
         # Generate reports
         print("\n" + "=" * 70)
@@ -705,6 +1013,13 @@ class AIDailyDigest:
         
         html_report = self.generate_html_digest(screenshots)
         json_data = self.save_json_data()
+        self.save_metrics()
+        self.remember_articles()
+        self.archive_articles()
+        if self.seen_index is not None:
+            self.seen_index.close()
+        if self.archive is not None:
+            self.archive.close()
         
         # Summary
         print("\n" + "=" * 70)
@@ -713,33 +1028,213 @@ class AIDailyDigest:
         print(f"\n📊 Statistics:")
         print(f"   Total AI Articles: {len(self.articles)}")
         print(f"   AI Categories: {len(self.categories)}")
-        print(f"   AI Sources: {len(set(article['source'] for article in self.articles))}")
+        print(f"   AI Sources: {len(set(article.source for article in self.articles))}")
+        if self.dedupe:
+            action = 'dropped' if self.dedupe == 'new' else 'marked'
+            print(f"   Seen in earlier runs: {self.repeats} ({action})")
+        if self.readiness:
+            print(f"\n⏱️ Time to ready:")
+            for source, ready in self.readiness.items():
+                print(f"   {source}: {ready['seconds']:.2f}s ({ready['signal']})")
+        if self.fetch_cache is not None and self.fetch_cache.report:
+            print(f"\n♻️ Fetch cache:")
+            for source, outcome in self.fetch_cache.report.items():
+                entry = self.fetch_cache.get(source) or {}
+                print(f"   {source}: {outcome} "
+                      f"({entry.get('hits', 0)} hits, {entry.get('misses', 0)} misses overall)")
+        if self.circuit_breaker is not None and self.circuit_breaker.states:
+            print(f"\n⛔ Failing sources:")
+            for source, state in self.circuit_breaker.states.items():
+                status = 'skipped until ' + datetime.fromtimestamp(state['open_until']).strftime('%Y-%m-%d %H:%M') \
+                    if state['open_until'] else 'still tried'
+                print(f"   {source}: {state['failures']} failed runs in a row, {status} ({state['last_error']})")
+        if self.metrics.enabled and self.metrics.timings:
+            print(f"\n⏲️ Time per stage:")
+            for stage, (calls, seconds) in self.metrics.stage_totals().items():
+                print(f"   {stage}: {seconds:.2f}s over {calls} calls")
         print(f"\n📁 Files saved in: {self.report_dir}/")
         print(f"   - AI HTML Digest: ai_digest.html")
         print(f"   - AI JSON Data: ai_news_data.json")
-        print(f"   - Screenshots: *.png files")
+        print(f"   - Articles as collected: {ARTICLES_FILE} (totals in {SUMMARY_FILE})")
+        if self.metrics.enabled:
+            print(f"   - Timings and counters: {METRICS_FILE}, {PROMETHEUS_FILE}")
+        print(f"   - Screenshots: *{EXTENSIONS[self.screenshot_format]} files")
         print("\n💡 Open ai_digest.html in your browser to read your AI news digest!")
         print("=" * 70 + "\n")
 
 
-if __name__ == "__main__":
-    print("\n" + "=" * 70)
-    print("🤖 WELCOME TO AI DAILY DIGEST")
-    print("=" * 70)
-    print("\nYour personalized daily roundup of AI news and developments!")
-    print("This tool will:")
-    print("  ✓ Scrape AI news from VentureBeat, MIT Tech Review, The Decoder")
-    print("  ✓ Filter AI discussions from Reddit (r/artificial, r/MachineLearning)")
-    print("  ✓ Find AI stories on Hacker News")
-    print("  ✓ Categorize by AI domains (LLMs, Vision, Research, Ethics, etc.)")
-    print("  ✓ Create a beautiful personalized AI digest")
-    print("\n⚠️  Note: This will open a browser and visit AI news websites.")
-    print("=" * 70 + "\n")
-    
-    user_input = input("Press ENTER to start AI news aggregation or 'q' to quit: ")
-    
-    if user_input.lower() != 'q':
-        aggregator = AIDailyDigest()
-        aggregator.run_aggregation()
+def index_categories(articles):
+    """Category -> positions of its articles"""
+    categories = defaultdict(lambda: array('q'))
+    for position, article in enumerate(articles):
+        categories[article.category].append(position)
+    return categories
+
+
+def story_cards(articles, categories, cluster_duplicates=True):
+    """Group each category's articles into stories: [first article, near-duplicates...]"""
+    if not cluster_duplicates:
+        return {category: [[articles[i]] for i in positions]
+                for category, positions in categories.items()}
+    
+    # Imported here: NumPy, which it uses when installed, is slow to load
+    from near_dupes import group_articles
+    groups = group_articles(articles)
+    cards = defaultdict(list)
+    for first, members in groups.items():
+        article = articles[first]
+        cards[article.category].append([articles[i] for i in members])
+    return cards
+
+
+def load_report(report_dir):
+    """Articles and summary of a saved digest: articles.jsonl and summary.json,
+    or ai_news_data.json for digests older than the JSONL output"""
+    jsonl_path = os.path.join(report_dir, ARTICLES_FILE)
+    if os.path.exists(jsonl_path):
+        records = list(read_jsonl(jsonl_path))
+        try:
+            with open(os.path.join(report_dir, SUMMARY_FILE), encoding='utf-8') as f:
+                summary = json.load(f)
+        except OSError:
+            summary = {}
     else:
-        print("\n👋 Goodbye! Stay updated on AI!")
+        with open(os.path.join(report_dir, COMBINED_FILE), encoding='utf-8') as f:
+            summary = json.load(f)
+        records = summary.pop('articles', [])
+    return [Article.from_dict(record) for record in records], summary
+
+
+def find_screenshots(report_dir, articles):
+    """Screenshots next to a saved digest that did not list them in its summary"""
+    found = {}
+    for source in dict.fromkeys(article.source for article in articles):
+        for extension in EXTENSIONS.values():
+            filename = screenshot_name(source) + extension
+            if os.path.exists(os.path.join(report_dir, filename)):
+                found[source] = filename
+                break
+    return found
+
+
+def render_report(report_dir, cluster_duplicates=True, search=True):
+    """Rebuild ai_digest.html from a saved digest; no browser or network involved"""
+    articles, summary = load_report(report_dir)
+    categories = index_categories(articles)
+    chunks = render_digest(
+        story_cards(articles, categories, cluster_duplicates),
+        total_articles=len(articles),
+        total_categories=len(categories),
+        total_sources=len(set(article.source for article in articles)),
+        screenshots=summary.get('screenshots') or find_screenshots(report_dir, articles),
+        thumbnails=summary.get('thumbnails'),
+        search=search,
+    )
+    report_path = os.path.join(report_dir, "ai_digest.html")
+    write_digest(report_path, chunks)
+    return report_path
+
+
+def recategorize_report(report_dir, categorizer=None):
+    """Categorize a saved digest's articles again and rewrite its JSON output;
+    returns the number of articles whose category changed"""
+    categorizer = categorizer or KeywordCategorizer()
+    articles, summary = load_report(report_dir)
+    
+    changed = 0
+    for article, category in zip(articles, categorizer.categorize_many([article.headline for article in articles])):
+        changed += article.category != category
+        article.category = category
+    
+    # Written aside and moved into place, so an interrupted rewrite keeps the old file
+    jsonl_path = os.path.join(report_dir, ARTICLES_FILE)
+    sink = JsonlSink(jsonl_path + '.tmp', append=False)
+    sink.write([article.to_dict() for article in articles])
+    sink.close()
+    os.replace(jsonl_path + '.tmp', jsonl_path)
+    
+    summary['categories'] = {category: len(positions) for category, positions in index_categories(articles).items()}
+    write_summary(os.path.join(report_dir, SUMMARY_FILE), summary)
+    rebuild_json(report_dir)
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect AI news into a daily digest, or rebuild a saved one")
+    commands = parser.add_subparsers(dest='command')
+    
+    scrape = commands.add_parser('scrape', help="scrape the sources into a new digest (the default)")
+    scrape.add_argument('--headed', action='store_true', help="show the browser window")
+    scrape.add_argument('--report-dir', help="output folder (default: ai_digest_<timestamp>)")
+    scrape.add_argument('--sources', help="source registry file (default: sources.json)")
+    scrape.add_argument('--only', nargs='+', metavar='SOURCE', help="scrape only these sources")
+    scrape.add_argument('--processes', type=int, default=1)
+    scrape.add_argument('--max-concurrency', type=int, default=4)
+    scrape.add_argument('--no-feeds', action='store_true', help="always scrape the pages")
+    scrape.add_argument('--no-screenshots', action='store_true')
+    scrape.add_argument('--screenshot-format', choices=['png', 'jpeg', 'webp'], default='jpeg')
+    scrape.add_argument('--no-metrics', action='store_true')
+    scrape.add_argument('--source-timeout', type=float, default=90, help="seconds per source, retries included")
+    scrape.add_argument('--retries', type=int, default=2)
+    scrape.add_argument('--hedge-after', type=float, help="send a second HTTP request after this many seconds")
+    scrape.add_argument('--no-search', action='store_true', help="leave the search box out of the page")
+    
+    render = commands.add_parser('render', help="rebuild ai_digest.html from a saved digest, without a browser")
+    render.add_argument('report_dir', help="ai_digest_YYYYMMDD_HHMMSS folder")
+    render.add_argument('--no-clusters', action='store_true', help="one card per article")
+    render.add_argument('--no-search', action='store_true', help="leave the search box out of the page")
+    
+    categorize = commands.add_parser('categorize', help="categorize a saved digest again and re-render it")
+    categorize.add_argument('report_dir', help="ai_digest_YYYYMMDD_HHMMSS folder")
+    categorize.add_argument('--model', help="learned categorizer (see learned_categorizer.py)")
+    categorize.add_argument('--no-render', action='store_true', help="only rewrite the JSON output")
+    categorize.add_argument('--no-clusters', action='store_true', help="one card per article")
+    categorize.add_argument('--no-search', action='store_true', help="leave the search box out of the page")
+    
+    argv = sys.argv[1:] if argv is None else argv
+    # Plain `python ai_daily_digest.py [options]` scrapes
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv = ['scrape'] + argv
+    args = parser.parse_args(argv)
+    
+    if args.command == 'scrape':
+        options = {
+            'headless': not args.headed,
+            'report_dir': args.report_dir,
+            'enabled_sources': args.only,
+            'processes': args.processes,
+            'max_concurrency': args.max_concurrency,
+            'use_feeds': not args.no_feeds,
+            'take_screenshots': not args.no_screenshots,
+            'screenshot_format': args.screenshot_format,
+            'metrics': not args.no_metrics,
+            'source_timeout': args.source_timeout,
+            'retries': args.retries,
+            'hedge_after': args.hedge_after,
+            'page_search': not args.no_search,
+        }
+        if args.sources:
+            options['sources'] = args.sources
+        AIDailyDigest(**options).run_aggregation()
+        return
+    
+    try:
+        if args.command == 'categorize':
+            categorizer = None
+            if args.model:
+                from learned_categorizer import LearnedCategorizer
+                categorizer = LearnedCategorizer.load(args.model)
+            changed = recategorize_report(args.report_dir, categorizer)
+            print(f"✅ Categorized {args.report_dir} again: {changed} articles changed category")
+            if args.no_render:
+                return
+        report_path = render_report(args.report_dir, cluster_duplicates=not args.no_clusters,
+                                    search=not args.no_search)
+        print(f"✅ AI HTML digest saved: {report_path}")
+    except Exception as e:
+        print(f"❌ Could not {args.command} {args.report_dir}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
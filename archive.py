@@ -0,0 +1,358 @@
+"""
+AI News Daily Digest - Article Archive
+Purpose: Keep every run's articles in one SQLite archive, with per-day,
+         per-category, per-source counts maintained as articles arrive, so
+         history and trend questions do not mean re-reading old digests
+
+Usage:
+    python archive.py import ai_digest_*/
+    python archive.py trends --period week
+    python archive.py counts --category "LLMs & Chatbots" --since 2024-12-01
+    python archive.py articles --source "Hacker News" --since 2024-12-01
+    python archive.py search "open source model"
+"""
+
+import argparse
+import sqlite3
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+from categorizer import DEFAULT_CATEGORY
+from dedupe_index import canonicalize_url
+from search_index import SearchIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at INTEGER NOT NULL,
+    report_dir TEXT,
+    new_articles INTEGER NOT NULL
+);
+
+-- One row per story and source; a story collected again by a later run is not added twice
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    day TEXT NOT NULL,
+    scraped_at INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    headline TEXT NOT NULL,
+    link TEXT,
+    canonical TEXT NOT NULL,
+    UNIQUE (source, canonical)
+);
+-- Newest first, optionally for one source or category
+CREATE INDEX IF NOT EXISTS articles_scraped_at ON articles (scraped_at);
+CREATE INDEX IF NOT EXISTS articles_source_time ON articles (source, scraped_at);
+CREATE INDEX IF NOT EXISTS articles_category_time ON articles (category, scraped_at);
+CREATE INDEX IF NOT EXISTS articles_canonical ON articles (canonical);
+
+-- Kept up to date by the triggers below, never recomputed; whole months are
+-- read from monthly_counts so long ranges touch few rows
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day TEXT NOT NULL,
+    category TEXT NOT NULL,
+    source TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, category, source)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS monthly_counts (
+    month TEXT NOT NULL,
+    category TEXT NOT NULL,
+    source TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (month, category, source)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS count_added AFTER INSERT ON articles BEGIN
+    INSERT INTO daily_counts (day, category, source, count) VALUES (NEW.day, NEW.category, NEW.source, 1)
+    ON CONFLICT (day, category, source) DO UPDATE SET count = count + 1;
+    INSERT INTO monthly_counts (month, category, source, count)
+    VALUES (substr(NEW.day, 1, 7), NEW.category, NEW.source, 1)
+    ON CONFLICT (month, category, source) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS count_removed AFTER DELETE ON articles BEGIN
+    UPDATE daily_counts SET count = count - 1
+    WHERE day = OLD.day AND category = OLD.category AND source = OLD.source;
+    UPDATE monthly_counts SET count = count - 1
+    WHERE month = substr(OLD.day, 1, 7) AND category = OLD.category AND source = OLD.source;
+END;
+
+CREATE TRIGGER IF NOT EXISTS count_moved AFTER UPDATE OF day, category, source ON articles BEGIN
+    UPDATE daily_counts SET count = count - 1
+    WHERE day = OLD.day AND category = OLD.category AND source = OLD.source;
+    UPDATE monthly_counts SET count = count - 1
+    WHERE month = substr(OLD.day, 1, 7) AND category = OLD.category AND source = OLD.source;
+    INSERT INTO daily_counts (day, category, source, count) VALUES (NEW.day, NEW.category, NEW.source, 1)
+    ON CONFLICT (day, category, source) DO UPDATE SET count = count + 1;
+    INSERT INTO monthly_counts (month, category, source, count)
+    VALUES (substr(NEW.day, 1, 7), NEW.category, NEW.source, 1)
+    ON CONFLICT (month, category, source) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# Group-by keys callers may ask for
+DIMENSIONS = ('day', 'category', 'source')
+
+
+def story_key(article):
+    """Canonical link of an article, or its headline when it has no link"""
+    return canonicalize_url(article.link) or f"headline:{article.headline}"
+
+
+def as_date(value):
+    """date from a date or 'YYYY-MM-DD' text; None stays None"""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def filters(column, since=None, until=None, category=None, source=None):
+    """WHERE clause (or '') and its parameters: column between since and until,
+    category and source"""
+    where, params = [], []
+    for name, operator, value in ((column, '>=', since), (column, '<=', until),
+                                  ('category', '=', category), ('source', '=', source)):
+        if value is not None:
+            where.append(f"{name} {operator} ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(where) if where else ''), params
+
+
+def split_months(since, until):
+    """Cover since..until (dates or None for open ends) with whole months and
+    the days left over: ([(first, last) day ranges], (first, last) months or None)"""
+    first_month = since if since is None or since.day == 1 else \
+        (since.replace(day=28) + timedelta(days=4)).replace(day=1)
+    after_until = until + timedelta(days=1) if until is not None else None
+    last_month = until if until is None or after_until.day == 1 else until.replace(day=1) - timedelta(days=1)
+    if first_month is not None and last_month is not None and first_month > last_month:
+        return [(since, until)], None
+
+    days = []
+    if since is not None and since < first_month:
+        days.append((since, first_month - timedelta(days=1)))
+    if until is not None and until > last_month:
+        days.append((last_month + timedelta(days=1), until))
+    months = (first_month.strftime('%Y-%m') if first_month else None,
+              last_month.strftime('%Y-%m') if last_month else None)
+    return days, months
+
+
+def period_start(day, period):
+    """First day of the week (Monday) or month containing day"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unknown period: {period!r}")
+
+
+def previous_period_start(start, period):
+    if period == 'week':
+        return start - timedelta(days=7)
+    return (start - timedelta(days=1)).replace(day=1)
+
+
+class ArticleArchive:
+    """SQLite archive of the articles of every run"""
+
+    def __init__(self, path='digest_archive.db'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+        self.search_index = SearchIndex(self.connection)
+
+    def add_run(self, articles, report_dir=None, finished_at=None):
+        """Archive a run's articles; returns how many were not archived before"""
+        finished_at = int(finished_at or time.time())
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (finished_at, report_dir, new_articles) VALUES (?, ?, 0)",
+                (finished_at, report_dir)).lastrowid
+            last_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+            self.connection.executemany("""
+                INSERT OR IGNORE INTO articles
+                    (run_id, day, scraped_at, source, category, headline, link, canonical)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(run_id, date.fromtimestamp(article.scraped_at).isoformat(), article.scraped_at,
+                   article.source, article.category or DEFAULT_CATEGORY, article.headline, article.link,
+                   story_key(article)) for article in articles])
+            # Ignored rows take no id, so the new ones are numbered consecutively
+            added = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0] - last_id
+            self.connection.execute("UPDATE runs SET new_articles = ? WHERE id = ?", (added, run_id))
+            self.search_index.update()
+        return added
+
+    def counts(self, since=None, until=None, by=('category',), category=None, source=None):
+        """Article counts between two days (inclusive), grouped by some of day,
+        category and source: [(*group values, count)], largest first (by day:
+        oldest first)
+
+        Read from the maintained counters: whole months from monthly_counts,
+        other days from daily_counts.
+        """
+        unknown = set(by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Cannot group by: {', '.join(sorted(unknown))}")
+        since, until = as_date(since), as_date(until)
+
+        if 'day' in by:
+            days, months = [(since, until)], None
+        else:
+            days, months = split_months(since, until)
+        parts = [('daily_counts', 'day', first and first.isoformat(), last and last.isoformat())
+                 for first, last in days]
+        if months is not None:
+            parts.append(('monthly_counts', 'month') + months)
+
+        totals = {}
+        columns = ', '.join(by)
+        for table, column, first, last in parts:
+            where, params = filters(column, first, last, category, source)
+            query = f"SELECT {columns + ', ' if by else ''}SUM(count) FROM {table}{where}"
+            if by:
+                query += f" GROUP BY {columns}"
+            for row in self.connection.execute(query, params):
+                totals[row[:-1]] = totals.get(row[:-1], 0) + (row[-1] or 0)
+
+        rows = [key + (count,) for key, count in totals.items() if count > 0 or not by]
+        if 'day' in by:
+            return sorted(rows)
+        return sorted(rows, key=lambda row: (-row[-1], row[:-1]))
+
+    def articles(self, since=None, until=None, category=None, source=None, limit=100):
+        """Archived articles between two days (inclusive), newest first:
+        [(day, source, category, headline, link)]"""
+        since, until = as_date(since), as_date(until)
+        # Timestamps rather than days, so the (source|category, scraped_at) indexes serve the range
+        start = int(datetime.combine(since, clock()).timestamp()) if since else None
+        end = int(datetime.combine(until + timedelta(days=1), clock()).timestamp()) - 1 if until else None
+        where, params = filters('scraped_at', start, end, category, source)
+        query = (f"SELECT day, source, category, headline, link FROM articles{where} "
+                 f"ORDER BY scraped_at DESC LIMIT ?")
+        return [tuple(row) for row in self.connection.execute(query, params + [limit])]
+
+    def search(self, query, limit=20):
+        """Articles matching every word of query (the last may be the start of
+        a word), best first: [(score, day, source, category, headline, link)]"""
+        with self.connection:
+            # Catches up on articles archived before the search index existed
+            self.search_index.update()
+        ranked = self.search_index.search(query, limit)
+        if not ranked:
+            return []
+        rows = {row[0]: row[1:] for row in self.connection.execute(
+            f"SELECT id, day, source, category, headline, link FROM articles "
+            f"WHERE id IN ({','.join('?' * len(ranked))})", [article_id for _, article_id in ranked])}
+        return [(score,) + rows[article_id] for score, article_id in ranked]
+
+    def trends(self, period='week', today=None):
+        """Per-category counts for the current week or month against the one before
+
+        Returns {'period', 'start', 'previous_start', 'categories': [(category,
+        current, previous)], 'sources': [(source, current)]}, biggest first.
+        The current period runs up to today.
+        """
+        today = today or date.today()
+        start = period_start(today, period)
+        previous_start = previous_period_start(start, period)
+
+        current = dict(self.counts(start, today))
+        previous = dict(self.counts(previous_start, start - timedelta(days=1)))
+        categories = sorted(set(current) | set(previous),
+                            key=lambda category: (-current.get(category, 0), -previous.get(category, 0)))
+        return {
+            'period': period,
+            'start': start.isoformat(),
+            'previous_start': previous_start.isoformat(),
+            'categories': [(category, current.get(category, 0), previous.get(category, 0))
+                           for category in categories],
+            'sources': self.counts(start, today, by=('source',)),
+        }
+
+    def close(self):
+        self.connection.close()
+
+
+def print_trends(report):
+    label = 'Week' if report['period'] == 'week' else 'Month'
+    print(f"\n📈 {label} from {report['start']} (previous from {report['previous_start']})")
+    print(f"   {'category':<32} {'now':>6} {'before':>7} {'change':>8}")
+    for category, current, previous in report['categories']:
+        change = f"{(current - previous) / previous:+.0%}" if previous else 'new'
+        print(f"   {category:<32} {current:>6} {previous:>7} {change:>8}")
+    if report['sources']:
+        print(f"\n📰 Sources: " + ', '.join(f"{source} {count}" for source, count in report['sources']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the archive of every digest's articles")
+    parser.add_argument('--db', default='digest_archive.db', help="archive file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backfill = commands.add_parser('import', help="add saved digests to the archive")
+    backfill.add_argument('report_dirs', nargs='+', help="ai_digest_YYYYMMDD_HHMMSS folders")
+
+    trends = commands.add_parser('trends', help="this week or month against the previous one")
+    trends.add_argument('--period', choices=['week', 'month'], default='week')
+
+    counts = commands.add_parser('counts', help="article counts per day, category or source")
+    counts.add_argument('--by', default='category', help="comma separated: day, category, source")
+
+    listing = commands.add_parser('articles', help="list archived articles, newest first")
+    listing.add_argument('--limit', type=int, default=50)
+
+    search = commands.add_parser('search', help="find articles by words of their headline or source")
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+
+    commands.add_parser('reindex', help="rebuild the search index from scratch")
+
+    for command in (counts, listing):
+        command.add_argument('--since', help="YYYY-MM-DD")
+        command.add_argument('--until', help="YYYY-MM-DD")
+        command.add_argument('--category')
+        command.add_argument('--source')
+
+    args = parser.parse_args()
+    archive = ArticleArchive(args.db)
+    try:
+        if args.command == 'import':
+            # Imported here: loading saved digests is the main module's job
+            from ai_daily_digest import load_report
+            for report_dir in args.report_dirs:
+                try:
+                    articles, _ = load_report(report_dir)
+                    added = archive.add_run(articles, report_dir)
+                    print(f"✅ {report_dir}: {added} of {len(articles)} articles added")
+                except Exception as e:
+                    print(f"❌ Could not import {report_dir}: {e}")
+        elif args.command == 'trends':
+            print_trends(archive.trends(args.period))
+        elif args.command == 'counts':
+            by = tuple(dimension.strip() for dimension in args.by.split(',') if dimension.strip())
+            for row in archive.counts(args.since, args.until, by, args.category, args.source):
+                print('   ' + ' | '.join(str(value) for value in row))
+        elif args.command == 'search':
+            results = archive.search(args.query, args.limit)
+            if not results:
+                print(f"🔍 Nothing matches {args.query!r}")
+            for score, day, source, category, headline, link in results:
+                print(f"   {score:5.2f} {day} [{source} / {category}] {headline}\n         {link}")
+        elif args.command == 'reindex':
+            print(f"🔍 Indexed {archive.search_index.rebuild()} articles")
+        else:
+            for day, source, category, headline, link in archive.articles(
+                    args.since, args.until, args.category, args.source, args.limit):
+                print(f"   {day} [{source} / {category}] {headline}\n      {link}")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
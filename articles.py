@@ -0,0 +1,54 @@
+"""
+AI News Daily Digest - Article Records
+Purpose: Compact article type for runs and archives with many articles
+"""
+
+import sys
+import time
+from datetime import datetime
+
+
+class Article:
+    """One scraped headline
+
+    __slots__ keeps each record small; source and category names are
+    interned so every article of a source shares one string, and scraped_at
+    is an integer Unix timestamp rather than a formatted string.
+    to_dict() gives the JSON record used in the output files.
+    """
+
+    __slots__ = ('source', 'headline', 'link', 'category', 'scraped_at', 'seen_before')
+
+    def __init__(self, source, headline, link, category=None, scraped_at=None, seen_before=None):
+        self.source = sys.intern(source)
+        self.headline = headline
+        self.link = link
+        self.category = sys.intern(category) if category is not None else None
+        self.scraped_at = int(time.time() if scraped_at is None else scraped_at)
+        # None when earlier runs were not checked
+        self.seen_before = seen_before
+
+    @classmethod
+    def from_dict(cls, data):
+        """Article from a JSON record (scraped_at as ISO 8601 text or a timestamp)"""
+        scraped_at = data.get('scraped_at')
+        if isinstance(scraped_at, str):
+            scraped_at = datetime.fromisoformat(scraped_at).timestamp()
+        return cls(data['source'], data['headline'], data['link'], data.get('category'),
+                   scraped_at, data.get('seen_before'))
+
+    def to_dict(self):
+        """JSON record with the same keys and ISO 8601 scraped_at as earlier digests"""
+        data = {
+            'source': self.source,
+            'headline': self.headline,
+            'link': self.link,
+            'category': self.category,
+            'scraped_at': datetime.fromtimestamp(self.scraped_at).isoformat(),
+        }
+        if self.seen_before is not None:
+            data['seen_before'] = self.seen_before
+        return data
+
+    def __repr__(self):
+        return f"Article({self.source!r}, {self.headline!r}, {self.link!r}, category={self.category!r})"
@@ -0,0 +1,135 @@
+"""
+Benchmark: archive queries over years of history, pre-aggregated vs. raw
+Usage: python benchmarks/bench_archive.py [--years 3] [--per-day 300] [--runs-per-day 4]
+
+Fills a temporary archive with synthetic runs (stories repeat across the
+runs of a day, as they do for a daemon), timing how long each run takes to
+add. Then times trend and count queries answered from the incrementally
+maintained daily_counts and monthly_counts tables against the same numbers computed by
+grouping the raw articles table, and checks that both agree.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from archive import ArticleArchive
+from articles import Article
+from categorizer import CATEGORY_KEYWORDS, DEFAULT_CATEGORY
+
+SOURCES = ['VentureBeat AI', 'MIT Tech Review', 'The Decoder', 'Reddit r/artificial',
+           'Reddit r/MachineLearning', 'Hacker News']
+CATEGORIES = [category for category, _ in CATEGORY_KEYWORDS] + [DEFAULT_CATEGORY]
+
+
+def day_articles(rng, day, count, story_ids):
+    """One day's stories, each scraped some time during the day"""
+    start = datetime.combine(day, clock()).timestamp()
+    articles = []
+    for _ in range(count):
+        story = next(story_ids)
+        articles.append(Article(rng.choice(SOURCES), f"Story {story} about AI", f"https://example.com/{story}",
+                                rng.choice(CATEGORIES), start + rng.randrange(86400)))
+    return articles
+
+
+def timed(function, repeat=20):
+    """Median milliseconds of a few calls, and the last result"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main(years, per_day, runs_per_day):
+    rng = random.Random(7)
+    story_ids = iter(range(10 ** 9))
+    today = date.today()
+    first_day = today - timedelta(days=365 * years)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ArticleArchive(os.path.join(tmp, 'archive.db'))
+        run_ms = []
+        day = first_day
+        while day <= today:
+            articles = day_articles(rng, day, per_day, story_ids)
+            # Each run sees a growing share of the day's stories, so most are repeats
+            for run in range(1, runs_per_day + 1):
+                batch = articles[:len(articles) * run // runs_per_day]
+                start = time.perf_counter()
+                archive.add_run(batch, f'run_{day}_{run}')
+                run_ms.append((time.perf_counter() - start) * 1000)
+            day += timedelta(days=1)
+
+        total = archive.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        size_mb = os.path.getsize(archive.path) / 1024 / 1024
+        print(f"{total:,} articles over {years} years, {len(run_ms):,} runs, {size_mb:.0f} MB")
+        print(f"add_run: median {statistics.median(run_ms):.1f} ms, max {max(run_ms):.1f} ms")
+
+        month_ago = (today - timedelta(days=30)).isoformat()
+        raw = archive.connection
+        checks = [
+            ("weekly trends",
+             lambda: archive.trends('week', today)['categories'],
+             None),
+            ("monthly trends",
+             lambda: archive.trends('month', today)['categories'],
+             None),
+            ("LLM stories per day, last 30 days",
+             lambda: archive.counts(month_ago, by=('day',), category='LLMs & Chatbots'),
+             lambda: [tuple(row) for row in raw.execute(
+                 "SELECT day, COUNT(*) FROM articles WHERE day >= ? AND category = ? GROUP BY day ORDER BY day",
+                 (month_ago, 'LLMs & Chatbots'))]),
+            ("stories per category, all time",
+             lambda: sorted(archive.counts()),
+             lambda: sorted(tuple(row) for row in raw.execute(
+                 "SELECT category, COUNT(*) FROM articles GROUP BY category"))),
+            ("stories per source per month, all time",
+             lambda: [tuple(row) for row in raw.execute(
+                 "SELECT month, source, SUM(count) FROM monthly_counts "
+                 "GROUP BY month, source HAVING SUM(count) > 0 ORDER BY month, source")],
+             lambda: [tuple(row) for row in raw.execute(
+                 "SELECT substr(day, 1, 7) AS month, source, COUNT(*) FROM articles "
+                 "GROUP BY month, source ORDER BY month, source")]),
+            ("LLM stories per source, last 30 days",
+             lambda: sorted(archive.counts(month_ago, by=('source',), category='LLMs & Chatbots')),
+             lambda: sorted(tuple(row) for row in raw.execute(
+                 "SELECT source, COUNT(*) FROM articles WHERE day >= ? AND category = ? GROUP BY source",
+                 (month_ago, 'LLMs & Chatbots')))),
+            ("latest 50 from one source",
+             lambda: archive.articles(source='Hacker News', limit=50),
+             lambda: [tuple(row) for row in raw.execute(
+                 "SELECT day, source, category, headline, link FROM articles NOT INDEXED "
+                 "WHERE source = ? ORDER BY scraped_at DESC LIMIT 50", ('Hacker News',))]),
+            ("latest 50 from one source, last week",
+             lambda: archive.articles(today - timedelta(days=7), source='Hacker News', limit=50),
+             None),
+        ]
+
+        print(f"{'query':>40} {'archive ms':>11} {'raw ms':>8} {'same':>5}")
+        for name, fast, slow in checks:
+            fast_ms, fast_result = timed(fast)
+            if slow is None:
+                print(f"{name:>40} {fast_ms:>11.2f} {'-':>8} {'-':>5}")
+                continue
+            slow_ms, slow_result = timed(slow, repeat=3)
+            print(f"{name:>40} {fast_ms:>11.2f} {slow_ms:>8.1f} {str(fast_result == slow_result):>5}")
+        archive.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--per-day', type=int, default=300)
+    parser.add_argument('--runs-per-day', type=int, default=4)
+    args = parser.parse_args()
+    main(args.years, args.per_day, args.runs_per_day)
@@ -0,0 +1,92 @@
+"""
+Benchmark: memory of dict article records vs. slotted Article records
+Usage: python benchmarks/bench_articles.py [--records 1000000]
+
+Builds the same synthetic articles twice, the way add_articles keeps them:
+as five-key dicts referenced from both the article list and per-category
+lists (with an isoformat() timestamp string each), and as Article objects
+with interned source/category and an integer timestamp, indexed by
+category through arrays of positions. Each build starts from freshly
+generated scraped text, so the strings it keeps are counted too. Reports
+the traced Python memory that remains.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from array import array
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from articles import Article
+from categorizer import CATEGORY_KEYWORDS, DEFAULT_CATEGORY
+
+SOURCES = ['VentureBeat AI', 'MIT Tech Review', 'The Decoder', 'Hacker News',
+           'Reddit r/artificial', 'Reddit r/MachineLearning']
+CATEGORIES = [name for name, _ in CATEGORY_KEYWORDS] + [DEFAULT_CATEGORY]
+
+
+def make_rows(count, seed=5):
+    """(source, headline, link, category) tuples, every string a new object like scraped text"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        rows.append(((rng.choice(SOURCES) + ' ')[:-1],
+                     f"Headline {i} about model {rng.getrandbits(24):x} and its benchmark results",
+                     f"https://example.com/{i}",
+                     (rng.choice(CATEGORIES) + ' ')[:-1]))
+    return rows
+
+
+def build_dicts(rows):
+    articles = []
+    categories = defaultdict(list)
+    for source, headline, link, category in rows:
+        article = {
+            'source': source,
+            'headline': headline,
+            'link': link,
+            'category': category,
+            'scraped_at': datetime.now().isoformat(),
+        }
+        articles.append(article)
+        categories[category].append(article)
+    return articles, categories
+
+
+def build_slotted(rows):
+    articles = []
+    categories = defaultdict(lambda: array('q'))
+    for source, headline, link, category in rows:
+        categories[category].append(len(articles))
+        articles.append(Article(source, headline, link, category))
+    return articles, categories
+
+
+def measure(build, records):
+    """MB still held once the rows are built into records and dropped"""
+    tracemalloc.start()
+    result = build(make_rows(records))
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return held / 1024 / 1024
+
+
+def main(records):
+    print(f"{records:,} articles")
+    print(f"{'records':>8} {'MB':>8} {'bytes/article':>14}")
+    for name, build in (('dict', build_dicts), ('Article', build_slotted)):
+        megabytes = measure(build, records)
+        print(f"{name:>8} {megabytes:>8.1f} {megabytes * 1024 * 1024 / records:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--records', type=int, default=1000000)
+    args = parser.parse_args()
+    main(args.records)
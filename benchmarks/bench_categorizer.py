@@ -0,0 +1,110 @@
+"""
+Benchmark: compiled KeywordCategorizer vs. the original categorize_ai_article
+Usage: python benchmarks/bench_categorizer.py [--headlines 200000]
+
+Generates synthetic headlines (a mix of AI and general tech vocabulary),
+checks that both implementations agree on every one, and reports
+headlines per second for the original function, categorize() and
+categorize_many().
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorizer import KeywordCategorizer
+
+WORDS = ("new open source startup raises round nvidia chip gpu robot agent image video paper "
+         "research policy safety llm gpt claude model data center company market funding city "
+         "weather sports election music food travel why how the a of in on for with and to is "
+         "study shows google apple microsoft meta says launches report finds users privacy law "
+         "court rust python linux release security bug browser phone battery car energy").split()
+
+
+def legacy_categorize(headline):
+    """categorize_ai_article as it was before KeywordCategorizer"""
+    headline_lower = headline.lower()
+
+    llm_keywords = ['llm', 'gpt', 'chatgpt', 'claude', 'gemini', 'language model',
+                   'chatbot', 'chat', 'openai', 'anthropic', 'transformer',
+                   'prompt', 'token', 'reasoning']
+    vision_keywords = ['vision', 'image', 'dalle', 'midjourney', 'stable diffusion',
+                      'diffusion', 'video', 'visual', 'image generation', 'picture',
+                      'photograph', 'sora', 'gan']
+    research_keywords = ['research', 'paper', 'arxiv', 'model', 'training', 'dataset',
+                        'benchmark', 'algorithm', 'neural', 'deep learning',
+                        'machine learning', 'reinforcement learning']
+    ethics_keywords = ['ethics', 'safety', 'alignment', 'bias', 'fairness',
+                      'regulation', 'policy', 'risk', 'governance', 'responsible ai',
+                      'ai safety', 'misuse', 'deepfake']
+    business_keywords = ['startup', 'funding', 'investment', 'company', 'enterprise',
+                        'business', 'market', 'revenue', 'acquisition', 'launch',
+                        'product', 'service']
+    agents_keywords = ['agent', 'automation', 'autonomous', 'robot', 'workflow',
+                      'tool use', 'function calling', 'orchestration', 'agentic']
+    hardware_keywords = ['gpu', 'chip', 'hardware', 'nvidia', 'tpu', 'compute',
+                        'infrastructure', 'data center', 'semiconductor']
+
+    if any(keyword in headline_lower for keyword in llm_keywords):
+        return 'LLMs & Chatbots'
+    elif any(keyword in headline_lower for keyword in vision_keywords):
+        return 'Computer Vision & Image Gen'
+    elif any(keyword in headline_lower for keyword in ethics_keywords):
+        return 'AI Ethics & Safety'
+    elif any(keyword in headline_lower for keyword in agents_keywords):
+        return 'AI Agents & Automation'
+    elif any(keyword in headline_lower for keyword in business_keywords):
+        return 'AI Business & Industry'
+    elif any(keyword in headline_lower for keyword in hardware_keywords):
+        return 'AI Hardware'
+    elif any(keyword in headline_lower for keyword in research_keywords):
+        return 'AI Research'
+    else:
+        return 'General AI News'
+
+
+def make_headlines(count, seed=42):
+    """Random 6-14 word headlines from a fixed vocabulary"""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize()
+            for _ in range(count)]
+
+
+def rate(fn, headlines):
+    """Return (seconds, headlines per second) for one pass of fn"""
+    start = time.perf_counter()
+    fn(headlines)
+    seconds = time.perf_counter() - start
+    return seconds, len(headlines) / seconds
+
+
+def main(count):
+    headlines = make_headlines(count)
+    categorizer = KeywordCategorizer()
+
+    expected = [legacy_categorize(headline) for headline in headlines]
+    assert categorizer.categorize_many(headlines) == expected, "categorizers disagree"
+
+    runs = [
+        ('categorize_ai_article (original)', lambda hs: [legacy_categorize(h) for h in hs]),
+        ('KeywordCategorizer.categorize', lambda hs: [categorizer.categorize(h) for h in hs]),
+        ('KeywordCategorizer.categorize_many', categorizer.categorize_many),
+    ]
+
+    print(f"Headlines: {count:,}   backend: {categorizer.backend}")
+    baseline = None
+    for name, fn in runs:
+        seconds, per_second = rate(fn, headlines)
+        baseline = baseline or seconds
+        print(f"  {name:38s} {seconds:7.3f}s  {per_second:12,.0f}/s  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--headlines', type=int, default=200000)
+    args = parser.parse_args()
+    main(args.headlines)
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: per-element locator calls vs. one bulk eval_on_selector_all
+Usage: python benchmarks/bench_extraction.py [--stories 30] [--rounds 20]
+
+Loads a synthetic Hacker News style listing into a headless page and times
+both extraction paths on the same DOM. The per-element path is the one the
+scrapers used before bulk extraction: locator().all() followed by
+text_content() and get_attribute('href') on every element.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.async_api import async_playwright
+from ai_daily_digest import AIDailyDigest, EXTRACT_LINKS_JS
+
+
+def build_listing(stories):
+    """Build an HN-like page with the given number of stories"""
+    rows = "\n".join(
+        f'<tr><td><span class="titleline"><a href="item?id={i}">'
+        f'Story {i}: new open-weights LLM beats benchmark</a></span></td></tr>'
+        for i in range(stories)
+    )
+    return (f'<html><head><base href="https://news.ycombinator.com/"></head>'
+            f'<body><table>{rows}</table></body></html>')
+
+
+async def per_element(page, selector, limit):
+    """Extraction the way the scrapers used to do it"""
+    pairs = []
+    for link_elem in (await page.locator(selector).all())[:limit]:
+        text = (await link_elem.text_content()).strip()
+        link = await link_elem.get_attribute('href')
+        pairs.append((text, link))
+    return pairs
+
+
+async def bulk(page, selector, limit):
+    """Extraction through a single eval_on_selector_all call"""
+    return await page.eval_on_selector_all(selector, EXTRACT_LINKS_JS, [None, limit])
+
+
+async def time_it(fn, page, selector, limit, rounds):
+    """Return the mean milliseconds per extraction"""
+    await fn(page, selector, limit)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await fn(page, selector, limit)
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+async def main(stories, rounds):
+    selector = 'span.titleline > a'
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(build_listing(stories))
+
+        slow = await time_it(per_element, page, selector, stories, rounds)
+        fast = await time_it(bulk, page, selector, stories, rounds)
+
+        kept = AIDailyDigest.keep_headlines(await bulk(page, selector, stories), 0)
+        await browser.close()
+
+    print(f"Stories:          {stories} ({len(kept)} kept)")
+    print(f"Per-element path: {slow:8.2f} ms")
+    print(f"Bulk path:        {fast:8.2f} ms")
+    print(f"Speedup:          {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--stories', type=int, default=30)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.stories, args.rounds))
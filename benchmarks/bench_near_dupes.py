@@ -0,0 +1,92 @@
+"""
+Benchmark: near-duplicate clustering time vs. number of headlines
+Usage: python benchmarks/bench_near_dupes.py [--sizes 1000,5000,10000,20000,50000]
+
+Each synthetic story is reported by 1-4 sources with small wording changes
+(swapped words, filler words, plurals, punctuation, casing). MinHash + LSH
+clustering is timed at each size next to an all-pairs comparison with the
+same check, which is only run up to --pairwise-limit headlines.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import near_dupes
+from near_dupes import NearDuplicateClusterer
+
+SOURCES = ['VentureBeat AI', 'MIT Tech Review', 'The Decoder', 'Hacker News']
+
+VOCABULARY = ("openai anthropic google meta nvidia microsoft apple startup model agent chip gpu "
+              "launches releases unveils raises funding billion new open source reasoning video "
+              "image safety policy regulation lawsuit benchmark research paper training dataset "
+              "robot humanoid autonomous enterprise cloud data center inference faster cheaper "
+              "europe china india court report study users developers api pricing").split()
+
+
+def make_headlines(count, seed=7):
+    """Stories of 7-12 words, each reported by 1-4 sources with small edits:
+    [(headline, source)]"""
+    rng = random.Random(seed)
+    headlines = []
+    while len(headlines) < count:
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(7, 12))]
+        for source in rng.sample(SOURCES, rng.randint(1, 4)):
+            variant = list(words)
+            if rng.random() < 0.5:
+                variant.insert(rng.randrange(len(variant)), rng.choice(['the', 'a', 'to', 'of', 'says']))
+            if rng.random() < 0.3:
+                i = rng.randrange(len(variant) - 1)
+                variant[i], variant[i + 1] = variant[i + 1], variant[i]
+            if rng.random() < 0.3:
+                i = rng.randrange(len(variant))
+                variant[i] += 's'
+            headline = ' '.join(variant).capitalize()
+            headlines.append((headline + rng.choice(['', '!', ':', ' -']), source))
+    rng.shuffle(headlines)
+    return headlines[:count]
+
+
+def pairwise(headlines, threshold):
+    """All-pairs same_story() checks, for comparison"""
+    features = [near_dupes.headline_features(headline) for headline in headlines]
+    joined = 0
+    for i in range(len(features)):
+        for j in range(i + 1, len(features)):
+            joined += near_dupes.same_story(features[i], features[j], threshold)
+    return joined
+
+
+def main(sizes, pairwise_limit):
+    clusterer = NearDuplicateClusterer()
+    backend = 'numpy' if near_dupes.np is not None else 'pure python'
+    print(f"MinHash {clusterer.bands}x{clusterer.rows}, threshold {clusterer.threshold}, {backend}")
+    print(f"{'headlines':>10} {'clusters':>9} {'minhash+lsh':>12} {'all-pairs':>10}")
+
+    for size in sizes:
+        headlines, sources = zip(*make_headlines(size))
+
+        start = time.perf_counter()
+        clusters = clusterer.cluster(headlines, sources)
+        lsh_seconds = time.perf_counter() - start
+
+        if size <= pairwise_limit:
+            start = time.perf_counter()
+            pairwise(headlines, clusterer.threshold)
+            pairs = f"{time.perf_counter() - start:9.2f}s"
+        else:
+            pairs = f"{'-':>10}"
+
+        print(f"{size:>10,} {len(set(clusters)):>9,} {lsh_seconds:11.2f}s {pairs}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='1000,5000,10000,20000,50000')
+    parser.add_argument('--pairwise-limit', type=int, default=5000)
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(',')], args.pairwise_limit)
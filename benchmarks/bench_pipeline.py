@@ -0,0 +1,328 @@
+"""
+Benchmark: the whole digest pipeline, offline, stage by stage
+Usage:
+    python benchmarks/bench_pipeline.py run [--rounds 5] [--browser] [--out results.json]
+    python benchmarks/bench_pipeline.py capture
+    python benchmarks/bench_pipeline.py compare OLD.json NEW.json
+
+`run` serves an HTML snapshot of every source in sources.json from a local
+HTTP server (in its own process), points the sources at it and times each
+stage of AIDailyDigest: navigation (open_source), extraction
+(extract_links), categorization (categorize_many), screenshots
+(capture_screenshot), HTML render (generate_html_digest) and JSON write
+(save_json_data). Snapshots are read from benchmarks/fixtures/<source>.html;
+a source without one gets a synthetic page with the same markup and
+selectors. Without --browser every source is fetched as a static page, so
+no browser is needed (and no screenshots are taken). Feeds are not used.
+
+Results are written as JSON, by default to benchmarks/results/<commit>.json,
+for `compare` to diff between commits.
+
+`capture` saves the live pages as fixtures (needs network access, and
+Chromium for the browser-rendered sources).
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from ai_daily_digest import AIDailyDigest
+from sources import SourceSpec, load_sources
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+STAGES = ['navigation', 'extraction', 'categorization', 'screenshots', 'html_render', 'json_write', 'total']
+
+SUBJECTS = ['OpenAI', 'Anthropic', 'Google DeepMind', 'Meta', 'Nvidia', 'A startup', 'Researchers', 'Regulators']
+ACTIONS = ['releases a new LLM with better reasoning', 'unveils an image generation model',
+           'publishes a paper on agent benchmarks', 'raises funding for AI chips',
+           'warns about AI safety risks', 'ships autonomous coding agents',
+           'open-sources a vision dataset', 'cuts GPU inference costs in half']
+
+
+def fixture_name(source):
+    return re.sub(r'[^a-z0-9]+', '_', source.lower()).strip('_')
+
+
+def synthetic_headlines(seed, count):
+    rng = random.Random(seed)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} ({rng.randint(1, 999)})" for _ in range(count)]
+
+
+def synthetic_page(spec, count=60):
+    """A page with the markup the spec's selectors expect, plus navigation noise"""
+    name = fixture_name(spec.name)
+    headlines = synthetic_headlines(name, count)
+    nav = ''.join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+
+    if spec.selector == 'article':
+        items = ''.join(f'<article><h2><a href="/ai/{name}-{i}/">{h}</a></h2><p>{h} summary.</p></article>'
+                        for i, h in enumerate(headlines))
+    elif spec.selector == 'h3':
+        items = '<h3>r/community</h3>' + ''.join(
+            f'<div class="post"><a href="/r/x/comments/{i:x}/post/"><h3>{h}</h3></a><span>{i} comments</span></div>'
+            for i, h in enumerate(headlines))
+    elif 'titleline' in spec.selector:
+        items = '<table>' + ''.join(
+            f'<tr class="athing"><td><span class="titleline"><a href="https://example.com/{name}/{i}">{h}</a>'
+            f'</span></td></tr><tr><td class="subtext">{i} points</td></tr>'
+            for i, h in enumerate(headlines)) + '</table>'
+    elif 'entry-title' in spec.selector:
+        items = ''.join(f'<article><h2 class="entry-title"><a href="/{name}-{i}/">{h}</a></h2></article>'
+                        for i, h in enumerate(headlines))
+    else:
+        items = ''.join(f'<div class="card"><h3><a href="/2025/{name}/{i}/">{h}</a></h3></div>'
+                        for i, h in enumerate(headlines))
+
+    return f'<html><head><title>{spec.name}</title></head><body><nav><ul>{nav}</ul></nav>{items}</body></html>'
+
+
+def load_fixtures(specs):
+    """{source: (html bytes, 'captured' or 'synthetic')}"""
+    fixtures = {}
+    for spec in specs:
+        path = os.path.join(FIXTURE_DIR, fixture_name(spec.name) + '.html')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                fixtures[spec.name] = (f.read(), 'captured')
+        else:
+            fixtures[spec.name] = (synthetic_page(spec).encode('utf-8'), 'synthetic')
+    return fixtures
+
+
+def serve(port, pages, ready):
+    """Fixture server process: path -> HTML bytes"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path.split('?')[0])
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    ready.set()
+    server.serve_forever()
+
+
+def local_specs(specs, port, browser):
+    """Copies of the specs that read their fixture from the local server"""
+    local = []
+    for spec in specs:
+        settings = dict(vars(spec))
+        settings.update(url=f'http://127.0.0.1:{port}/{fixture_name(spec.name)}', feed=None,
+                        static=spec.static or not browser)
+        local.append(SourceSpec(**settings))
+    return local
+
+
+def timed(durations, stage, function):
+    """Wrap a function or coroutine function so each call adds its duration to a stage"""
+    if asyncio.iscoroutinefunction(function):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                durations[stage].append(time.perf_counter() - start)
+    else:
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                durations[stage].append(time.perf_counter() - start)
+    return wrapper
+
+
+def run_round(specs, tmp, browser, round_number):
+    """One full pipeline run; returns ({stage: [call durations]}, article count)"""
+    digest = AIDailyDigest(sources=specs, report_dir=os.path.join(tmp, f'round_{round_number}'),
+                           dedupe=None, fetch_cache_dir=None, circuit_breaker=None, archive=None,
+                           use_feeds=False, take_screenshots=browser, headless=True)
+    durations = defaultdict(list)
+    digest.open_source = timed(durations, 'navigation', digest.open_source)
+    digest.extract_links = timed(durations, 'extraction', digest.extract_links)
+    digest.capture_screenshot = timed(durations, 'screenshots', digest.capture_screenshot)
+    digest.categorizer.categorize_many = timed(durations, 'categorization', digest.categorizer.categorize_many)
+
+    start = time.perf_counter()
+    asyncio.run(digest.collect_sources())
+    timed(durations, 'html_render', digest.generate_html_digest)(digest.screenshots)
+    timed(durations, 'json_write', digest.save_json_data)()
+    durations['total'].append(time.perf_counter() - start)
+    return durations, len(digest.articles)
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def run(rounds, browser, port, out):
+    specs = load_sources()
+    fixtures = load_fixtures(specs)
+    pages = {f'/{fixture_name(source)}': html for source, (html, _) in fixtures.items()}
+
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(port, pages, ready), daemon=True)
+    server.start()
+    ready.wait()
+
+    specs = local_specs(specs, port, browser)
+    per_round = defaultdict(list)
+    calls = {}
+    articles = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for round_number in range(rounds):
+                # Progress output would dominate the timings; silence it
+                stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+                try:
+                    durations, articles = run_round(specs, tmp, browser, round_number)
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                for stage in STAGES:
+                    per_round[stage].append(sum(durations.get(stage, [])))
+                    calls[stage] = len(durations.get(stage, []))
+    finally:
+        server.terminate()
+
+    commit, dirty = git_commit()
+    results = {
+        'commit': commit,
+        'dirty': dirty,
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'browser': browser,
+        'rounds': rounds,
+        'articles': articles,
+        'fixtures': {source: kind for source, (_, kind) in fixtures.items()},
+        # Seconds per run, summed over the calls of a stage (concurrent calls overlap)
+        'stages': {stage: {'median': statistics.median(per_round[stage]), 'min': min(per_round[stage]),
+                           'calls': calls[stage]} for stage in STAGES},
+    }
+
+    out = out or os.path.join(RESULTS_DIR, f"{(commit or 'unknown')[:10]}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{articles} articles, {rounds} rounds, {'browser' if browser else 'static pages only'}")
+    print(f"{'stage':>15} {'median ms':>10} {'min ms':>8} {'calls':>6}")
+    for stage, stats in results['stages'].items():
+        print(f"{stage:>15} {stats['median'] * 1000:>10.1f} {stats['min'] * 1000:>8.1f} {stats['calls']:>6}")
+    print(f"Results saved: {out}")
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+
+    print(f"{(old['commit'] or '?')[:10]} -> {(new['commit'] or '?')[:10]}")
+    print(f"{'stage':>15} {'old ms':>9} {'new ms':>9} {'change':>8}")
+    for stage in STAGES:
+        if stage not in old['stages'] or stage not in new['stages']:
+            continue
+        before, after = old['stages'][stage]['median'], new['stages'][stage]['median']
+        change = f"{(after - before) / before:+.1%}" if before else '-'
+        print(f"{stage:>15} {before * 1000:>9.1f} {after * 1000:>9.1f} {change:>8}")
+
+
+async def capture_pages(specs):
+    """Download every source page as it is served or rendered today"""
+    import httpx
+    from playwright.async_api import async_playwright
+    from ai_daily_digest import USER_AGENT
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    digest = AIDailyDigest(dedupe=None, fetch_cache_dir=None, circuit_breaker=None, archive=None,
+                           report_dir=tempfile.mkdtemp())
+    async with httpx.AsyncClient(headers={'User-Agent': USER_AGENT}, follow_redirects=True, timeout=30) as client:
+        browser = None
+        async with async_playwright() as p:
+            for spec in specs:
+                try:
+                    if spec.static:
+                        response = await client.get(spec.url)
+                        response.raise_for_status()
+                        html = response.text
+                    else:
+                        browser = browser or await p.chromium.launch(headless=True)
+                        page = await browser.new_page(user_agent=USER_AGENT)
+                        await page.goto(spec.url, wait_until='domcontentloaded', timeout=30000)
+                        await digest.wait_until_ready(page, spec.ready_selector, spec.ready_count)
+                        html = await page.content()
+                        await page.close()
+                    path = os.path.join(FIXTURE_DIR, fixture_name(spec.name) + '.html')
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(html)
+                    print(f"✅ {spec.name}: {path} ({len(html) / 1024:.0f} KB)")
+                except Exception as e:
+                    print(f"❌ {spec.name}: {e}")
+            if browser is not None:
+                await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = commands.add_parser('run', help="time the pipeline against the fixtures")
+    run_cmd.add_argument('--rounds', type=int, default=5)
+    run_cmd.add_argument('--browser', action='store_true', help="render non-static sources in Chromium")
+    run_cmd.add_argument('--port', type=int, default=8766)
+    run_cmd.add_argument('--out', help="results file (default: benchmarks/results/<commit>.json)")
+
+    commands.add_parser('capture', help="save the live source pages as fixtures")
+
+    compare_cmd = commands.add_parser('compare', help="compare two results files")
+    compare_cmd.add_argument('old')
+    compare_cmd.add_argument('new')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args.rounds, args.browser, args.port, args.out)
+    elif args.command == 'capture':
+        asyncio.run(capture_pages(load_sources()))
+    else:
+        compare(args.old, args.new)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Benchmark: streaming HTML renderer vs. the original string-concatenation digest
+Usage: python benchmarks/bench_render.py [--sizes 1000,10000,100000]
+
+Builds synthetic story cards, renders the digest page both ways into a
+temporary directory, and reports the time and the peak Python memory
+(tracemalloc, measured in a separate pass) of each. The legacy renderer is
+generate_html_digest's += loop as it was before html_digest.py, without
+escaping. The streaming renderer is timed with and without the page's
+search index.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from articles import Article
+from categorizer import CATEGORY_KEYWORDS, DEFAULT_CATEGORY
+from html_digest import CATEGORY_ICONS, STYLES, render_digest, write_digest
+
+SOURCES = ['VentureBeat AI', 'MIT Tech Review', 'The Decoder', 'Hacker News',
+           'Reddit r/artificial', 'Reddit r/MachineLearning']
+WORDS = ("openai anthropic nvidia model agent chip gpu launches raises funding open source "
+         "reasoning video image safety policy lawsuit benchmark research robot data center").split()
+
+
+def make_cards(count, seed=3):
+    """category -> stories; about one story in five has a second source"""
+    rng = random.Random(seed)
+    categories = [name for name, _ in CATEGORY_KEYWORDS] + [DEFAULT_CATEGORY]
+    cards = {category: [] for category in categories}
+    made = 0
+    while made < count:
+        story = []
+        for _ in range(2 if rng.random() < 0.2 else 1):
+            story.append(Article(
+                rng.choice(SOURCES),
+                ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))).capitalize(),
+                f'https://example.com/{made}/{rng.getrandbits(32):x}',
+                seen_before=rng.random() < 0.3,
+            ))
+            made += 1
+        cards[rng.choice(categories)].append(story)
+    return cards
+
+
+def legacy_render(path, cards, total_articles, total_categories, total_sources, screenshots):
+    """The original generate_html_digest loop: one growing string, written at the end"""
+    now = datetime.now()
+    html_content = f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Daily Digest - {now.strftime('%B %d, %Y')}</title>
+    <style>
+{STYLES}    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🤖 AI Daily Digest</h1>
+            <p class="date">{now.strftime('%A, %B %d, %Y at %I:%M %p')}</p>
+            <div class="stats">
+                <div class="stat"><strong>{total_articles}</strong><span>AI Articles</span></div>
+                <div class="stat"><strong>{total_categories}</strong><span>AI Categories</span></div>
+                <div class="stat"><strong>{total_sources}</strong><span>AI Sources</span></div>
+            </div>
+        </div>
+        <div class="content">
+"""
+
+    sorted_categories = sorted(cards.items(), key=lambda x: len(x[1]), reverse=True)
+    for category, stories in sorted_categories:
+        if stories:
+            icon = CATEGORY_ICONS.get(category, '📄')
+            html_content += f"""
+            <div class="category-section">
+                <div class="category-header">
+                    <span class="category-icon">{icon}</span>
+                    <h2 class="category-title">{category}</h2>
+                    <span class="category-count">{len(stories)} articles</span>
+                </div>
+                <div class="articles-grid">
+"""
+            for story in stories:
+                article = story[0]
+                seen = article.seen_before
+                also = ''.join(f'<a class="article-source" href="{other.link}" target="_blank">{other.source}</a>'
+                               for other in story[1:])
+                html_content += f"""
+                    <div class="article-card{' seen' if seen else ''}">
+                        <span class="article-source">{article.source}</span>{also}{'<span class="article-seen">Seen before</span>' if seen else ''}
+                        <h3 class="article-headline">{article.headline}</h3>
+                        <a href="{article.link}" target="_blank" class="article-link">Read Full Article</a>
+                    </div>
+"""
+            html_content += """
+                </div>
+            </div>
+"""
+
+    if screenshots:
+        html_content += """
+            <div class="screenshots-section">
+                <h2 class="screenshots-title">📸 Source Screenshots</h2>
+                <div class="screenshots-grid">
+"""
+        for source, filename in screenshots.items():
+            html_content += f"""
+                    <div class="screenshot-card">
+                        <img src="{filename}" alt="{source}">
+                        <div class="screenshot-label">{source}</div>
+                    </div>
+"""
+        html_content += """
+                </div>
+            </div>
+"""
+
+    html_content += f"""
+        </div>
+        <div class="footer">
+            <p>Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+
+def streaming_render(path, cards, total_articles, total_categories, total_sources, screenshots):
+    write_digest(path, render_digest(cards, total_articles, total_categories, total_sources, screenshots))
+
+
+def streaming_render_without_search(path, cards, total_articles, total_categories, total_sources, screenshots):
+    write_digest(path, render_digest(cards, total_articles, total_categories, total_sources, screenshots,
+                                     search=False))
+
+
+def measure(render, path, *args):
+    """(seconds, peak MB): timed without tracemalloc, then traced in a second pass"""
+    start = time.perf_counter()
+    render(path, *args)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    render(path, *args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024
+
+
+def main(sizes):
+    screenshots = {source: f"{source.lower().replace(' ', '_')}.png" for source in SOURCES}
+    print(f"{'articles':>9} {'page MB':>8} {'legacy':>9} {'peak MB':>8} {'streaming':>10} {'peak MB':>8} "
+          f"{'no search':>10} {'peak MB':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ai_digest.html')
+        for size in sizes:
+            cards = make_cards(size)
+            args = (cards, size, sum(1 for stories in cards.values() if stories), len(SOURCES), screenshots)
+
+            legacy_seconds, legacy_peak = measure(legacy_render, path, *args)
+            plain_seconds, plain_peak = measure(streaming_render_without_search, path, *args)
+            streaming_seconds, streaming_peak = measure(streaming_render, path, *args)
+            page_mb = os.path.getsize(path) / 1024 / 1024
+
+            print(f"{size:>9,} {page_mb:>8.1f} {legacy_seconds:>8.3f}s {legacy_peak:>8.1f} "
+                  f"{streaming_seconds:>9.3f}s {streaming_peak:>8.1f} {plain_seconds:>9.3f}s {plain_peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(',')])
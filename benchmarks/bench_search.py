@@ -0,0 +1,124 @@
+"""
+Benchmark: archive full-text search and the search index embedded in the digest page
+Usage: python benchmarks/bench_search.py [--days 365] [--per-day 100] [--page-stories 30000]
+
+Archives synthetic runs one day at a time, timing how long indexing each
+run's new articles takes, then times BM25 searches (with prefixes) against
+a LIKE scan of the headlines, which finds matches but cannot rank them.
+
+Then builds the page index for a digest of many stories and compares its
+size with plain JSON postings lists.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from archive import ArticleArchive
+from articles import Article
+from categorizer import DEFAULT_CATEGORY
+from search_index import build_page_index, tokenize
+
+SOURCES = ['VentureBeat AI', 'MIT Tech Review', 'The Decoder', 'Reddit r/artificial',
+           'Reddit r/MachineLearning', 'Hacker News']
+WORDS = ('AI model models OpenAI GPT Gemini Claude Llama open source agents agentic robot robotics chip chips '
+         'Nvidia startup funding raises billion safety regulation EU law research paper benchmark reasoning '
+         'vision diffusion video image training inference data center energy Google Meta Microsoft Apple '
+         'launches new release update study shows how why what the of to for in on with a and').split()
+QUERIES = ['openai', 'open source model', 'nvidia chi', 'agent', 'ai', 'eu regulation safety', 'quantum']
+
+
+def headline(rng, number):
+    # Zipf-like: the first words of the list are the most common
+    words = [WORDS[min(int(rng.paretovariate(0.9)) - 1, len(WORDS) - 1)] for _ in range(rng.randint(5, 12))]
+    return f"{' '.join(words)} {number}"
+
+
+def timed(function, repeat=10):
+    """Median milliseconds of a few calls, and the last result"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def bench_archive(rng, days, per_day):
+    numbers = iter(range(10 ** 9))
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ArticleArchive(os.path.join(tmp, 'archive.db'))
+        index_ms = []
+        day = date.today() - timedelta(days=days)
+        while day <= date.today():
+            start = datetime.combine(day, clock()).timestamp()
+            articles = []
+            for _ in range(per_day):
+                number = next(numbers)
+                articles.append(Article(rng.choice(SOURCES), headline(rng, number), f"https://example.com/{number}",
+                                        DEFAULT_CATEGORY, start + rng.randrange(86400)))
+            # Archive without indexing, then time indexing the run on its own
+            update = archive.search_index.update
+            archive.search_index.update = lambda: 0
+            archive.add_run(articles)
+            archive.search_index.update = update
+            with archive.connection:
+                started = time.perf_counter()
+                archive.search_index.update()
+                index_ms.append((time.perf_counter() - started) * 1000)
+            day += timedelta(days=1)
+
+        total = archive.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        terms = archive.connection.execute("SELECT COUNT(*) FROM search_terms").fetchone()[0]
+        print(f"{total:,} articles, {terms:,} terms")
+        print(f"indexing a run of {per_day}: median {statistics.median(index_ms):.1f} ms, "
+              f"max {max(index_ms):.1f} ms")
+
+        print(f"{'query':>22} {'bm25 ms':>8} {'matches':>8} {'LIKE ms':>8} {'matches':>8}")
+        for query in QUERIES:
+            search_ms, _ = timed(lambda: archive.search_index.search(query, limit=20))
+            matches = len(archive.search_index.search(query, limit=10 ** 9))
+            where = ' AND '.join(["(headline || ' ' || source) LIKE ?"] * len(tokenize(query, ())))
+            params = [f"%{word}%" for word in tokenize(query, ())]
+            like_ms, like_matches = timed(lambda: archive.connection.execute(
+                f"SELECT COUNT(*) FROM articles WHERE {where}", params).fetchone()[0], repeat=3)
+            print(f"{query:>22} {search_ms:>8.2f} {matches:>8,} {like_ms:>8.1f} {like_matches:>8,}")
+        archive.close()
+
+
+def bench_page(rng, stories):
+    texts = [f"{headline(rng, number)} {rng.choice(SOURCES)}" for number in range(stories)]
+    build_ms, index = timed(lambda: build_page_index(texts), repeat=3)
+    compact = len(json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    postings = {}
+    for number, text in enumerate(texts):
+        for word in tokenize(text):
+            postings.setdefault(word, []).append(number)
+    plain = len(json.dumps({'postings': postings, 'lengths': [len(tokenize(text)) for text in texts]},
+                           ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    print(f"page index for {stories:,} stories: built in {build_ms:.0f} ms, {compact / 1024:.0f} KB "
+          f"({compact / stories:.1f} bytes a story); plain JSON postings {plain / 1024:.0f} KB")
+
+
+def main(days, per_day, page_stories):
+    rng = random.Random(11)
+    bench_archive(rng, days, per_day)
+    bench_page(rng, page_stories)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--per-day', type=int, default=100)
+    parser.add_argument('--page-stories', type=int, default=30000)
+    args = parser.parse_args()
+    main(args.days, args.per_day, args.page_stories)
@@ -0,0 +1,126 @@
+"""
+Benchmark: single-process vs. sharded multi-process scraping
+Usage: python benchmarks/bench_sharding.py [--sources 48] [--stories 6000] [--processes 1,2,4]
+
+Serves synthetic Hacker News style listings from a local HTTP server (in its
+own process) and scrapes them as static sources, so no network or browser is
+needed. Each page is large enough that parsing it is real CPU work. Every run
+is timed end to end, including worker start-up, and its merged articles are
+compared with the single-process run. Stories are shared between sources so
+dedupe is exercised too.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_daily_digest import AIDailyDigest
+from sharding import collect_sharded
+from sources import SourceSpec
+
+TOPICS = ["open-weights LLM beats benchmark", "GPU cluster for model training", "AI agent automates support",
+          "diffusion model makes video", "AI safety bill passes", "startup raises funding for robots"]
+
+
+def build_listing(page, stories):
+    """HN-like page; story ids overlap between neighbouring pages"""
+    rows = "\n".join(
+        f'<tr class="athing"><td class="title"><span class="titleline">'
+        f'<a href="https://example.com/story/{page * 10 + i}">Story {page * 10 + i}: {TOPICS[i % len(TOPICS)]}</a>'
+        f'<span class="sitebit"> (example.com)</span></span></td></tr>'
+        f'<tr><td class="subtext">{i} points by user{i} | <a href="item?id={i}">comments</a></td></tr>'
+        for i in range(stories)
+    )
+    return f'<html><body><table>{rows}</table></body></html>'.encode('utf-8')
+
+
+def serve(port, pages, stories, ready):
+    pages = {f'/{page}': build_listing(page, stories) for page in range(pages)}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path, b'')
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    ready.set()
+    server.serve_forever()
+
+
+def make_specs(port, count):
+    return [SourceSpec(name=f'Source {i:02d}', url=f'http://127.0.0.1:{port}/{i}',
+                       selector='span.titleline > a', limit=30, static=True, ai_filter=True)
+            for i in range(count)]
+
+
+def run(specs, processes, tmp):
+    digest = AIDailyDigest(sources=specs, report_dir=os.path.join(tmp, f'digest_{processes}'),
+                           seen_index_path=os.path.join(tmp, f'seen_{processes}.db'),
+                           fetch_cache_dir=None, circuit_breaker=None, archive=None,
+                           max_concurrency=4)
+    start = time.perf_counter()
+    if processes > 1:
+        collect_sharded(digest, processes)
+    else:
+        asyncio.run(digest.collect_sources())
+    seconds = time.perf_counter() - start
+    digest.seen_index.close()
+    return seconds, [(a.source, a.headline, a.link, a.category, a.seen_before) for a in digest.articles]
+
+
+def main(sources, stories, process_counts, port):
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(port, sources, stories, ready), daemon=True)
+    server.start()
+    ready.wait()
+
+    specs = make_specs(port, sources)
+    page_kb = len(build_listing(0, stories)) / 1024
+    print(f"{sources} sources x {page_kb:.0f} KB pages, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9} {'seconds':>8} {'speedup':>8} {'articles':>9} {'identical':>10}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in process_counts:
+            # Silence the progress output of this process and the workers it starts
+            sys.stdout.flush()
+            stdout = os.dup(1)
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, 1)
+            try:
+                seconds, articles = run(specs, processes, tmp)
+            finally:
+                sys.stdout.flush()
+                os.dup2(stdout, 1)
+                os.close(devnull)
+                os.close(stdout)
+            if baseline is None:
+                baseline = (seconds, articles)
+            print(f"{processes:>9} {seconds:>8.2f} {baseline[0] / seconds:>7.2f}x {len(articles):>9} "
+                  f"{str(articles == baseline[1]):>10}")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sources', type=int, default=48)
+    parser.add_argument('--stories', type=int, default=6000)
+    parser.add_argument('--processes', default='1,2,4')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    main(args.sources, args.stories, [int(n) for n in args.processes.split(',')], args.port)
@@ -0,0 +1,164 @@
+"""
+AI News Daily Digest - Keyword Categorizer
+Purpose: Compile the AI category keyword lists once and match headlines
+         against all of them in a single pass
+"""
+
+import re
+
+# Optional: C Aho-Corasick automaton, several times faster than regex matching
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Category keyword lists in priority order: a headline gets the first
+# category that has any of its keywords
+CATEGORY_KEYWORDS = [
+    # LLMs & Chatbots
+    ('LLMs & Chatbots', ['llm', 'gpt', 'chatgpt', 'claude', 'gemini', 'language model',
+                         'chatbot', 'chat', 'openai', 'anthropic', 'transformer',
+                         'prompt', 'token', 'reasoning']),
+    # Computer Vision & Image Gen
+    ('Computer Vision & Image Gen', ['vision', 'image', 'dalle', 'midjourney', 'stable diffusion',
+                                     'diffusion', 'video', 'visual', 'image generation', 'picture',
+                                     'photograph', 'sora', 'gan']),
+    # AI Ethics & Safety
+    ('AI Ethics & Safety', ['ethics', 'safety', 'alignment', 'bias', 'fairness',
+                            'regulation', 'policy', 'risk', 'governance', 'responsible ai',
+                            'ai safety', 'misuse', 'deepfake']),
+    # AI Agents & Automation
+    ('AI Agents & Automation', ['agent', 'automation', 'autonomous', 'robot', 'workflow',
+                                'tool use', 'function calling', 'orchestration', 'agentic']),
+    # Business & Industry
+    ('AI Business & Industry', ['startup', 'funding', 'investment', 'company', 'enterprise',
+                                'business', 'market', 'revenue', 'acquisition', 'launch',
+                                'product', 'service']),
+    # Hardware & Infrastructure
+    ('AI Hardware', ['gpu', 'chip', 'hardware', 'nvidia', 'tpu', 'compute',
+                     'infrastructure', 'data center', 'semiconductor']),
+    # ML Research & Models
+    ('AI Research', ['research', 'paper', 'arxiv', 'model', 'training', 'dataset',
+                     'benchmark', 'algorithm', 'neural', 'deep learning',
+                     'machine learning', 'reinforcement learning']),
+]
+
+DEFAULT_CATEGORY = 'General AI News'
+
+# AI-related keywords used to filter general tech feeds such as Hacker News;
+# matched as whole words, so plurals are listed too
+AI_KEYWORDS = ['ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
+               'neural', 'gpt', 'gpts', 'llm', 'llms', 'chatgpt', 'openai', 'anthropic', 'claude',
+               'gemini', 'transformer', 'transformers', 'diffusion', 'gen ai', 'generative']
+
+
+def trie_pattern(keywords):
+    """Build a regex alternation with shared prefixes factored out (chat(?:bot|gpt)?)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here, so the rest is optional
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+def is_word_char(char):
+    """Same definition of a word character as regex \\w"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordCategorizer:
+    """Categorize headlines by keyword, with every keyword list compiled once
+
+    Matching is case-insensitive substring matching, like the original
+    `any(keyword in headline_lower ...)` checks, unless word_boundary=True,
+    in which case keywords only match whole words.
+    """
+
+    def __init__(self, categories=CATEGORY_KEYWORDS, default=DEFAULT_CATEGORY, word_boundary=False):
+        self.names = [name for name, _ in categories] + [default]
+        self.default = default
+        self.word_boundary = word_boundary
+
+        if ahocorasick is not None:
+            # One automaton over all keywords; each keyword remembers the
+            # highest-priority category it belongs to and its length
+            self.automaton = ahocorasick.Automaton()
+            for index, (_, keywords) in enumerate(categories):
+                for keyword in keywords:
+                    if keyword not in self.automaton:
+                        self.automaton.add_word(keyword, (index, len(keyword)))
+            self.automaton.make_automaton()
+            self.backend = 'aho-corasick'
+        else:
+            # Fallback: one combined regex rejects headlines without any keyword,
+            # then per-category regexes are tried in priority order
+            self.automaton = None
+            bound = r'\b' if word_boundary else ''
+            all_keywords = [keyword for _, keywords in categories for keyword in keywords]
+            self.any_pattern = re.compile(f'{bound}(?:{trie_pattern(all_keywords)}){bound}')
+            self.patterns = [re.compile(f'{bound}(?:{trie_pattern(keywords)}){bound}')
+                             for _, keywords in categories]
+            self.backend = 'regex'
+
+    def has_bounds(self, text, end, length):
+        """True if the keyword ending at `end` is not part of a longer word"""
+        start = end - length + 1
+        if start > 0 and is_word_char(text[start - 1]):
+            return False
+        return end + 1 >= len(text) or not is_word_char(text[end + 1])
+
+    def category_index(self, text):
+        """Index in self.names of the best category for lowercased text"""
+        default_index = len(self.names) - 1
+
+        if self.automaton is None:
+            if not self.any_pattern.search(text):
+                return default_index
+            for index, pattern in enumerate(self.patterns):
+                if pattern.search(text):
+                    return index
+            return default_index
+
+        best = default_index
+        for end, (index, length) in self.automaton.iter(text):
+            if index < best and (not self.word_boundary or self.has_bounds(text, end, length)):
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def categorize(self, headline):
+        """Return the category for one headline"""
+        return self.names[self.category_index(headline.lower())]
+
+    def categorize_many(self, headlines):
+        """Return the category for each headline, in order"""
+        names = self.names
+        category_index = self.category_index
+        return [names[category_index(headline.lower())] for headline in headlines]
+
+    def all_category_indices(self, text):
+        """Indexes of every category with a keyword in lowercased text, ignoring priority"""
+        if self.automaton is None:
+            return [index for index, pattern in enumerate(self.patterns) if pattern.search(text)]
+
+        found = set()
+        for end, (index, length) in self.automaton.iter(text):
+            if not self.word_boundary or self.has_bounds(text, end, length):
+                found.add(index)
+        return sorted(found)
+
+    def matches(self, headline):
+        """True if the headline contains any keyword"""
+        return self.category_index(headline.lower()) < len(self.names) - 1
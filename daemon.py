@@ -0,0 +1,182 @@
+"""
+AI News Daily Digest - Daemon Mode
+Purpose: Keep running unattended with one warm headless browser, refresh each
+         source on its own interval (SourceSpec.refresh) and regenerate the
+         digest in place only when new articles arrive
+
+Usage:
+    python daemon.py --report-dir ai_digest_live
+"""
+
+import argparse
+import asyncio
+import signal
+
+from ai_daily_digest import AIDailyDigest
+from dedupe_index import canonicalize_url
+
+
+def article_key(article):
+    return canonicalize_url(article.link) or article.headline
+
+
+class DigestDaemon:
+    """Refresh loop around one long-lived AIDailyDigest
+
+    The digest's HTTP pool, browser and fetch cache stay open between
+    refreshes; the browser context is replaced every `max_navigations` page
+    loads. The latest articles of every source are kept, and the digest in
+    report_dir is rebuilt from them whenever a refresh brings a story that
+    is not in it yet.
+    """
+
+    def __init__(self, report_dir='ai_digest_live', max_navigations=50, **digest_options):
+        digest_options.setdefault('headless', True)
+        self.report_dir = report_dir
+        self.digest = AIDailyDigest(report_dir=report_dir, max_navigations=max_navigations, **digest_options)
+        # Source name -> articles from its last successful refresh
+        self.latest = {}
+        # Source name -> event loop time of its next refresh
+        self.next_due = {}
+        # Keys of the articles in the digest currently on disk
+        self.published = set()
+        # Canonical URL -> whether the story had been seen before it first
+        # entered the live digest; shared with the digest's repeat filter
+        self.verdicts = self.digest.known_repeats
+        self.stopping = None
+
+    def due_sources(self, now):
+        """Enabled sources whose refresh interval has passed"""
+        return [spec for spec in self.digest.source_jobs() if self.next_due.get(spec.name, 0) <= now]
+
+    async def refresh(self, specs):
+        """Scrape some sources concurrently and keep their latest articles"""
+        semaphore = asyncio.Semaphore(self.digest.max_concurrency)
+        batches = await asyncio.gather(*(self.digest.scrape_in_new_page(semaphore, spec) for spec in specs))
+
+        now = asyncio.get_event_loop().time()
+        for spec, batch in zip(specs, batches):
+            self.next_due[spec.name] = now + spec.refresh
+            # A failed refresh keeps the source's previous articles
+            if batch:
+                self.latest[spec.name] = batch
+
+        if self.digest.fetch_cache is not None:
+            self.digest.fetch_cache.save()
+        if self.digest.circuit_breaker is not None:
+            self.digest.circuit_breaker.save()
+
+    def new_articles(self):
+        """Latest articles that are not in the published digest"""
+        return [article for articles in self.latest.values() for article in articles
+                if article_key(article) not in self.published]
+
+    def publish(self):
+        """Rebuild the digest in report_dir from every source's latest articles
+
+        A story is judged against the seen index once, when it first enters
+        the live digest, and only then recorded in it; on later rebuilds it
+        keeps that verdict, so published stories are never marked or dropped
+        as repeats of themselves.
+        """
+        digest = self.digest
+        digest.start_digest(self.report_dir)
+        order = [spec.name for spec in digest.source_jobs()]
+        for source in order:
+            if source in self.latest:
+                digest.add_articles(self.latest[source])
+        digest.order_source_stats(order)
+
+        digest.generate_html_digest(digest.screenshots)
+        digest.save_json_data()
+        digest.save_metrics()
+        arrived = [article for article in digest.articles
+                   if canonicalize_url(article.link) not in self.verdicts]
+        digest.remember_articles(arrived)
+        digest.archive_articles()
+
+        # Stories no longer offered by any source are forgotten, and judged afresh if they return
+        verdicts = {canonicalize_url(article.link): bool(article.seen_before) for article in digest.articles}
+        verdicts.pop('', None)
+        self.verdicts.clear()
+        self.verdicts.update(verdicts)
+        self.published = {article_key(article) for articles in self.latest.values() for article in articles}
+
+    def stop(self):
+        print("\n🛑 Stopping after the current refresh...")
+        self.stopping.set()
+
+    async def run(self, once=False):
+        """Refresh due sources until stopped (SIGINT/SIGTERM), or a single time with once"""
+        loop = asyncio.get_event_loop()
+        self.stopping = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows: Ctrl+C still raises KeyboardInterrupt
+                pass
+
+        self.digest.open_clients()
+        try:
+            while not self.stopping.is_set():
+                due = self.due_sources(loop.time())
+                if due:
+                    print(f"\n🔄 Refreshing {', '.join(spec.name for spec in due)}")
+                    await self.refresh(due)
+
+                    fresh = self.new_articles()
+                    if fresh:
+                        print(f"\n🆕 {len(fresh)} new articles, regenerating the digest")
+                        self.publish()
+                    else:
+                        print("💤 No new articles, digest unchanged")
+
+                if once or not self.next_due:
+                    break
+                wait = max(0, min(self.next_due.values()) - loop.time())
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+        finally:
+            self.digest.sink.close()
+            await self.digest.close_clients()
+            if self.digest.seen_index is not None:
+                self.digest.seen_index.close()
+            if self.digest.archive is not None:
+                self.digest.archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the AI digest up to date in the background")
+    parser.add_argument('--report-dir', default='ai_digest_live', help="folder regenerated in place")
+    parser.add_argument('--sources', help="source registry file (default: sources.json)")
+    parser.add_argument('--max-concurrency', type=int, default=4)
+    parser.add_argument('--max-navigations', type=int, default=50,
+                        help="page loads before the browser context is replaced")
+    parser.add_argument('--no-screenshots', action='store_true')
+    parser.add_argument('--screenshot-format', choices=['png', 'jpeg', 'webp'], default='jpeg')
+    parser.add_argument('--headed', action='store_true', help="show the browser window")
+    parser.add_argument('--once', action='store_true', help="refresh every source once and exit")
+    args = parser.parse_args()
+
+    options = {
+        'max_concurrency': args.max_concurrency,
+        'take_screenshots': not args.no_screenshots,
+        'screenshot_format': args.screenshot_format,
+        'headless': not args.headed,
+    }
+    if args.sources:
+        options['sources'] = args.sources
+
+    print("\n" + "=" * 70)
+    print("🤖 AI DAILY DIGEST - DAEMON MODE")
+    print("=" * 70)
+    daemon = DigestDaemon(args.report_dir, args.max_navigations, **options)
+    asyncio.run(daemon.run(once=args.once))
+
+
+if __name__ == "__main__":
+    main()
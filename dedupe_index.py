@@ -0,0 +1,134 @@
+"""
+AI News Daily Digest - Seen Article Index
+Purpose: Remember which stories earlier runs already collected, keyed by a
+         canonical form of the article URL
+"""
+
+import sqlite3
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only identify the referrer or campaign
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src',
+    'ref_url', 'cmpid', 'smid', '_hsenc', '_hsmi', 'mkt_tok', 'yclid', 'guccounter',
+    'guce_referrer', 'guce_referrer_sig',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_', 'oly_')
+
+# Redirect wrappers whose real destination is in a query parameter: host (or
+# host and path, where the host also serves other pages) -> parameter
+WRAPPER_PARAMS = {
+    'out.reddit.com': 'url',
+    'google.com/url': 'q',
+    'l.facebook.com': 'u',
+    'lm.facebook.com': 'u',
+    'news.google.com': 'url',
+}
+
+# Host prefixes that serve the same content as the bare domain
+HOST_ALIASES = ('www.', 'm.', 'mobile.', 'amp.', 'old.')
+
+# Other names of one particular site
+SITE_ALIASES = {'new.reddit.com': 'reddit.com'}
+
+
+def canonicalize_url(url):
+    """Reduce an article URL to a stable key for the same story
+
+    Drops the scheme, lowercases the host, strips www./m./old. style prefixes, default
+    ports, fragments, trailing slashes and tracking parameters, sorts what is
+    left of the query, and unwraps redirect, Reddit and Hacker News links.
+    Returns '' for an empty URL.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    host = (parts.hostname or '').lower().rstrip('.')
+    for alias in HOST_ALIASES:
+        if host.startswith(alias) and host.count('.') > 1:
+            host = host[len(alias):]
+            break
+    host = SITE_ALIASES.get(host, host)
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    # Redirect wrappers: canonicalize the destination instead
+    wrapper_param = WRAPPER_PARAMS.get(host) or WRAPPER_PARAMS.get(host + parts.path)
+    if wrapper_param:
+        # Already decoded by parse_qsl; decoding again would turn %253F into a real '?'
+        target = dict(query).get(wrapper_param)
+        if target and target.startswith('http'):
+            return canonicalize_url(target)
+
+    path = parts.path or '/'
+
+    # Reddit: /r/<sub>/comments/<id>/<slug>/ and redd.it/<id> both mean the post <id>
+    if host == 'redd.it' and path.strip('/'):
+        return f"reddit.com/comments/{path.strip('/').split('/')[0]}"
+    if host == 'reddit.com' and '/comments/' in path:
+        post_id = path.split('/comments/', 1)[1].split('/')[0]
+        return f"reddit.com/comments/{post_id}"
+
+    # Hacker News: only the item id identifies a discussion
+    if host == 'news.ycombinator.com' and path == '/item':
+        return f"news.ycombinator.com/item?id={dict(query).get('id', '')}"
+
+    query = sorted((key, value) for key, value in query
+                   if key.lower() not in TRACKING_PARAMS
+                   and not key.lower().startswith(TRACKING_PREFIXES))
+
+    port = parts.port
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = path.rstrip('/') or ''
+    return urlunsplit(('', host, path, urlencode(query), '')).lstrip('/')
+
+
+class SeenIndex:
+    """SQLite set of canonical article keys collected by earlier runs"""
+
+    # Stay below SQLite's default limit on bound parameters per statement
+    max_params = 900
+
+    def __init__(self, path='seen_articles.db'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                key TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                source TEXT,
+                headline TEXT
+            ) WITHOUT ROWID
+        """)
+        self.connection.commit()
+
+    def seen(self, keys):
+        """Return the subset of keys already in the index (one query per batch)"""
+        keys = list(set(key for key in keys if key))
+        found = set()
+        for start in range(0, len(keys), self.max_params):
+            chunk = keys[start:start + self.max_params]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT key FROM seen WHERE key IN ({placeholders})", chunk)
+            found.update(row[0] for row in rows)
+        return found
+
+    def record(self, entries, when=None):
+        """Add or refresh (key, source, headline) entries"""
+        when = when or datetime.now().isoformat()
+        self.connection.executemany("""
+            INSERT INTO seen (key, first_seen, last_seen, source, headline)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen
+        """, [(key, when, when, source, headline) for key, source, headline in entries if key])
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,157 @@
+"""
+AI News Daily Digest - Fetch Cache
+Purpose: Remember each source's HTTP validators, extracted headlines and
+         screenshot between runs so unchanged sources can be skipped
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+
+def headline_hash(pairs):
+    """Stable hash of an extracted [headline, link] list"""
+    digest = hashlib.sha1()
+    for headline, link in pairs:
+        digest.update(f"{headline}\t{link}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class FetchCache:
+    """On-disk per-source cache with LRU and size-based eviction
+
+    index.json maps a source name to the URL it was fetched from, its ETag /
+    Last-Modified, a hash of the extracted headlines, the articles and the
+    file names of a cached screenshot and its thumbnail, with the
+    screenshot's perceptual hash. Images are copied next to it.
+    """
+
+    def __init__(self, directory='.digest_cache', max_entries=100, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, 'index.json')
+        os.makedirs(directory, exist_ok=True)
+
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+        # What happened to each source in this run: 'hit (...)' or 'miss'
+        self.report = {}
+
+    def get(self, source):
+        """Cached entry for a source, or None"""
+        return self.entries.get(source)
+
+    def conditional_headers(self, source):
+        """If-None-Match / If-Modified-Since headers for a cached source, or {}"""
+        entry = self.entries.get(source) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, source, outcome):
+        """Note a hit or miss for this run and in the entry's running totals"""
+        self.report[source] = outcome
+        entry = self.entries.get(source)
+        if entry is not None:
+            key = 'misses' if outcome == 'miss' else 'hits'
+            entry[key] = entry.get(key, 0) + 1
+            entry['last_used'] = time.time()
+
+    def restore_screenshot(self, source, report_dir, key='screenshot'):
+        """Copy a source's cached screenshot (or thumbnail) into report_dir and return its path"""
+        entry = self.entries.get(source) or {}
+        filename = entry.get(key)
+        if not filename or not os.path.exists(os.path.join(self.directory, filename)):
+            return None
+        path = os.path.join(report_dir, filename)
+        shutil.copyfile(os.path.join(self.directory, filename), path)
+        return path
+
+    def store(self, source, url, etag, last_modified, pairs_hash, articles, screenshot_path=None,
+              thumbnail_path=None, screenshot_hash=None):
+        """Replace a source's entry after a fresh fetch"""
+        previous = self.entries.get(source, {})
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'headline_hash': pairs_hash,
+            'articles': [{'source': article.source, 'headline': article.headline,
+                          'link': article.link, 'scraped_at': article.scraped_at}
+                         for article in articles],
+            'screenshot': previous.get('screenshot'),
+            'thumbnail': previous.get('thumbnail'),
+            'screenshot_hash': previous.get('screenshot_hash'),
+            'hits': previous.get('hits', 0),
+            'misses': previous.get('misses', 0),
+            'last_used': time.time(),
+        }
+
+        # A screenshot that looks like the cached one is already there
+        same_image = screenshot_hash is not None and screenshot_hash == entry['screenshot_hash'] and \
+            os.path.basename(screenshot_path or '') == entry['screenshot']
+        if screenshot_path and os.path.exists(screenshot_path) and not same_image:
+            self.entries.pop(source, None)
+            self.remove_images(previous, keep=(os.path.basename(screenshot_path),
+                                               os.path.basename(thumbnail_path or '')))
+            entry['screenshot'] = os.path.basename(screenshot_path)
+            entry['screenshot_hash'] = screenshot_hash
+            shutil.copyfile(screenshot_path, os.path.join(self.directory, entry['screenshot']))
+            entry['thumbnail'] = None
+            if thumbnail_path and os.path.exists(thumbnail_path):
+                entry['thumbnail'] = os.path.basename(thumbnail_path)
+                shutil.copyfile(thumbnail_path, os.path.join(self.directory, entry['thumbnail']))
+
+        self.entries[source] = entry
+
+    def entry_size(self, entry):
+        size = len(json.dumps(entry['articles']))
+        for key in ('screenshot', 'thumbnail'):
+            if entry.get(key):
+                try:
+                    size += os.path.getsize(os.path.join(self.directory, entry[key]))
+                except OSError:
+                    pass
+        return size
+
+    def evict(self):
+        """Drop least recently used entries until within max_entries and max_bytes"""
+        by_age = sorted(self.entries, key=lambda source: self.entries[source].get('last_used', 0))
+        sizes = {source: self.entry_size(self.entries[source]) for source in by_age}
+        total = sum(sizes.values())
+
+        for source in by_age:
+            if len(self.entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            entry = self.entries.pop(source)
+            total -= sizes[source]
+            self.remove_images(entry)
+
+    def remove_images(self, entry, keep=()):
+        """Delete an entry's cached images unless another entry uses them"""
+        for key in ('screenshot', 'thumbnail'):
+            filename = entry.get(key)
+            if not filename or filename in keep or any(e.get(key) == filename for e in self.entries.values()):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+    def save(self):
+        """Evict, then write the index atomically"""
+        self.evict()
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,556 @@
+"""
+AI News Daily Digest - HTML Renderer
+Purpose: Write the digest page piece by piece from precompiled templates,
+         escaping every headline, source and link, with a search index of
+         its stories embedded at the end
+"""
+
+import os
+import re
+from datetime import datetime
+from html import escape as html_escape
+
+from search_index import PageIndex
+
+CATEGORY_ICONS = {
+    'LLMs & Chatbots': '💬',
+    'Computer Vision & Image Gen': '👁️',
+    'AI Research': '🔬',
+    'AI Ethics & Safety': '⚖️',
+    'AI Business & Industry': '💼',
+    'AI Agents & Automation': '🤖',
+    'AI Hardware': '⚡',
+    'General AI News': '🧠'
+}
+
+STYLES = """\
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
+            padding: 20px;
+            color: #333;
+            line-height: 1.6;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 20px;
+            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+            overflow: hidden;
+        }
+        .header {
+            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
+            color: white;
+            padding: 50px 40px;
+            text-align: center;
+        }
+        .header h1 {
+            font-size: 3em;
+            margin-bottom: 10px;
+            text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+        }
+        .header .tagline {
+            font-size: 1.2em;
+            opacity: 0.95;
+            font-weight: 300;
+            margin-bottom: 10px;
+        }
+        .header .date {
+            font-size: 1.1em;
+            opacity: 0.9;
+        }
+        .header .stats {
+            margin-top: 20px;
+            display: flex;
+            justify-content: center;
+            gap: 40px;
+            font-size: 1.1em;
+        }
+        .stat {
+            background: rgba(255,255,255,0.2);
+            padding: 15px 30px;
+            border-radius: 10px;
+            backdrop-filter: blur(10px);
+        }
+        .stat strong {
+            display: block;
+            font-size: 2em;
+            margin-bottom: 5px;
+        }
+        .search {
+            display: block;
+            width: 100%;
+            max-width: 600px;
+            margin: 25px auto 0;
+            padding: 12px 20px;
+            border: none;
+            border-radius: 25px;
+            font-size: 1.1em;
+            box-shadow: 0 5px 15px rgba(0,0,0,0.2);
+        }
+        .search-count {
+            margin-bottom: 25px;
+            color: #666;
+            font-size: 1.1em;
+        }
+        .content {
+            padding: 40px;
+        }
+        .category-section {
+            margin-bottom: 50px;
+        }
+        .category-header {
+            display: flex;
+            align-items: center;
+            margin-bottom: 25px;
+            padding-bottom: 15px;
+            border-bottom: 3px solid #7e22ce;
+        }
+        .category-icon {
+            font-size: 2em;
+            margin-right: 15px;
+        }
+        .category-title {
+            font-size: 2em;
+            color: #7e22ce;
+            font-weight: 700;
+        }
+        .category-count {
+            margin-left: auto;
+            background: #7e22ce;
+            color: white;
+            padding: 5px 15px;
+            border-radius: 20px;
+            font-size: 0.9em;
+        }
+        .articles-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+            gap: 20px;
+        }
+        .article-card {
+            background: #f8f9fa;
+            border-radius: 12px;
+            padding: 25px;
+            transition: all 0.3s ease;
+            border-left: 4px solid #7e22ce;
+            cursor: pointer;
+        }
+        .article-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 10px 25px rgba(126, 34, 206, 0.2);
+            background: white;
+        }
+        .article-source {
+            display: inline-block;
+            background: #7e22ce;
+            color: white;
+            padding: 5px 12px;
+            border-radius: 15px;
+            font-size: 0.8em;
+            font-weight: 600;
+            margin-bottom: 12px;
+            margin-right: 6px;
+            text-decoration: none;
+        }
+        .article-seen {
+            display: inline-block;
+            background: #e0e0e0;
+            color: #666;
+            padding: 5px 12px;
+            border-radius: 15px;
+            font-size: 0.8em;
+            margin-left: 6px;
+        }
+        .article-card.seen {
+            opacity: 0.7;
+        }
+        .article-headline {
+            font-size: 1.2em;
+            color: #2c3e50;
+            margin-bottom: 12px;
+            font-weight: 600;
+            line-height: 1.4;
+        }
+        .article-link {
+            color: #7e22ce;
+            text-decoration: none;
+            font-weight: 500;
+            display: inline-flex;
+            align-items: center;
+            font-size: 0.9em;
+        }
+        .article-link:hover {
+            text-decoration: underline;
+        }
+        .article-link::after {
+            content: ' →';
+            margin-left: 5px;
+        }
+        .screenshots-section {
+            margin-top: 50px;
+            padding-top: 40px;
+            border-top: 2px solid #e0e0e0;
+        }
+        .screenshots-title {
+            font-size: 2em;
+            color: #7e22ce;
+            margin-bottom: 25px;
+            text-align: center;
+        }
+        .screenshots-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
+            gap: 30px;
+        }
+        .screenshot-card {
+            background: #f8f9fa;
+            border-radius: 12px;
+            overflow: hidden;
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+        }
+        .screenshot-card img {
+            width: 100%;
+            height: auto;
+            display: block;
+        }
+        .screenshot-label {
+            padding: 15px;
+            text-align: center;
+            font-weight: 600;
+            background: white;
+            color: #7e22ce;
+        }
+        .footer {
+            background: #2c3e50;
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }
+        .footer p {
+            margin: 5px 0;
+        }
+        .empty-category {
+            text-align: center;
+            padding: 40px;
+            color: #999;
+            font-style: italic;
+        }
+        
+        @media (max-width: 768px) {
+            .articles-grid {
+                grid-template-columns: 1fr;
+            }
+            .screenshots-grid {
+                grid-template-columns: 1fr;
+            }
+            .header h1 {
+                font-size: 2em;
+            }
+        }
+"""
+
+# Templates are formatted with str.format; every value passed in is already escaped
+PAGE_START = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Daily Digest - {title_date}</title>
+    <style>
+{styles}    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🤖 AI Daily Digest</h1>
+            <p class="tagline">Your Personalized Artificial Intelligence News Roundup</p>
+            <p class="date">{date}</p>
+            <div class="stats">
+                <div class="stat">
+                    <strong>{articles}</strong>
+                    <span>AI Articles</span>
+                </div>
+                <div class="stat">
+                    <strong>{categories}</strong>
+                    <span>AI Categories</span>
+                </div>
+                <div class="stat">
+                    <strong>{sources}</strong>
+                    <span>AI Sources</span>
+                </div>
+            </div>
+            <input type="search" id="search" class="search" placeholder="Search headlines and sources" hidden>
+        </div>
+        <div class="content">
+            <div id="search-results" hidden></div>
+"""
+
+SECTION_START = """
+            <div class="category-section">
+                <div class="category-header">
+                    <span class="category-icon">{icon}</span>
+                    <h2 class="category-title">{category}</h2>
+                    <span class="category-count">{count} articles</span>
+                </div>
+                <div class="articles-grid">
+"""
+
+SECTION_END = """
+                </div>
+            </div>
+"""
+
+SEEN_BADGE = '<span class="article-seen">Seen before</span>'
+
+SCREENSHOTS_START = """
+            <div class="screenshots-section">
+                <h2 class="screenshots-title">📸 Source Screenshots</h2>
+                <div class="screenshots-grid">
+"""
+
+SCREENSHOT = """
+                    <div class="screenshot-card">
+                        <a href="{filename}" target="_blank"><img src="{thumbnail}" alt="{source}" loading="lazy"></a>
+                        <div class="screenshot-label">{source}</div>
+                    </div>
+"""
+
+# Shown once the page's index has loaded; the index is a JSON <script> read by SEARCH_SCRIPT.
+# Tokenizing and scoring follow search_index.tokenize() and SearchIndex.search().
+SEARCH_INDEX_START = """
+            <script type="application/json" id="search-index">"""
+
+SEARCH_INDEX_END = """</script>
+"""
+
+SEARCH_SCRIPT = r"""
+            <script>
+            (function () {
+                var data = JSON.parse(document.getElementById('search-index').textContent);
+                var CONTINUE = '0123456789abcdefghijklmnopqrstuv', FINAL = 'wxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-_';
+                var LIMIT = 200;
+                var digits = {};
+                for (var d = 0; d < 32; d++) { digits[CONTINUE[d]] = d; digits[FINAL[d]] = 32 + d; }
+
+                function numbers(text) {
+                    var out = [], value = 0;
+                    for (var i = 0; i < text.length; i++) {
+                        var digit = digits[text[i]];
+                        if (digit < 32) { value = value * 32 + digit; }
+                        else { out.push(value * 32 + digit - 32); value = 0; }
+                    }
+                    return out;
+                }
+
+                // Front coded: a base-36 digit of UTF-16 code units shared with the previous term, then the rest
+                var terms = [], previous = '';
+                if (data.terms) {
+                    data.terms.split(',').forEach(function (entry) {
+                        previous = previous.slice(0, parseInt(entry[0], 36)) + entry.slice(1);
+                        terms.push(previous);
+                    });
+                }
+                var postings = data.postings.split(',');
+                var lengths = numbers(data.lengths);
+                var average = lengths.reduce(function (a, b) { return a + b; }, 0) / lengths.length || 1;
+                var stopwords = new Set(data.stopwords.split(','));
+                var cards = document.querySelectorAll('.article-card');
+
+                function tokenize(text) {
+                    return text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '').match(/[\p{L}\p{N}]+/gu) || [];
+                }
+
+                function matching(word, prefix) {
+                    var low = 0, high = terms.length;
+                    while (low < high) {
+                        var middle = (low + high) >> 1;
+                        if (terms[middle] < word) { low = middle + 1; } else { high = middle; }
+                    }
+                    var found = [];
+                    for (var i = low; i < terms.length && terms[i].startsWith(word); i++) {
+                        if (!prefix && terms[i] !== word) { break; }
+                        found.push(i);
+                    }
+                    return found;
+                }
+
+                function search(query) {
+                    var words = tokenize(query), prefix = words.length > 0 && !/\s$/.test(query);
+                    words = words.filter(function (word, i) {
+                        return !stopwords.has(word) || (prefix && i === words.length - 1);
+                    });
+                    if (!words.length) { return null; }
+                    var scores = null;
+                    words.forEach(function (word, position) {
+                        var wordScores = new Map();
+                        matching(word, prefix && position === words.length - 1).forEach(function (term) {
+                            // Gaps between story numbers; a gap of 0 is another occurrence in the same story
+                            var frequency = new Map(), story = -1;
+                            numbers(postings[term]).forEach(function (gap) {
+                                story += gap;
+                                frequency.set(story, (frequency.get(story) || 0) + 1);
+                            });
+                            var idf = Math.log(1 + (lengths.length - frequency.size + 0.5) / (frequency.size + 0.5));
+                            frequency.forEach(function (tf, story) {
+                                var score = idf * tf * (data.k1 + 1) /
+                                    (tf + data.k1 * (1 - data.b + data.b * lengths[story] / average));
+                                // A word being typed scores as the best of the words it starts
+                                wordScores.set(story, Math.max(wordScores.get(story) || 0, score));
+                            });
+                        });
+                        if (scores === null) { scores = wordScores; return; }
+                        var both = new Map();
+                        scores.forEach(function (score, story) {
+                            if (wordScores.has(story)) { both.set(story, score + wordScores.get(story)); }
+                        });
+                        scores = both;
+                    });
+                    return Array.from(scores).sort(function (a, b) { return b[1] - a[1] || a[0] - b[0]; });
+                }
+
+                var box = document.getElementById('search');
+                var results = document.getElementById('search-results');
+                var sections = document.querySelectorAll('.category-section, .screenshots-section');
+                box.hidden = false;
+                box.addEventListener('input', function () {
+                    var ranked = search(box.value);
+                    sections.forEach(function (section) { section.hidden = ranked !== null; });
+                    results.hidden = ranked === null;
+                    if (ranked === null) { return; }
+                    var count = document.createElement('p');
+                    count.className = 'search-count';
+                    count.textContent = ranked.length + (ranked.length === 1 ? ' story' : ' stories') +
+                        (ranked.length > LIMIT ? ', best ' + LIMIT + ' shown' : '');
+                    var grid = document.createElement('div');
+                    grid.className = 'articles-grid';
+                    ranked.slice(0, LIMIT).forEach(function (match) { grid.appendChild(cards[match[0]].cloneNode(true)); });
+                    results.replaceChildren(count, grid);
+                });
+            })();
+            </script>
+"""
+
+PAGE_END = """
+        </div>
+        <div class="footer">
+            <p><strong>AI Daily Digest</strong></p>
+            <p>Powered by Playwright Automation | Curated AI News</p>
+            <p>Stay updated on the latest in Artificial Intelligence! 🤖</p>
+            <p style="margin-top: 15px; font-size: 0.9em; opacity: 0.8;">
+                Generated: {generated}
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Most headlines and links contain nothing to escape; one search skips the replaces
+needs_escape = re.compile('[&<>"\']').search
+safe_url_prefix = re.compile('https?://', re.IGNORECASE).match
+
+
+def escape(text):
+    """html.escape, returning text unchanged when it has no special characters"""
+    return html_escape(text) if needs_escape(text) else text
+
+
+def safe_url(url):
+    """Escaped http(s) URL for an href; anything else (javascript:, empty) becomes '#'"""
+    return escape(url) if safe_url_prefix(url) else '#'
+
+
+def render_card(story):
+    """One article card: the first article of a story plus links to the other sources
+
+    The card is the one piece rendered per article, so its template is an
+    f-string, compiled with the module and faster than str.format.
+    """
+    article = story[0]
+    seen = article.seen_before
+    also = ''.join([f'<a class="article-source" href="{safe_url(other.link)}" target="_blank">'
+                    f'{escape(other.source)}</a>' for other in story[1:]]) if len(story) > 1 else ''
+    return f"""
+                    <div class="article-card{' seen' if seen else ''}">
+                        <span class="article-source">{escape(article.source)}</span>{also}{SEEN_BADGE if seen else ''}
+                        <h3 class="article-headline">{escape(article.headline)}</h3>
+                        <a href="{safe_url(article.link)}" target="_blank" class="article-link">Read Full Article</a>
+                    </div>
+"""
+
+
+def story_text(story):
+    """What the page search looks in: the headline and every source of a story"""
+    return ' '.join([story[0].headline] + [article.source for article in story])
+
+
+def render_digest(cards, total_articles, total_categories, total_sources, screenshots=None, now=None,
+                  thumbnails=None, search=True):
+    """Yield the digest page in pieces: the header, each section and card, screenshots,
+    search index, footer
+
+    cards maps a category to its stories (lists of articles, first article
+    shown); categories with the most stories come first. Screenshots are
+    shown as their thumbnail, when there is one, linking to the full image.
+    With search, the page gets a search box over its stories.
+    """
+    index = PageIndex() if search else None
+    thumbnails = thumbnails or {}
+    now = now or datetime.now()
+    yield PAGE_START.format(
+        title_date=now.strftime('%B %d, %Y'),
+        styles=STYLES,
+        date=now.strftime('%A, %B %d, %Y at %I:%M %p'),
+        articles=total_articles,
+        categories=total_categories,
+        sources=total_sources,
+    )
+
+    for category, stories in sorted(cards.items(), key=lambda item: len(item[1]), reverse=True):
+        if not stories:
+            continue
+        yield SECTION_START.format(icon=CATEGORY_ICONS.get(category, '📄'),
+                                   category=escape(category), count=len(stories))
+        for story in stories:
+            if index is not None:
+                index.add(story_text(story))
+            yield render_card(story)
+        yield SECTION_END
+
+    if screenshots:
+        yield SCREENSHOTS_START
+        for source, filename in screenshots.items():
+            yield SCREENSHOT.format(filename=escape(filename), thumbnail=escape(thumbnails.get(source, filename)),
+                                    source=escape(source))
+        yield SECTION_END
+
+    if index is not None:
+        # Built card by card above; only its encoded postings were kept
+        yield SEARCH_INDEX_START
+        yield from index.json_chunks()
+        yield SEARCH_INDEX_END
+        yield SEARCH_SCRIPT
+
+    yield PAGE_END.format(generated=now.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def write_digest(path, chunks, batch_size=256):
+    """Write rendered pieces to a file, joining them in batches to save write calls
+
+    The page is written next to path and moved into place when complete, so
+    a digest that is regenerated in place is never seen half written.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                f.write(''.join(batch))
+                batch.clear()
+        f.write(''.join(batch))
+    os.replace(tmp_path, path)
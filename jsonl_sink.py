@@ -0,0 +1,141 @@
+"""
+AI News Daily Digest - JSONL Output
+Purpose: Append each article to articles.jsonl as soon as it is collected, keep
+         the run's totals in a small summary.json, and rebuild the combined
+         ai_news_data.json from the two on demand
+
+Usage:
+    python jsonl_sink.py ai_digest_20241214_143052/
+"""
+
+import argparse
+import json
+import os
+import time
+
+# Optional: much faster encoding and decoding of the JSONL records
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ARTICLES_FILE = 'articles.jsonl'
+SUMMARY_FILE = 'summary.json'
+COMBINED_FILE = 'ai_news_data.json'
+
+
+def dumps_line(record):
+    """One JSONL line as UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class JsonlSink:
+    """Append-only article log that survives the process dying mid-run
+
+    Every write is flushed to the OS straight away; the file is fsynced every
+    `fsync_every` records or `fsync_interval` seconds, and on close. With
+    append=False an existing file is replaced. The file is opened by the
+    first write or by close, so a sink that is never used touches nothing.
+    """
+
+    def __init__(self, path, fsync_every=50, fsync_interval=5.0, append=True):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.append = append
+        self.file = None
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.count = 0
+
+    def open(self):
+        if self.file is None:
+            self.file = open(self.path, 'ab' if self.append else 'wb')
+
+    def write(self, records):
+        """Append a batch of records, one line each"""
+        lines = [dumps_line(record) for record in records]
+        if not lines:
+            return
+        self.open()
+        self.file.write(b''.join(lines))
+        self.file.flush()
+        self.count += len(lines)
+        self.unsynced += len(lines)
+        if self.unsynced >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.open()
+        if self.file.closed:
+            return
+        self.file.flush()
+        self.sync()
+        self.file.close()
+
+
+def write_summary(path, summary):
+    """Replace the summary file atomically, so a crash leaves the previous one intact"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def read_jsonl(path):
+    """Yield the records of a JSONL file, ignoring a last line cut off by a crash"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    lines = data.split(b'\n')
+    for number, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            yield loads(line)
+        except ValueError:
+            if number == len(lines) - 1:
+                return
+            raise
+
+
+def rebuild_json(report_dir):
+    """Write ai_news_data.json from summary.json and articles.jsonl; return its path"""
+    with open(os.path.join(report_dir, SUMMARY_FILE), encoding='utf-8') as f:
+        data = json.load(f)
+    data['articles'] = list(read_jsonl(os.path.join(report_dir, ARTICLES_FILE)))
+
+    json_path = os.path.join(report_dir, COMBINED_FILE)
+    with open(json_path, 'wb') as f:
+        if orjson is not None:
+            f.write(orjson.dumps(data))
+        else:
+            f.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+    return json_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild ai_news_data.json from a digest's JSONL output")
+    parser.add_argument('report_dirs', nargs='+', help="ai_digest_YYYYMMDD_HHMMSS folders")
+    args = parser.parse_args()
+
+    for report_dir in args.report_dirs:
+        try:
+            json_path = rebuild_json(report_dir)
+            print(f"✅ JSON data rebuilt: {json_path}")
+        except Exception as e:
+            print(f"❌ Could not rebuild {report_dir}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+AI News Daily Digest - Learned Categorizer
+Purpose: Optional linear headline classifier bootstrapped from the keyword
+         rules, scored in NumPy batches on the CPU
+
+Headlines are turned into hashed word and character n-gram features and
+scored with a softmax linear model. Training labels come from
+KeywordCategorizer: the rules' primary category plus a share for every
+other category whose keywords a headline contains, so topics hidden by the
+rules' priority order still get weight.
+
+The model is two files: <name>.npy (float32 weights, memory-mapped on load)
+and <name>.json (categories and feature settings).
+
+Usage:
+    python learned_categorizer.py train ai_digest_*/ai_news_data.json --out models/headlines
+    python learned_categorizer.py classify models/headlines "OpenAI ships a new GPU cluster"
+"""
+
+import argparse
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+
+from categorizer import KeywordCategorizer
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def headline_features(headline, n_features, char_ngrams):
+    """Hashed feature indices for a headline: words, word bigrams and character n-grams"""
+    words = TOKEN_RE.findall(headline.lower())
+    tokens = ['<bias>']
+    tokens += words
+    tokens += [f'{first} {second}' for first, second in zip(words, words[1:])]
+    if char_ngrams:
+        for word in words:
+            padded = f'<{word}>'
+            tokens += [padded[i:i + char_ngrams] for i in range(len(padded) - char_ngrams + 1)]
+    return [zlib.crc32(token.encode('utf-8')) % n_features for token in tokens]
+
+
+def feature_matrix(headlines, n_features, char_ngrams):
+    """Sparse CSR-style (indptr, indices) rows for a batch; every row has the bias feature"""
+    indices = []
+    indptr = [0]
+    for headline in headlines:
+        indices.extend(headline_features(headline, n_features, char_ngrams))
+        indptr.append(len(indices))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+
+def softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+class LearnedCategorizer:
+    """Linear model over hashed n-grams with the same interface as KeywordCategorizer"""
+
+    def __init__(self, weights, categories, char_ngrams=3):
+        self.weights = weights
+        self.names = list(categories)
+        self.n_features = weights.shape[0]
+        self.char_ngrams = char_ngrams
+        self.backend = 'learned'
+
+    @classmethod
+    def load(cls, path):
+        """Load <path>.json and memory-map <path>.npy"""
+        with open(f"{path}.json", encoding='utf-8') as f:
+            meta = json.load(f)
+        weights = np.load(f"{path}.npy", mmap_mode='r')
+        return cls(weights, meta['categories'], meta['char_ngrams'])
+
+    def save(self, path):
+        """Write <path>.npy and <path>.json"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.save(f"{path}.npy", np.ascontiguousarray(self.weights, dtype=np.float32))
+        with open(f"{path}.json", 'w', encoding='utf-8') as f:
+            json.dump({'categories': self.names, 'char_ngrams': self.char_ngrams,
+                       'n_features': self.n_features}, f, indent=2)
+
+    def scores(self, headlines):
+        """Category probabilities, one row per headline
+
+        The sparse feature rows times the weight matrix is computed as one
+        gather of weight rows followed by a segmented sum.
+        """
+        if not headlines:
+            return np.zeros((0, len(self.names)), dtype=np.float32)
+        indptr, indices = feature_matrix(headlines, self.n_features, self.char_ngrams)
+        logits = np.add.reduceat(self.weights[indices], indptr[:-1], axis=0)
+        return softmax(logits.astype(np.float32))
+
+    def classify_many(self, headlines):
+        """(primary category, {category: confidence}) for each headline"""
+        probabilities = self.scores(headlines)
+        return [(self.names[row.argmax()],
+                 {name: round(float(p), 4) for name, p in zip(self.names, row)})
+                for row in probabilities]
+
+    def categorize_many(self, headlines):
+        """Primary category for each headline, in order"""
+        return [self.names[i] for i in self.scores(headlines).argmax(axis=1)]
+
+    def categorize(self, headline):
+        """Primary category for one headline"""
+        return self.categorize_many([headline])[0]
+
+
+def bootstrap_targets(headlines, keywords):
+    """Soft labels from the keyword rules
+
+    Half the mass goes to the rules' primary (highest-priority) category and
+    half is spread over every category with a matching keyword.
+    """
+    targets = np.zeros((len(headlines), len(keywords.names)), dtype=np.float32)
+    default_index = len(keywords.names) - 1
+    for row, headline in enumerate(headlines):
+        matched = keywords.all_category_indices(headline.lower()) or [default_index]
+        targets[row, matched] = 0.5 / len(matched)
+        targets[row, matched[0]] += 0.5
+    return targets
+
+
+def train(headlines, n_features=2 ** 15, char_ngrams=3, epochs=30, batch_size=2048,
+          learning_rate=0.05, l2=1e-6, seed=0, keywords=None):
+    """Fit a LearnedCategorizer to keyword-bootstrapped labels with minibatch Adam"""
+    keywords = keywords or KeywordCategorizer()
+    targets = bootstrap_targets(headlines, keywords)
+    n_classes = targets.shape[1]
+
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((n_features, n_classes), dtype=np.float32)
+    first_moment = np.zeros_like(weights)
+    second_moment = np.zeros_like(weights)
+    step = 0
+
+    # Featurize once; minibatches slice the CSR rows
+    indptr, indices = feature_matrix(headlines, n_features, char_ngrams)
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(headlines))
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            lengths = indptr[rows + 1] - indptr[rows]
+            batch_indptr = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            offsets = np.arange(lengths.sum()) - np.repeat(batch_indptr, lengths)
+            batch_indices = indices[np.repeat(indptr[rows], lengths) + offsets]
+
+            logits = np.add.reduceat(weights[batch_indices], batch_indptr, axis=0)
+            error = (softmax(logits) - targets[rows]) / len(rows)
+
+            # Gradient of the sparse product: scatter each row's error onto its features
+            row_of_feature = np.repeat(np.arange(len(rows)), lengths)
+            gradient = np.empty_like(weights)
+            for c in range(n_classes):
+                gradient[:, c] = np.bincount(batch_indices, weights=error[row_of_feature, c],
+                                             minlength=n_features)
+            gradient += l2 * weights
+
+            step += 1
+            first_moment = 0.9 * first_moment + 0.1 * gradient
+            second_moment = 0.999 * second_moment + 0.001 * gradient * gradient
+            corrected_first = first_moment / (1 - 0.9 ** step)
+            corrected_second = second_moment / (1 - 0.999 ** step)
+            weights -= learning_rate * corrected_first / (np.sqrt(corrected_second) + 1e-8)
+
+    return LearnedCategorizer(weights, keywords.names, char_ngrams)
+
+
+def read_headlines(paths):
+    """Headlines from saved ai_news_data.json / articles.jsonl files or plain text files (one per line)"""
+    headlines = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            if path.endswith('.json'):
+                headlines += [article['headline'] for article in json.load(f)['articles']]
+            elif path.endswith('.jsonl'):
+                headlines += [json.loads(line)['headline'] for line in f if line.strip()]
+            else:
+                headlines += [line.strip() for line in f if line.strip()]
+    return headlines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or run the learned headline categorizer")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_cmd = commands.add_parser('train', help="fit a model to keyword-bootstrapped labels")
+    train_cmd.add_argument('inputs', nargs='+', help="ai_news_data.json, articles.jsonl or text files")
+    train_cmd.add_argument('--out', required=True, help="model path without extension")
+    train_cmd.add_argument('--features', type=int, default=2 ** 15)
+    train_cmd.add_argument('--epochs', type=int, default=30)
+
+    classify_cmd = commands.add_parser('classify', help="score headlines with a saved model")
+    classify_cmd.add_argument('model')
+    classify_cmd.add_argument('headlines', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        headlines = read_headlines(args.inputs)
+        print(f"🧠 Training on {len(headlines)} headlines...")
+        model = train(headlines, n_features=args.features, epochs=args.epochs)
+        model.save(args.out)
+
+        keywords = KeywordCategorizer()
+        agreement = np.mean([a == b for a, b in zip(model.categorize_many(headlines),
+                                                    keywords.categorize_many(headlines))])
+        size_kb = os.path.getsize(f"{args.out}.npy") / 1024
+        print(f"✅ Model saved: {args.out}.npy ({size_kb:.0f} KB), "
+              f"{agreement:.1%} agreement with the keyword rules")
+    else:
+        model = LearnedCategorizer.load(args.model)
+        for headline, (category, confidence) in zip(args.headlines, model.classify_many(args.headlines)):
+            top = sorted(confidence.items(), key=lambda item: item[1], reverse=True)[:3]
+            print(f"{category:28s} {headline}")
+            print("    " + ", ".join(f"{name} {p:.2f}" for name, p in top))
+
+
+if __name__ == "__main__":
+    main()
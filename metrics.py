@@ -0,0 +1,171 @@
+"""
+AI News Daily Digest - Run Metrics
+Purpose: Time every stage of a run (per source where it applies) and count the
+         headlines seen, kept, filtered and failed, then export them as
+         metrics.json and a Prometheus textfile next to ai_news_data.json
+
+When disabled, span() hands back one shared no-op object and count() returns
+at once, so the instrumented code pays a method call and nothing else.
+"""
+
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+METRICS_FILE = 'metrics.json'
+PROMETHEUS_FILE = 'metrics.prom'
+PREFIX = 'ai_digest'
+
+
+class NoSpan:
+    """Stands in for a Span when metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_SPAN = NoSpan()
+
+
+class Span:
+    """Times one stage: `with metrics.span('navigation', source=name):`"""
+
+    __slots__ = ('metrics', 'key', 'start')
+
+    def __init__(self, metrics, key):
+        self.metrics = metrics
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """Stage timings and counters, keyed by name and labels
+
+    timings   (stage, labels) -> [calls, total seconds, slowest call]
+    counters  (name, labels)  -> value
+
+    labels is a sorted tuple of (label, value) pairs.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = {}
+        self.counters = {}
+
+    def span(self, stage, **labels):
+        if not self.enabled:
+            return NO_SPAN
+        return Span(self, (stage, tuple(sorted(labels.items()))))
+
+    def observe(self, key, seconds):
+        timing = self.timings.get(key)
+        if timing is None:
+            self.timings[key] = [1, seconds, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def timing(self, stage, seconds, **labels):
+        """Record a duration measured elsewhere, e.g. in a worker thread"""
+        if self.enabled:
+            self.observe((stage, tuple(sorted(labels.items()))), seconds)
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled or not value:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def stage_totals(self):
+        """Stage -> (calls, seconds) summed over all labels, in first-seen order"""
+        totals = {}
+        for (stage, _), (calls, seconds, _) in self.timings.items():
+            before = totals.get(stage, (0, 0.0))
+            totals[stage] = (before[0] + calls, before[1] + seconds)
+        return totals
+
+    def to_dict(self):
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'timings': [{'stage': stage, 'labels': dict(labels), 'calls': calls,
+                         'seconds': round(seconds, 6), 'max_seconds': round(slowest, 6)}
+                        for (stage, labels), (calls, seconds, slowest) in self.timings.items()],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in self.counters.items()],
+        }
+
+    def merge(self, data):
+        """Add the output of another process's to_dict()"""
+        for timing in data['timings']:
+            key = (timing['stage'], tuple(sorted(timing['labels'].items())))
+            before = self.timings.get(key, [0, 0.0, 0.0])
+            self.timings[key] = [before[0] + timing['calls'], before[1] + timing['seconds'],
+                                 max(before[2], timing['max_seconds'])]
+        for counter in data['counters']:
+            key = (counter['name'], tuple(sorted(counter['labels'].items())))
+            self.counters[key] = self.counters.get(key, 0) + counter['value']
+
+    def prometheus_lines(self):
+        """Prometheus text exposition format, one family per stage timing and counter"""
+        lines = []
+        if self.timings:
+            family = f'{PREFIX}_stage_seconds'
+            lines.append(f'# HELP {family} Time spent in each stage of the digest run')
+            lines.append(f'# TYPE {family} summary')
+            for (stage, labels), (calls, seconds, _) in self.timings.items():
+                series = format_labels((('stage', stage),) + labels)
+                lines.append(f'{family}_sum{series} {seconds:.6f}')
+                lines.append(f'{family}_count{series} {calls}')
+
+        names = []
+        for name, _ in self.counters:
+            if name not in names:
+                names.append(name)
+        for name in names:
+            family = f"{PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f'# TYPE {family} counter')
+            for (counter, labels), value in self.counters.items():
+                if counter == name:
+                    lines.append(f'{family}{format_labels(labels)} {value}')
+        return lines
+
+    def save(self, directory):
+        """Write metrics.json and metrics.prom atomically; returns the JSON path"""
+        json_path = os.path.join(directory, METRICS_FILE)
+        write_atomic(json_path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
+        write_atomic(os.path.join(directory, PROMETHEUS_FILE), '\n'.join(self.prometheus_lines()) + '\n')
+        return json_path
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{escape_label(value)}"' for key, value in labels)
+    return '{' + pairs + '}'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_atomic(path, text):
+    # The textfile collector may read at any moment; never show it half a file
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
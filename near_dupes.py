@@ -0,0 +1,204 @@
+"""
+AI News Daily Digest - Near-Duplicate Headlines
+Purpose: Group headlines from different outlets that cover the same story,
+         using MinHash signatures and LSH banding instead of comparing every
+         pair of headlines
+
+Only the first headline of a group is shown, so a reworded copy of a story
+joins it but a different story worded alike must not. Headlines from
+different sources are joined when they share most of their content words
+(Jaccard similarity), and they name the same things: "OpenAI launches GPT-5
+for everyone" and "OpenAI unveils GPT-5 for everyone" are one story, while
+"Nvidia stock falls 5%" and "Nvidia stock rises 5%" are two, as the number
+is said with a different word.
+"""
+
+import random
+import re
+import zlib
+
+# Optional: vectorized signatures, much faster for large archives
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Mersenne prime for the (a * x + b) mod P hash family; a * x fits in 64 bits
+PRIME = (1 << 31) - 1
+
+WORD_RE = re.compile(r"[A-Za-z0-9]+")
+POSSESSIVE_RE = re.compile(r"['\u2019]s\b")
+
+# Words that do not change which story a headline is about
+FILLER_WORDS = frozenset("""
+a an and are as at be by for from has have how i in is it its my of on or our says the their this to via was we
+were what why will with report reports reported
+""".split())
+
+# Headline words that say the same thing; each maps to the first word of its group
+SAME_MEANING = {word: group[0] for group in [
+    'launch launches launched unveil unveils unveiled release releases released debut debuts debuted'.split(),
+    'introduce introduces introduced announce announces announced'.split(),
+    'better improved improve improves'.split(),
+    'buy buys bought acquire acquires acquired'.split(),
+] for word in group}
+
+
+def normalize(word):
+    """A lower-cased word as compared: same-meaning verbs as one, plurals made singular"""
+    word = word.lower()
+    if word in SAME_MEANING:
+        return SAME_MEANING[word]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def headline_features(headline):
+    """(words, names, quantities) of a headline
+
+    words       its content words, filler words left out
+    names       words written as names: with a capital inside (OpenAI, GPT) or,
+                unless the headline is in title case, capitalized after the first word
+    quantities  each number with the content word before it ("fall 5")
+    """
+    tokens = WORD_RE.findall(POSSESSIVE_RE.sub('', headline))
+    title_case = all(token[0].isupper() for token in tokens if len(token) > 3 and token.isalpha())
+    words, names, quantities = set(), set(), set()
+    previous = ''
+    for position, token in enumerate(tokens):
+        if token.lower() in FILLER_WORDS:
+            continue
+        word = normalize(token)
+        words.add(word)
+        if any(char.isdigit() for char in token):
+            quantities.add(f"{previous} {word}")
+        elif not token[1:].islower() or (token[0].isupper() and position and not title_case):
+            names.add(word)
+        previous = word
+    return frozenset(words), frozenset(names), frozenset(quantities)
+
+
+def content_words(headline):
+    """The words that identify a headline's story: lower-cased, filler words
+    left out, plurals made singular"""
+    return headline_features(headline)[0]
+
+
+def shingle_hashes(words):
+    """Hashes of the word shingles (content words) of a headline"""
+    return [zlib.crc32(word.encode('utf-8')) % PRIME for word in words]
+
+
+def jaccard(first, second):
+    """Share of the words of either set that are in both"""
+    return len(first & second) / len(first | second) if first or second else 0.0
+
+
+def same_story(first, second, threshold):
+    """Whether two headlines' features describe one story: similar enough
+    words, the same numbers said the same way, and no name only one has"""
+    first_words, first_names, first_quantities = first
+    second_words, second_names, second_quantities = second
+    return (first_quantities == second_quantities
+            and first_names <= second_words and second_names <= first_words
+            and jaccard(first_words, second_words) >= threshold)
+
+
+class NearDuplicateClusterer:
+    """Cluster near-duplicate headlines with MinHash + LSH
+
+    bands x rows hash functions are used. Two headlines become candidates if
+    all `rows` values of any band agree (likely above roughly
+    (1 / bands) ** (1 / rows) similarity). They are joined if same_story()
+    holds for them with `threshold` as the least Jaccard similarity of their
+    content words, and no source would appear twice in the group.
+    """
+
+    def __init__(self, bands=16, rows=4, threshold=0.75, seed=1):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        num_perm = bands * rows
+        rng = random.Random(seed)
+        self.coefficients = [(rng.randrange(1, PRIME), rng.randrange(0, PRIME)) for _ in range(num_perm)]
+        if np is not None:
+            self.band_multipliers = np.array([rng.randrange(1, 1 << 63) | 1 for _ in range(rows)], dtype=np.uint64)
+
+    def signatures(self, word_sets, chunk_size=2000):
+        """MinHash signature (num_perm values) for each headline's content words"""
+        shingles = [shingle_hashes(words) or [PRIME - 1 - i]
+                    for i, words in enumerate(word_sets)]
+
+        if np is None:
+            return [[min((a * x + b) % PRIME for x in hashes) for a, b in self.coefficients]
+                    for hashes in shingles]
+
+        a = np.array([a for a, _ in self.coefficients], dtype=np.uint64)[:, None]
+        b = np.array([b for _, b in self.coefficients], dtype=np.uint64)[:, None]
+        result = []
+        # Chunked so the (num_perm x shingles) matrix stays small
+        for start in range(0, len(shingles), chunk_size):
+            chunk = shingles[start:start + chunk_size]
+            lengths = np.array([len(hashes) for hashes in chunk])
+            flat = np.fromiter((x for hashes in chunk for x in hashes), dtype=np.uint64, count=lengths.sum())
+            offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            values = (a * flat + b) % PRIME
+            result.append(np.minimum.reduceat(values, offsets, axis=1).T)
+        return np.concatenate(result) if result else np.zeros((0, len(self.coefficients)), dtype=np.uint64)
+
+    def cluster(self, headlines, sources=None):
+        """Return a cluster id for each headline; the id is the index of its first member
+
+        With sources (one per headline), headlines of the same source are
+        never joined.
+        """
+        features = [headline_features(headline) for headline in headlines]
+        signatures = self.signatures([words for words, _, _ in features])
+        parent = list(range(len(headlines)))
+        # Root of each cluster -> the sources in it
+        members = {i: {source} for i, source in enumerate(sources)} if sources is not None else None
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            columns = slice(band * self.rows, (band + 1) * self.rows)
+            if np is not None:
+                # Fold the band's values into one integer per headline; a rare
+                # collision only adds a candidate that fails the check below
+                keys = (signatures[:, columns] * self.band_multipliers).sum(axis=1).tolist()
+            else:
+                keys = [tuple(signature[columns]) for signature in signatures]
+
+            buckets = {}
+            for i, key in enumerate(keys):
+                first = buckets.setdefault(key, i)
+                # Compare with the bucket's first member only, so a crowded
+                # bucket costs linear rather than quadratic time
+                if first == i:
+                    continue
+                root_first, root_i = find(first), find(i)
+                if root_first == root_i or not same_story(features[first], features[i], self.threshold):
+                    continue
+                if members is not None:
+                    if members[root_first] & members[root_i]:
+                        continue
+                    members[min(root_first, root_i)] |= members.pop(max(root_first, root_i))
+                parent[max(root_first, root_i)] = min(root_first, root_i)
+
+        return [find(i) for i in range(len(headlines))]
+
+
+def group_articles(articles, clusterer=None):
+    """Map each cluster's first article index to the indexes of all its articles;
+    a cluster holds at most one article per source"""
+    clusterer = clusterer or NearDuplicateClusterer()
+    groups = {}
+    clusters = clusterer.cluster([article.headline for article in articles], [article.source for article in articles])
+    for index, cluster_id in enumerate(clusters):
+        groups.setdefault(cluster_id, []).append(index)
+    return groups
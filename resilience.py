@@ -0,0 +1,130 @@
+"""
+AI News Daily Digest - Source Resilience
+Purpose: Give every source a time budget, retry transient failures with
+         jittered exponential backoff inside it, optionally hedge a slow
+         request with a second one, and stop trying a source that keeps
+         failing for a cool-down period
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+
+
+class DeadlineExceeded(Exception):
+    """A source used up its time budget"""
+
+
+def describe(error):
+    """First line of an error's message, or its type if it has none"""
+    lines = str(error).strip().splitlines()
+    return lines[0] if lines else type(error).__name__
+
+
+async def hedged(attempt, hedge_after):
+    """Run attempt(); if it has not finished after hedge_after seconds, start a
+    second one and return whichever succeeds first"""
+    tasks = [asyncio.ensure_future(attempt())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return tasks[0].result()
+
+        tasks.append(asyncio.ensure_future(attempt()))
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+
+async def call_with_retries(attempt, budget, retries=2, base_delay=1.0, hedge_after=None,
+                            retryable=None, on_retry=None):
+    """Await attempt() until it succeeds, retries run out or budget seconds pass
+
+    Between attempts waits a random time up to base_delay * 2 ** n ("full
+    jitter"), and never starts a wait that would end past the deadline.
+    retryable(error) can rule out errors that will not go away by retrying;
+    on_retry(number, error, delay) is called before each wait.
+    """
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + budget
+
+    for number in range(retries + 1):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"no result within {budget:g}s")
+        try:
+            if hedge_after:
+                return await asyncio.wait_for(hedged(attempt, hedge_after), remaining)
+            return await asyncio.wait_for(attempt(), remaining)
+        except asyncio.TimeoutError as e:
+            if loop.time() >= deadline:
+                raise DeadlineExceeded(f"no result within {budget:g}s") from e
+            error = e
+        except Exception as e:
+            error = e
+
+        delay = random.uniform(0, base_delay * 2 ** number)
+        if number == retries or (retryable is not None and not retryable(error)) or \
+                loop.time() + delay >= deadline:
+            raise error
+        if on_retry is not None:
+            on_retry(number + 1, error, delay)
+        await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Per-source failure counts persisted between runs
+
+    After `threshold` failed runs in a row a source is skipped until
+    `cooldown` seconds have passed; then it gets one more try, and a failure
+    opens it again straight away. A success forgets its failures.
+    """
+
+    def __init__(self, path='.digest_cache/circuit_breaker.json', threshold=3, cooldown=3600):
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.states = json.load(f)
+        except (OSError, ValueError):
+            self.states = {}
+
+    def get(self, source):
+        """{'failures', 'open_until', 'last_error'} for a failing source, or None"""
+        return self.states.get(source)
+
+    def allow(self, source):
+        """False while the source's circuit is open"""
+        state = self.states.get(source)
+        return state is None or not state['open_until'] or time.time() >= state['open_until']
+
+    def record_success(self, source):
+        self.states.pop(source, None)
+
+    def record_failure(self, source, error):
+        state = self.states.setdefault(source, {'failures': 0, 'open_until': None, 'last_error': None})
+        state['failures'] += 1
+        state['last_error'] = describe(error)
+        if state['failures'] >= self.threshold:
+            state['open_until'] = time.time() + self.cooldown
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.states, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,93 @@
+"""
+AI News Daily Digest - Screenshot Processing
+Purpose: Encode source screenshots compactly, make the small thumbnails shown
+         in the digest, and recognise a page that looks the same as last run
+
+Runs in worker threads once the browser has handed over the screenshot, so
+the page can be closed and the next source loaded meanwhile. Needs Pillow;
+without it screenshots are saved by Playwright as they are (PNG or JPEG) and
+no thumbnails or hashes are made.
+"""
+
+import functools
+import io
+import os
+import time
+
+EXTENSIONS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+
+# Hashes of the same page this many bits apart (of 256) count as unchanged
+MAX_HASH_DISTANCE = 3
+
+
+@functools.lru_cache(maxsize=None)
+def pillow():
+    """PIL.Image, imported on first use so runs without screenshots never load it;
+    None without Pillow (optional: WebP encoding, thumbnails and perceptual hashes)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def perceptual_hash(image, size=16):
+    """Difference hash: one bit per neighbouring pixel pair of a small grey copy,
+    set where brightness increases left to right; hex string"""
+    pixels = list(image.convert('L').resize((size + 1, size), pillow().BILINEAR).getdata())
+    bits = 0
+    for row in range(size):
+        start = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (pixels[start + col + 1] > pixels[start + col])
+    return f'{bits:0{size * size // 4}x}'
+
+
+def hash_distance(a, b):
+    """Number of differing bits between two perceptual hashes"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def encode(image, image_format, quality):
+    buffer = io.BytesIO()
+    if image_format == 'png':
+        image.save(buffer, 'PNG', optimize=True)
+    elif image_format == 'webp':
+        image.save(buffer, 'WEBP', quality=quality, method=4)
+    else:
+        image.convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def write_file(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def process_screenshot(data, path, thumbnail_path, image_format='jpeg', quality=80, thumbnail_width=480,
+                       previous_hash=None, max_distance=MAX_HASH_DISTANCE):
+    """Hash a captured screenshot and, unless it matches previous_hash, save it
+    and its thumbnail
+
+    data is what the browser returned: already in image_format, or PNG for
+    formats the browser cannot produce. Returns {'hash', 'unchanged',
+    'seconds'}; nothing is written for an unchanged screenshot.
+    """
+    start = time.perf_counter()
+    Image = pillow()
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    image_hash = perceptual_hash(image)
+    unchanged = previous_hash is not None and hash_distance(image_hash, previous_hash) <= max_distance
+
+    if not unchanged:
+        shot_format = 'jpeg' if image.format == 'JPEG' else 'png'
+        write_file(path, data if shot_format == image_format else encode(image, image_format, quality))
+        if thumbnail_path:
+            height = max(1, round(image.height * thumbnail_width / image.width))
+            thumbnail = image.resize((thumbnail_width, height), Image.LANCZOS)
+            write_file(thumbnail_path, encode(thumbnail, image_format, quality))
+
+    return {'hash': image_hash, 'unchanged': unchanged, 'seconds': time.perf_counter() - start}
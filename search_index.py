@@ -0,0 +1,351 @@
+"""
+AI News Daily Digest - Full-Text Search
+Purpose: Find articles by the words of their headline and source: an inverted
+         index in the archive, brought up to date as runs add articles and
+         ranked with BM25, and a compact prebuilt index embedded in each
+         digest page so it can be searched in the browser without a server
+
+The page's search script (html_digest.SEARCH_SCRIPT) reads the same format,
+tokenizes the same way and scores with the same formula, so a search gives
+the same ranking in the page as over the archive.
+"""
+
+import heapq
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from itertools import islice
+
+WORD = re.compile(r'[^\W_]+')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the their this to was were will with
+""".split())
+
+# BM25 parameters: term frequency saturation and length normalisation
+K1 = 1.2
+B = 0.75
+
+SCHEMA = """
+-- Each word of each archived article's headline and source
+CREATE TABLE IF NOT EXISTS search_postings (
+    term TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    frequency INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (term, article_id)
+) WITHOUT ROWID;
+
+-- Sorted, so a prefix is a range scan
+CREATE TABLE IF NOT EXISTS search_terms (
+    term TEXT PRIMARY KEY,
+    documents INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- How far the index has got, and the totals BM25 needs
+CREATE TABLE IF NOT EXISTS search_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_article_id INTEGER NOT NULL,
+    documents INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO search_state VALUES (1, 0, 0, 0);
+"""
+
+# Past every character, so term < prefix + PAST_PREFIX holds for all terms starting with prefix
+PAST_PREFIX = '\U0010ffff'
+
+# SQLite allows 999 parameters in older versions
+CHUNK = 900
+
+# Numbers in the page index: base-32 digits, the last one from FINAL, so no separators are needed
+CONTINUE = '0123456789abcdefghijklmnopqrstuv'
+FINAL = 'wxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-_'
+
+
+def tokenize(text, stopwords=STOPWORDS):
+    """Lower-case words of text with accents removed, leaving out stopwords"""
+    text = text.lower()
+    if not text.isascii():
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text)
+                       if not unicodedata.category(char).startswith('M'))
+    return [word for word in WORD.findall(text) if word not in stopwords]
+
+
+def parse_query(query):
+    """(words, prefix): the words to look for, and whether the last one is
+    still being typed and should match longer words too
+
+    A trailing space ends the last word. A stopword being typed is kept, as
+    it may be the start of another word ("the" of "theory").
+    """
+    words = tokenize(query, ())
+    prefix = bool(words) and not query[-1:].isspace()
+    kept = [word for word in words[:-1] if word not in STOPWORDS]
+    if words and (prefix or words[-1] not in STOPWORDS):
+        kept.append(words[-1])
+    return kept, prefix
+
+
+def term_weight(with_term, documents):
+    """BM25 idf of a term that with_term of all documents contain, times k1 + 1"""
+    return (K1 + 1) * math.log(1 + (documents - with_term + 0.5) / (with_term + 0.5))
+
+
+class SearchIndex:
+    """Inverted index of the articles in the archive, stored alongside them"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def update(self):
+        """Index the articles archived since the last update; returns how many
+
+        Runs in the caller's transaction, if there is one, so a run's articles
+        and their index entries are committed together.
+        """
+        last_id, documents, total_length = self.connection.execute(
+            "SELECT last_article_id, documents, total_length FROM search_state").fetchone()
+        rows = self.connection.execute(
+            "SELECT id, headline, source FROM articles WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+        if not rows:
+            return 0
+
+        postings, with_term = [], Counter()
+        for article_id, headline, source in rows:
+            words = Counter(tokenize(f"{headline} {source}"))
+            length = sum(words.values())
+            postings.extend((term, article_id, frequency, length) for term, frequency in words.items())
+            with_term.update(words.keys())
+            total_length += length
+
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO search_postings (term, article_id, frequency, length) VALUES (?, ?, ?, ?)",
+            postings)
+        self.connection.executemany("""
+            INSERT INTO search_terms (term, documents) VALUES (?, ?)
+            ON CONFLICT (term) DO UPDATE SET documents = documents + excluded.documents
+        """, with_term.items())
+        self.connection.execute(
+            "UPDATE search_state SET last_article_id = ?, documents = ?, total_length = ?",
+            (rows[-1][0], documents + len(rows), total_length))
+        return len(rows)
+
+    def rebuild(self):
+        """Index every archived article again, e.g. after articles were removed"""
+        with self.connection:
+            self.connection.execute("DELETE FROM search_postings")
+            self.connection.execute("DELETE FROM search_terms")
+            self.connection.execute("UPDATE search_state SET last_article_id = 0, documents = 0, total_length = 0")
+            return self.update()
+
+    def search(self, query, limit=20):
+        """Articles containing every word of query, best BM25 score first:
+        [(score, article_id)]; newer articles win ties
+
+        A word being typed scores as the best of the words it starts.
+        """
+        words, prefix = parse_query(query)
+        documents, total_length = self.connection.execute(
+            "SELECT documents, total_length FROM search_state").fetchone()
+        if not words or not documents:
+            return []
+        average_length = total_length / documents or 1
+
+        lookups = []
+        for position, word in enumerate(words):
+            if prefix and position == len(words) - 1:
+                terms = self.connection.execute(
+                    "SELECT term, documents FROM search_terms WHERE term >= ? AND term < ?",
+                    (word, word + PAST_PREFIX)).fetchall()
+            else:
+                terms = self.connection.execute(
+                    "SELECT term, documents FROM search_terms WHERE term = ?", (word,)).fetchall()
+            if not terms:
+                return []
+            lookups.append(terms)
+
+        if len(lookups) == 1:
+            return self.best(lookups[0], limit, documents, average_length)
+
+        # Rarest word first; the others are then only looked up for its matches
+        lookups.sort(key=lambda terms: sum(count for _, count in terms))
+        # BM25 with the length part worked out once per document length
+        norms = {}
+        scores = None
+        for terms in lookups:
+            word_scores = {}
+            for term, with_term in terms:
+                weight = term_weight(with_term, documents)
+                for article_id, frequency, length in self.postings(term, with_term, scores):
+                    norm = norms.get(length)
+                    if norm is None:
+                        norm = norms[length] = K1 * (1 - B + B * length / average_length)
+                    score = weight * frequency / (frequency + norm)
+                    if score > word_scores.get(article_id, 0):
+                        word_scores[article_id] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {article_id: score + word_scores[article_id]
+                          for article_id, score in scores.items() if article_id in word_scores}
+            if not scores:
+                return []
+
+        return heapq.nlargest(limit, ((score, article_id) for article_id, score in scores.items()))
+
+    def best(self, terms, limit, documents, average_length):
+        """Top articles for a single word, each term's ranked by SQLite, which
+        saves fetching every posting of a common word"""
+        scores = {}
+        for term, with_term in terms:
+            for score, article_id in self.connection.execute("""
+                SELECT ? * frequency / (frequency + ? * (1 - ? + ? * length / ?)) AS score, article_id
+                FROM search_postings WHERE term = ? ORDER BY score DESC, article_id DESC LIMIT ?
+            """, (term_weight(with_term, documents), K1, B, B, average_length, term, limit)):
+                if score > scores.get(article_id, 0):
+                    scores[article_id] = score
+        return heapq.nlargest(limit, ((score, article_id) for article_id, score in scores.items()))
+
+    def postings(self, term, with_term, candidates=None):
+        """(article_id, frequency, length) of the articles containing term,
+        of only the candidates when there are fewer of them"""
+        if candidates is None or len(candidates) >= with_term:
+            return self.connection.execute(
+                "SELECT article_id, frequency, length FROM search_postings WHERE term = ?", (term,)).fetchall()
+        ids = list(candidates)
+        rows = []
+        for start in range(0, len(ids), CHUNK):
+            chunk = ids[start:start + CHUNK]
+            rows.extend(self.connection.execute(
+                f"SELECT article_id, frequency, length FROM search_postings "
+                f"WHERE term = ? AND article_id IN ({','.join('?' * len(chunk))})", [term] + chunk))
+        return rows
+
+
+def encode_number(number):
+    """A non-negative integer as base-32 digits, the last one from FINAL; ASCII bytes"""
+    digits = FINAL[number & 31]
+    number >>= 5
+    while number:
+        digits = CONTINUE[number & 31] + digits
+        number >>= 5
+    return digits.encode('ascii')
+
+
+# Gaps and lengths are nearly always small
+SMALL_NUMBERS = [encode_number(number) for number in range(1024)]
+
+
+def encode_numbers(numbers):
+    """Non-negative integers as one string of base-32 digits"""
+    return b''.join(SMALL_NUMBERS[number] if number < 1024 else encode_number(number)
+                    for number in numbers).decode('ascii')
+
+
+def decode_numbers(text):
+    """The integers of encode_numbers()"""
+    numbers, value = [], 0
+    for char in text:
+        digit = CONTINUE.find(char)
+        if digit >= 0:
+            value = value * 32 + digit
+        else:
+            numbers.append(value * 32 + FINAL.index(char))
+            value = 0
+    return numbers
+
+
+def front_coded(terms):
+    """Sorted terms, each as a base-36 digit saying how many of its first UTF-16
+    code units it shares with the one before (at most 35), then the rest of it
+
+    Counted in code units, as the page's script slices JavaScript strings;
+    a shared prefix never ends inside a surrogate pair, so the rest is whole
+    characters.
+    """
+    previous = b''
+    for term in terms:
+        units = term.encode('utf-16-le')
+        limit = min(len(units), len(previous), 70)
+        shared = 0
+        while shared < limit and units[shared:shared + 2] == previous[shared:shared + 2]:
+            shared += 2
+        # High surrogates are 0xD800-0xDBFF; little-endian, the high byte comes second
+        if shared and 0xD8 <= units[shared - 1] <= 0xDB:
+            shared -= 2
+        yield '0123456789abcdefghijklmnopqrstuvwxyz'[shared // 2] + units[shared:].decode('utf-16-le')
+        previous = units
+
+
+def comma_joined(items, batch_size):
+    """','.join(items) in pieces of batch_size items"""
+    items = iter(items)
+    separator = ''
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        yield separator + ','.join(batch)
+        separator = ','
+
+
+class PageIndex:
+    """Compact search index of a page's stories, added in page order as they are rendered
+
+    Only the encoded postings are kept, never the stories' text, so building
+    it alongside a streamed page stays small. json_chunks() writes it as:
+
+    terms     sorted (by UTF-16 code unit, as JavaScript compares strings),
+              front coded, comma separated
+    postings  per term, comma separated, the numbers of the stories that contain
+              it as gaps from the previous one; a gap of 0 repeats a story, once
+              for each extra time the term occurs in it
+    lengths   words in each story
+    """
+
+    def __init__(self):
+        # Term -> [number of the last story containing it, its encoded gaps]
+        self.postings = {}
+        self.lengths = bytearray()
+        self.stories = 0
+
+    def add(self, text):
+        number = self.stories
+        self.stories += 1
+        words = tokenize(text)
+        self.lengths += SMALL_NUMBERS[len(words)] if len(words) < 1024 else encode_number(len(words))
+        for word in words:
+            entry = self.postings.get(word)
+            if entry is None:
+                self.postings[word] = [number, bytearray(encode_number(number + 1))]
+            else:
+                gap = number - entry[0]
+                entry[1] += SMALL_NUMBERS[gap] if gap < 1024 else encode_number(gap)
+                entry[0] = number
+
+    def json_chunks(self, batch_size=2048):
+        """The index as JSON text, in pieces; terms are letters and digits, so
+        nothing in them needs escaping"""
+        terms = sorted(self.postings, key=lambda term: term.encode('utf-16-be'))
+        header = json.dumps({'version': 1, 'stopwords': ','.join(sorted(STOPWORDS)), 'k1': K1, 'b': B})
+        yield header[:-1] + ', "terms": "'
+        yield from comma_joined(front_coded(terms), batch_size)
+        yield '", "postings": "'
+        yield from comma_joined((self.postings[term][1].decode('ascii') for term in terms), batch_size)
+        yield '", "lengths": "' + self.lengths.decode('ascii') + '"}'
+
+    def to_dict(self):
+        return json.loads(''.join(self.json_chunks()))
+
+
+def build_page_index(texts):
+    """PageIndex of some stories' text, as a dict"""
+    index = PageIndex()
+    for text in texts:
+        index.add(text)
+    return index.to_dict()
@@ -0,0 +1,168 @@
+"""
+AI News Daily Digest - Multi-Process Scraping
+Purpose: Spread the sources over several worker processes, each with its own
+         HTTP pool and browser, and merge what they find in the coordinating
+         process
+
+Workers only scrape. Every source's articles are sent back as soon as that
+source is done; the coordinator categorizes, dedupes and writes them in
+registry order, exactly as a single-process run would.
+"""
+
+import asyncio
+import multiprocessing
+import queue as queue_module
+
+from ai_daily_digest import AIDailyDigest
+
+
+def shard_sources(specs, processes):
+    """Deal the sources round-robin into at most `processes` non-empty shards"""
+    shards = [specs[i::processes] for i in range(processes)]
+    return [shard for shard in shards if shard]
+
+
+def worker_options(digest):
+    """AIDailyDigest settings for a worker scraping on behalf of `digest`"""
+    return {
+        'max_concurrency': digest.max_concurrency,
+        'ready_timeout': digest.ready_timeout,
+        'take_screenshots': digest.take_screenshots,
+        'screenshot_format': digest.screenshot_format,
+        'screenshot_quality': digest.screenshot_quality,
+        'thumbnail_width': digest.thumbnail_width,
+        'block_resources': digest.block_resources,
+        'use_feeds': digest.use_feeds,
+        'sources': list(digest.sources.values()),
+        'report_dir': digest.report_dir,
+        'headless': digest.headless,
+        'max_navigations': digest.max_navigations,
+        'metrics': digest.metrics.enabled,
+        'fetch_cache_dir': digest.fetch_cache.directory if digest.fetch_cache is not None else None,
+        'source_timeout': digest.source_timeout,
+        'retries': digest.retries,
+        'retry_delay': digest.retry_delay,
+        'hedge_after': digest.hedge_after,
+        # Workers read the breaker; the coordinator records outcomes and saves it
+        'circuit_breaker': digest.circuit_breaker,
+        # Dedupe needs every source's articles, so it stays in the coordinator
+        'dedupe': None,
+        'archive': None,
+        'cluster_duplicates': False,
+    }
+
+
+async def scrape_shard(digest, names, queue):
+    """Scrape some sources concurrently, sending each one's results as it finishes"""
+    semaphore = asyncio.Semaphore(digest.max_concurrency)
+
+    async def scrape(spec):
+        results = await digest.scrape_in_new_page(semaphore, spec)
+        cache = digest.fetch_cache
+        breaker = digest.circuit_breaker
+        queue.put(('source', spec.name, results, {
+            'breaker': breaker.get(spec.name) if breaker is not None else None,
+            'readiness': digest.readiness.get(spec.name),
+            'screenshot': digest.screenshots.get(spec.name),
+            'thumbnail': digest.thumbnails.get(spec.name),
+            'network': digest.network_stats.get(spec.name),
+            'cache_outcome': cache.report.get(spec.name) if cache is not None else None,
+            'cache_entry': cache.get(spec.name) if cache is not None else None,
+        }))
+
+    digest.open_clients()
+    try:
+        await asyncio.gather(*(scrape(digest.sources[name]) for name in names))
+    finally:
+        await digest.close_clients()
+
+
+def run_worker(names, options, queue):
+    """Worker process entry point"""
+    digest = None
+    try:
+        digest = AIDailyDigest(**options)
+        asyncio.run(scrape_shard(digest, names, queue))
+    finally:
+        # The worker's timings and counters travel with its last message
+        metrics = digest.metrics.to_dict() if digest is not None else None
+        queue.put(('done', None, None, metrics))
+
+
+def collect_sharded(digest, processes):
+    """Scrape digest's enabled sources in `processes` worker processes and merge
+    them into digest; returns the screenshots like collect_sources()"""
+    jobs = digest.source_jobs()
+    order = [spec.name for spec in jobs]
+    shards = shard_sources(jobs, processes)
+
+    # Fresh interpreters: Playwright's driver connection does not survive fork()
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    options = worker_options(digest)
+    workers = [context.Process(target=run_worker, args=([spec.name for spec in shard], options, queue))
+               for shard in shards]
+    print(f"\n🧩 Scraping {len(jobs)} sources in {len(workers)} processes")
+    for worker in workers:
+        worker.start()
+
+    batches = {}
+    merged = 0
+    finished = 0
+    try:
+        while finished < len(workers):
+            try:
+                kind, source, results, stats = queue.get(timeout=1)
+            except queue_module.Empty:
+                # A worker that died without saying so will never finish its shard
+                if not any(worker.is_alive() for worker in workers):
+                    print("  ⚠️ Worker processes exited early; merging what arrived")
+                    break
+                continue
+
+            if kind == 'done':
+                if stats is not None:
+                    digest.metrics.merge(stats)
+                finished += 1
+                continue
+
+            batches[source] = results
+            if digest.circuit_breaker is not None:
+                if stats['breaker'] is None:
+                    digest.circuit_breaker.record_success(source)
+                else:
+                    digest.circuit_breaker.states[source] = stats['breaker']
+            if stats['readiness'] is not None:
+                digest.readiness[source] = stats['readiness']
+            if stats['screenshot'] is not None:
+                digest.screenshots[source] = stats['screenshot']
+            if stats['thumbnail'] is not None:
+                digest.thumbnails[source] = stats['thumbnail']
+            if stats['network'] is not None:
+                digest.network_stats[source] = stats['network']
+            if digest.fetch_cache is not None and stats['cache_outcome'] is not None:
+                digest.fetch_cache.report[source] = stats['cache_outcome']
+                if stats['cache_entry'] is not None:
+                    digest.fetch_cache.entries[source] = stats['cache_entry']
+
+            # Merge in registry order as soon as every earlier source is in
+            while merged < len(order) and order[merged] in batches:
+                digest.add_articles(batches.pop(order[merged]))
+                merged += 1
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    # Sources lost with a crashed worker count as empty
+    for source in order[merged:]:
+        digest.add_articles(batches.pop(source, []))
+
+    digest.order_source_stats(order)
+    if digest.fetch_cache is not None:
+        digest.fetch_cache.save()
+    if digest.circuit_breaker is not None:
+        digest.circuit_breaker.save()
+    digest.sink.close()
+    return digest.screenshots
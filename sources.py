@@ -0,0 +1,71 @@
+"""
+AI News Daily Digest - Source Registry
+Purpose: Describe every news source as data (sources.json) so one extraction
+         engine in AIDailyDigest can scrape all of them
+"""
+
+import json
+import os
+
+DEFAULT_SOURCES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sources.json')
+
+
+class SourceSpec:
+    """How to find the headlines of one source
+
+    name            label used in the digest, reports and caches
+    url             listing page to scrape
+    selector        CSS selector of each headline (or of each item, with inner)
+    inner           CSS selector of the headline link inside each item
+    limit           number of selector matches to read
+    ready_selector  selector counted to decide the page is ready (default: selector)
+    ready_count     matches of ready_selector to wait for
+    min_length      headlines this short or shorter are dropped
+    require_link    drop headlines without a link
+    skip_prefixes   drop headlines starting with any of these
+    ai_filter       keep only headlines with an AI keyword (general news sites)
+    static          server-rendered: fetch over HTTP without the browser
+    feed            RSS/Atom feed read before falling back to the page
+    feed_limit      number of feed entries to read
+    block           resource types aborted while scraping (default: BLOCKED_RESOURCE_TYPES)
+    refresh         seconds between refreshes in daemon mode
+    icon            emoji shown in progress output
+    """
+
+    fields = {
+        'name': None, 'url': None, 'selector': None, 'inner': None, 'limit': 10,
+        'ready_selector': None, 'ready_count': 1, 'min_length': 0, 'require_link': True,
+        'skip_prefixes': (), 'ai_filter': False, 'static': False, 'feed': None,
+        'feed_limit': 10, 'block': None, 'refresh': 900, 'icon': '📰',
+    }
+    required = ('name', 'url', 'selector')
+
+    def __init__(self, **settings):
+        unknown = set(settings) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown source settings for {settings.get('name')!r}: {', '.join(sorted(unknown))}")
+        missing = [key for key in self.required if not settings.get(key)]
+        if missing:
+            raise ValueError(f"Source {settings.get('name')!r} is missing: {', '.join(missing)}")
+
+        for key, default in self.fields.items():
+            setattr(self, key, settings.get(key, default))
+        self.ready_selector = self.ready_selector or self.selector
+        self.skip_prefixes = tuple(self.skip_prefixes)
+        if self.block is not None:
+            self.block = frozenset(self.block)
+
+    def __repr__(self):
+        return f"SourceSpec({self.name!r}, {self.url!r})"
+
+
+def load_sources(path=DEFAULT_SOURCES_PATH):
+    """Read a JSON list of source settings into SourceSpecs, in file order"""
+    with open(path, encoding='utf-8') as f:
+        specs = [SourceSpec(**settings) for settings in json.load(f)]
+
+    names = [spec.name for spec in specs]
+    duplicates = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicates:
+        raise ValueError(f"Duplicate source names in {path}: {', '.join(duplicates)}")
+    return specs
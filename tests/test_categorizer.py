@@ -0,0 +1,34 @@
+import pytest
+
+import categorizer
+from categorizer import AI_KEYWORDS, KeywordCategorizer
+
+
+@pytest.fixture(params=['aho-corasick', 'regex'])
+def ai_filter(request, monkeypatch):
+    if request.param == 'regex':
+        monkeypatch.setattr(categorizer, 'ahocorasick', None)
+    elif categorizer.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+    # As AIDailyDigest builds it for general news sources
+    return KeywordCategorizer([('AI', AI_KEYWORDS)], default=None, word_boundary=True)
+
+
+@pytest.mark.parametrize('headline', [
+    "He said the train was late",
+    "Email from Taiwan after the raid",
+    "Writing HTML and XML by hand",
+])
+def test_ai_filter_rejects_keywords_inside_words(ai_filter, headline):
+    assert not ai_filter.matches(headline)
+
+
+@pytest.mark.parametrize('headline', [
+    "AI is eating the world",
+    "Practical ML for small teams",
+    "Show HN: An AI-powered code reviewer",
+    "OpenAI's new model",
+    "Running LLMs on a laptop",
+])
+def test_ai_filter_matches_whole_words(ai_filter, headline):
+    assert ai_filter.matches(headline)
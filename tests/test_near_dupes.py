@@ -0,0 +1,60 @@
+import pytest
+
+import near_dupes
+from near_dupes import NearDuplicateClusterer
+
+# The same story reworded by two outlets
+SAME = [
+    ("OpenAI launches GPT-5 for everyone", "OpenAI unveils GPT-5 for everyone"),
+    ("OpenAI launches GPT-5 with better coding", "OpenAI launches GPT-5, with improved coding"),
+    ("Google DeepMind's Gemini 3 tops benchmarks", "Gemini 3 from Google DeepMind tops benchmarks"),
+    ("OpenAI Releases GPT-5 To All ChatGPT Users", "OpenAI releases GPT-5 to all ChatGPT users!"),
+    ("Robots learn new household tasks from video, study says",
+     "Robot learns new household tasks from videos - study finds"),
+]
+
+# Different stories worded alike
+DISTINCT = [
+    ("Nvidia stock falls 5% after earnings", "Nvidia stock rises 5% after earnings"),
+    ("OpenAI releases GPT-5 to all ChatGPT users", "OpenAI releases GPT-4 to all ChatGPT users"),
+    ("Anthropic raises $2 billion in new funding round led by Google",
+     "Anthropic raises $2 billion in new funding round led by Amazon"),
+    ("Show HN: I built an AI agent for my email", "Show HN: I built an AI agent for my calendar"),
+    ("Meta launches new AI model for video", "Meta launches new AI model for images"),
+]
+
+
+@pytest.fixture(params=['numpy', 'pure python'])
+def clusterer(request, monkeypatch):
+    if request.param == 'pure python':
+        monkeypatch.setattr(near_dupes, 'np', None)
+    elif near_dupes.np is None:
+        pytest.skip("NumPy is not installed")
+    return NearDuplicateClusterer()
+
+
+def grouped(clusterer, first, second, sources=('The Decoder', 'Hacker News')):
+    clusters = clusterer.cluster([first, second], list(sources))
+    return clusters[0] == clusters[1]
+
+
+@pytest.mark.parametrize('first, second', SAME)
+def test_reworded_story_is_grouped(clusterer, first, second):
+    assert grouped(clusterer, first, second)
+
+
+@pytest.mark.parametrize('first, second', DISTINCT)
+def test_different_stories_stay_apart(clusterer, first, second):
+    assert not grouped(clusterer, first, second)
+
+
+def test_same_source_stays_apart(clusterer):
+    headline = "OpenAI releases GPT-5 to all ChatGPT users"
+    assert not grouped(clusterer, headline, headline, ('Hacker News', 'Hacker News'))
+
+
+def test_group_holds_one_article_per_source(clusterer):
+    headlines = ["OpenAI launches GPT-5 for everyone", "OpenAI unveils GPT-5 for everyone",
+                 "OpenAI debuts GPT-5 for everyone"]
+    clusters = clusterer.cluster(headlines, ['The Decoder', 'Hacker News', 'The Decoder'])
+    assert clusters[:2] == [0, 0] and clusters[2] == 2
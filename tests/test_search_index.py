@@ -0,0 +1,38 @@
+from search_index import PageIndex, decode_numbers, front_coded, tokenize
+
+
+def decode_like_page(terms):
+    """Front-coded terms decoded as html_digest.SEARCH_SCRIPT does, slicing
+    strings by UTF-16 code unit like JavaScript"""
+    decoded, previous = [], b''
+    for entry in terms.split(','):
+        previous = previous[:2 * int(entry[0], 36)] + entry[1:].encode('utf-16-le')
+        decoded.append(previous.decode('utf-16-le'))
+    return decoded
+
+
+def sorted_terms(terms):
+    return sorted(terms, key=lambda term: term.encode('utf-16-be'))
+
+
+def test_front_coding_round_trips_outside_the_basic_plane():
+    terms = sorted_terms(['b', '𠮷b', '𠮷c', '𠮸a', '𠮷', 'ｂ', 'é', 'x' * 40 + 'a', 'x' * 40 + 'b'])
+    assert decode_like_page(','.join(front_coded(terms))) == terms
+
+
+def test_page_index_round_trips():
+    texts = ["𠮷b wins the 𠮷c prize", "Café owners try AI", "OpenAI's GPT-5 and GPT-4"]
+    index = PageIndex()
+    for text in texts:
+        index.add(text)
+    data = index.to_dict()
+
+    terms = decode_like_page(data['terms'])
+    assert terms == sorted_terms({word for text in texts for word in tokenize(text)})
+    assert decode_numbers(data['lengths']) == [len(tokenize(text)) for text in texts]
+    for term, gaps in zip(terms, data['postings'].split(',')):
+        stories, story = [], -1
+        for gap in decode_numbers(gaps):
+            story += gap
+            stories.append(story)
+        assert stories == [number for number, text in enumerate(texts) for word in tokenize(text) if word == term]